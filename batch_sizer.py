@@ -0,0 +1,133 @@
+import os
+import threading
+from utils import load_json_file, save_json_file
+from config import (MIN_NO_OF_SIGNATURES_PER_BATCH,
+                    MAX_NO_OF_SIGNATURES_PER_BATCH,
+                    BATCH_SIZE_ADDITIVE_INCREASE,
+                    BATCH_SIZE_MULTIPLICATIVE_DECREASE,
+                    BATCH_TARGET_LATENCY, BITQUERY_MAX_ROWS_PER_RESPONSE,
+                    MAX_NO_OF_SAVED_BATCH_SIZE_RUNS)
+
+
+class AdaptiveBatchSizer:
+    """
+    AIMD (additive increase, multiplicative decrease) tuner for the number of signatures per Bitquery query.
+
+    The batch size grows by a fixed step after every healthy response and is cut by a factor after a
+    failed response, a response slower than the target latency, or a response close to the Bitquery row
+    limit (which may have been truncated). An empty response says nothing about the batch size, eg. the
+    signatures may simply have no DEX trades, so it leaves the size as it is. The last healthy size is
+    saved to a stats file so that the next run starts from it.
+    """
+
+    def __init__(self,
+                 stats_file_path,
+                 min_batch_size=MIN_NO_OF_SIGNATURES_PER_BATCH,
+                 max_batch_size=MAX_NO_OF_SIGNATURES_PER_BATCH,
+                 additive_increase=BATCH_SIZE_ADDITIVE_INCREASE,
+                 multiplicative_decrease=BATCH_SIZE_MULTIPLICATIVE_DECREASE,
+                 target_latency=BATCH_TARGET_LATENCY,
+                 max_rows_per_response=BITQUERY_MAX_ROWS_PER_RESPONSE):
+        self.stats_file_path = stats_file_path
+        self.min_batch_size = min(min_batch_size, max_batch_size)
+        self.max_batch_size = max_batch_size
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.target_latency = target_latency
+        self.max_rows_per_response = max_rows_per_response
+        self.lock = threading.Lock()
+
+        self.stats = {'last_good_batch_size': max_batch_size, 'runs': []}
+        if os.path.exists(stats_file_path):
+            self.stats.update(load_json_file(stats_file_path))
+
+        self.batch_size = min(
+            max(self.stats['last_good_batch_size'], self.min_batch_size),
+            max_batch_size)
+        self.batch_size_trajectory = [self.batch_size]
+        self.no_of_batches = 0
+        self.no_of_failed_batches = 0
+        self.no_of_empty_batches = 0
+        self.total_latency = 0
+
+    def get_batch_size(self):
+
+        with self.lock:
+            return self.batch_size
+
+    def record(self, batch_size, latency, no_of_rows, is_failed):
+        """
+        Update the batch size from the outcome of one query.
+
+        :param batch_size: The number of signatures sent in the query.
+        :param latency: The time taken by the query in seconds, including retries.
+        :param no_of_rows: The number of DEX trades rows returned.
+        :param is_failed: Whether the query failed after all retries.
+        """
+        with self.lock:
+            self.no_of_batches += 1
+            self.total_latency += latency
+
+            is_empty = not is_failed and no_of_rows == 0
+            if is_failed:
+                self.no_of_failed_batches += 1
+                reason = 'failed'
+            elif latency > self.target_latency:
+                reason = 'was slow ({:.2f} seconds)'.format(latency)
+            elif no_of_rows >= 0.9 * self.max_rows_per_response:
+                reason = 'was close to the row limit ({} rows)'.format(no_of_rows)
+            else:
+                reason = ''
+
+            if is_empty:
+                self.no_of_empty_batches += 1
+
+            previous_batch_size = self.batch_size
+
+            if reason:
+                self.batch_size = max(
+                    int(self.batch_size * self.multiplicative_decrease),
+                    self.min_batch_size)
+            elif not is_empty:
+                # The remainder and cache-miss batches are smaller than the tuned size by design, so only a full batch is saved
+                if batch_size >= previous_batch_size:
+                    self.stats['last_good_batch_size'] = batch_size
+                self.batch_size = min(
+                    self.batch_size + self.additive_increase,
+                    self.max_batch_size)
+
+            if self.batch_size != previous_batch_size:
+                self.batch_size_trajectory.append(self.batch_size)
+
+                if reason:
+                    print('Batch of {} signatures {}. Batch size: {} -> {}'.
+                          format(batch_size, reason, previous_batch_size,
+                                 self.batch_size))
+                else:
+                    print('Batch size: {} -> {}'.format(
+                        previous_batch_size, self.batch_size))
+
+    def save_stats(self, run_id):
+
+        with self.lock:
+            mean_latency = self.total_latency / self.no_of_batches if self.no_of_batches else 0
+
+            self.stats['runs'].append({
+                'run_id': run_id,
+                'no_of_batches': self.no_of_batches,
+                'no_of_failed_batches': self.no_of_failed_batches,
+                'no_of_empty_batches': self.no_of_empty_batches,
+                'mean_latency': mean_latency,
+                'batch_size_trajectory': self.batch_size_trajectory
+            })
+            self.stats['runs'] = self.stats['runs'][
+                -MAX_NO_OF_SAVED_BATCH_SIZE_RUNS:]
+
+            save_json_file(self.stats_file_path, self.stats)
+
+        print(
+            '\nBatch sizing: {} batches, {} failed, {} empty, {:.2f} seconds mean latency'
+            .format(self.no_of_batches, self.no_of_failed_batches,
+                    self.no_of_empty_batches, mean_latency))
+        print('Batch size trajectory: {}'.format(' -> '.join(
+            str(batch_size) for batch_size in self.batch_size_trajectory)))
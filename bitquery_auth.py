@@ -0,0 +1,54 @@
+import json
+import time
+import threading
+import http_client
+from config import BITQUERY_CLIENT_ID, BITQUERY_CLIENT_SECRET
+
+# Access tokens are reused until shortly before they expire, so that several runs in the same process,
+# eg. the crawls of the scheduler, do not request a new token each time
+OAUTH_EXPIRY_MARGIN_SECONDS = 60
+
+_oauth_headers = None
+_oauth_expiry_time = 0
+_oauth_lock = threading.Lock()
+
+
+def generate_oAuth():
+    """
+    Get the headers of the Bitquery v2 / EAP API, with a cached OAuth access token if it is still valid.
+
+    :return: The request headers with the bearer access token.
+    """
+    global _oauth_headers, _oauth_expiry_time
+
+    with _oauth_lock:
+        if _oauth_headers is not None and time.time() < _oauth_expiry_time:
+            return dict(_oauth_headers)
+
+        url = "https://oauth2.bitquery.io/oauth2/token"
+
+        payload = 'grant_type=client_credentials&client_id={}&client_secret={}&scope=api'.format(
+            BITQUERY_CLIENT_ID, BITQUERY_CLIENT_SECRET)
+
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+        response = http_client.post(url, headers=headers, data=payload)
+        resp = json.loads(response.text)
+
+        print("========== oAuth's reponse ==========")
+        print(resp)
+        print('=====================================')
+
+        access_token = resp['access_token']
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {access_token}'
+        }
+
+        # Tokens without a known lifetime are not reused
+        _oauth_headers = headers
+        _oauth_expiry_time = time.time() + resp.get(
+            'expires_in', 0) - OAUTH_EXPIRY_MARGIN_SECONDS
+
+        return dict(headers)
@@ -0,0 +1,202 @@
+import json
+import queue
+import threading
+import websocket
+import http_client
+from config import (MAX_RETRIES, RETRY_AFTER, HTTP_CONNECT_TIMEOUT,
+                    HTTP_READ_TIMEOUT, LIVE_BUFFER_SIZE)
+
+
+def get_websocket_url(url):
+
+    if url.startswith('https://'):
+        return 'wss://' + url[len('https://'):]
+    elif url.startswith('http://'):
+        return 'ws://' + url[len('http://'):]
+
+    return url
+
+
+class BitquerySubscription:
+    """
+    GraphQL subscription to the Bitquery streaming endpoints over the graphql-transport-ws websocket protocol.
+
+    A reader thread keeps the subscription open and puts the DEX trades data of every message into a
+    bounded buffer, which the caller drains with `get_event`. If the connection drops, it reconnects
+    after `retry_after` seconds and emits a 'RECONNECTED' event, so that the caller can backfill the
+    trades missed in the gap. If the buffer is full because the caller is too slow, the message is dropped
+    and `pop_is_data_dropped` reports it, so that the dropped trades can be backfilled too. The reader
+    gives up after `max_retries` failed connections in a row and emits a 'STOPPED' event.
+    """
+
+    def __init__(self,
+                 url,
+                 headers,
+                 query,
+                 variables=None,
+                 buffer_size=LIVE_BUFFER_SIZE,
+                 max_retries=MAX_RETRIES,
+                 retry_after=RETRY_AFTER):
+        self.url = get_websocket_url(url)
+        self.headers = headers
+        self.query = query
+        self.variables = variables or {}
+        self.max_retries = max_retries
+        self.retry_after = retry_after
+        self.buffer = queue.Queue(maxsize=buffer_size)
+        self.stop_event = threading.Event()
+        self.data_dropped_event = threading.Event()
+        self.connection = None
+        self.thread = None
+
+    def start(self):
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+
+        self.stop_event.set()
+
+        connection = self.connection
+        if connection is not None:
+            try:
+                connection.close()
+            except websocket.WebSocketException:
+                pass
+
+        if self.thread is not None:
+            self.thread.join(timeout=HTTP_CONNECT_TIMEOUT)
+
+    def get_event(self, timeout=None):
+        """
+        :return: A tuple of the event ('DATA', 'RECONNECTED' or 'STOPPED') and the DEX trades data of a 'DATA' event, or None if no event arrived before the timeout.
+        """
+        try:
+            return self.buffer.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def pop_is_data_dropped(self):
+        """
+        :return: Whether a message was dropped from the full buffer since the last call.
+        """
+        is_data_dropped = self.data_dropped_event.is_set()
+        self.data_dropped_event.clear()
+
+        return is_data_dropped
+
+    def run(self):
+
+        retry_count = 0
+        is_reconnecting = False
+
+        while not self.stop_event.is_set():
+
+            try:
+                self.connect()
+                retry_count = 0
+
+                if is_reconnecting:
+                    print('Subscription reconnected.')
+                    self.buffer.put(('RECONNECTED', None))
+
+                self.receive()
+
+            except (websocket.WebSocketException, OSError, ValueError,
+                    KeyError, TypeError) as e:
+                if self.stop_event.is_set():
+                    break
+
+                retry_count += 1
+
+                if retry_count >= self.max_retries:
+                    print('Maximum retries reached for the subscription.')
+                    break
+
+                print(
+                    'Subscription failed with error {}. Reconnecting ({}) after {} seconds...'
+                    .format(type(e).__name__, retry_count, self.retry_after))
+
+            finally:
+                if self.connection is not None:
+                    try:
+                        self.connection.close()
+                    except websocket.WebSocketException:
+                        pass
+                    self.connection = None
+
+            is_reconnecting = True
+            self.stop_event.wait(self.retry_after)
+
+        if not self.stop_event.is_set():
+            self.buffer.put(('STOPPED', None))
+
+    def connect(self):
+
+        self.connection = websocket.create_connection(
+            self.url,
+            header=[
+                '{}: {}'.format(key, value)
+                for key, value in self.headers.items()
+            ],
+            subprotocols=['graphql-transport-ws'],
+            timeout=HTTP_CONNECT_TIMEOUT)
+
+        self.connection.send(json.dumps({'type': 'connection_init'}))
+        message = json.loads(self.connection.recv())
+
+        if message.get('type') != 'connection_ack':
+            raise websocket.WebSocketException(
+                'Subscription not acknowledged: {}'.format(message))
+
+        self.connection.send(
+            json.dumps({
+                'id': '1',
+                'type': 'subscribe',
+                'payload': {
+                    'query': self.query,
+                    'variables': self.variables
+                }
+            }))
+
+        self.connection.settimeout(HTTP_READ_TIMEOUT)
+
+    def receive(self):
+        """
+        Read the subscription messages until the connection is closed or the subscription completes.
+        """
+        while not self.stop_event.is_set():
+            raw_message = self.connection.recv()
+
+            if not raw_message:
+                raise websocket.WebSocketConnectionClosedException(
+                    'Connection closed')
+
+            http_client.record_host_bytes(self.url, len(raw_message))
+            message = json.loads(raw_message)
+            message_type = message.get('type')
+
+            if message_type == 'next':
+                if message['payload'].get('errors'):
+                    raise websocket.WebSocketException('{}'.format(
+                        message['payload']['errors']))
+
+                dex_trades_data = message['payload']['data']['Solana'][
+                    'DEXTrades']
+
+                try:
+                    self.buffer.put_nowait(('DATA', dex_trades_data))
+                except queue.Full:
+                    self.data_dropped_event.set()
+
+            elif message_type == 'ping':
+                self.connection.send(json.dumps({'type': 'pong'}))
+
+            elif message_type == 'error':
+                raise websocket.WebSocketException('{}'.format(
+                    message.get('payload')))
+
+            elif message_type == 'complete':
+                raise websocket.WebSocketConnectionClosedException(
+                    'Subscription completed')
@@ -4,7 +4,8 @@ from configparser import ConfigParser
 root_dir = os.path.abspath(os.path.dirname(__file__))
 config_file = os.path.join(root_dir, "private.ini")
 cfg = ConfigParser()
-cfg.read(config_file)
+# The template gives empty defaults to the keys missing from private.ini, eg. when running the tests
+cfg.read([os.path.join(root_dir, "private_template.ini"), config_file])
 
 bitquery = dict(cfg.items('bitquery'))
 BITQUERY_CLIENT_ID = bitquery.get('bitquery_client_id', '')
@@ -48,8 +49,68 @@ MARKED_MINT_ADDRESSES = [
 variables = {}
 
 VYBE_NETWORK_QUERY_LIMIT = 100
+RAYDIUM_CONCURRENCY = 4
+BIRDEYE_QUERY_LIMIT = 50
+DISCOVERY_PAGES = {'BIRDEYE': 1, 'VYBE_NETWORK': 5, 'RAYDIUM': 2}
+DISCOVERY_RAYDIUM_PAGE_SIZE = 500
+DISCOVERY_CONCURRENCY = 6
 MAX_RETRIES = 10
 RETRY_AFTER = 10
 MAX_NO_OF_SIGNATURES_PER_BATCH = 10000
+ADAPTIVE_BATCH_SIZING = True
+MIN_NO_OF_SIGNATURES_PER_BATCH = 500
+BATCH_SIZE_ADDITIVE_INCREASE = 1000
+BATCH_SIZE_MULTIPLICATIVE_DECREASE = 0.5
+BATCH_TARGET_LATENCY = 60
+BITQUERY_MAX_ROWS_PER_RESPONSE = 25000
+MAX_NO_OF_SAVED_BATCH_SIZE_RUNS = 20
+STREAM_DEX_TRADES = True
+TRADE_CACHE = True
+TRADE_CACHE_MAX_ENTRIES = 5000000
+TRADE_CACHE_MAX_AGE_DAYS = 90
+TOKEN_DETAILS_CACHE = True
+TOKEN_DETAILS_VOLATILE_TTL_HOURS = 1
+TOKEN_DETAILS_CACHE_MAX_ENTRIES = 50000
+DEXSCREENER_BATCH_SIZE = 30
+DEXSCREENER_CONCURRENCY = 4
+DEXSCREENER_REQUESTS_PER_MINUTE = 300
+DEXSCREENER_MAX_PAIRS_PER_RESPONSE = 30
+GRAPH_ENGINE = 'PYTHON'
+TRADE_STORE_FORMAT = 'NPZ'
+SLIDING_WINDOW_HOURS = 6
+SLIDING_WINDOW_BUCKET_SECONDS = 60
+LIVE_BUFFER_SIZE = 1000
+LIVE_SNAPSHOT_SECONDS = 60
+LIVE_MAX_SEEN_SIGNATURES = 1000000
+LIVE_BACKFILL_PAGE_SIZE = 10000
+SCHEDULER_SOURCES = ['VYBE_NETWORK', 'RAYDIUM']
+SCHEDULER_SOURCE_INTERVALS = {
+    'BIRDEYE': 3600,
+    'VYBE_NETWORK': 3600,
+    'RAYDIUM': 900
+}
+SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL = 50
+SCHEDULER_MAX_CRAWL_RETRIES = 3
+PLOT_TOP_K_EDGES_PER_NODE = 0
+PLOT_EDGE_BUDGET = 0
+GRAPH_LAYOUT = 'FORCE'
+LAYOUT_ITERATIONS = 50
+LAYOUT_WARM_START_ITERATIONS = 15
+LAYOUT_EXACT_MAX_NODES = 1000
+LAYOUT_CACHE = True
+LAYOUT_CACHE_MAX_ENTRIES = 50000
 EDGE_POINTS_QUANTITY = 100
+EDGE_POINTS_MIN_QUANTITY = 5
 EDGE_POINTS_OPACITY = 0
+WEBGL_EDGE_THRESHOLD = 500
+WEBGL_EDGE_COLOUR_BINS = 16
+WEBGL_ARROW_SIZE = 0.015
+
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 20
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_READ_TIMEOUT = 120
+BFS_CONCURRENCY = 1
+JOURNAL_FSYNC_BATCH_SIZE = 10000
+SIGNATURE_BATCH_CONCURRENCY = 2
+HTTP_STREAM_CHUNK_SIZE = 65536
@@ -1,96 +1,189 @@
-import requests
+import http_client
 import time
 import warnings
-from config import (MAX_RETRIES, RETRY_AFTER)
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import RequestException
+from config import (MAX_RETRIES, RETRY_AFTER, DEXSCREENER_BATCH_SIZE,
+                    DEXSCREENER_CONCURRENCY, DEXSCREENER_REQUESTS_PER_MINUTE,
+                    DEXSCREENER_MAX_PAIRS_PER_RESPONSE)
 
 warnings.filterwarnings("ignore", module="urllib3")
 
+rate_limiter = http_client.RateLimiter(DEXSCREENER_REQUESTS_PER_MINUTE)
+
 
 def get_token_details(mint_addresses,
                       max_retries=MAX_RETRIES,
-                      retry_after=RETRY_AFTER):
-
+                      retry_after=RETRY_AFTER,
+                      not_found_mint_addresses=None,
+                      batch_size=DEXSCREENER_BATCH_SIZE,
+                      concurrency=DEXSCREENER_CONCURRENCY):
+    """
+    Query the Dexscreener token details of the mint addresses.
+
+    The mint addresses are packed into comma-separated batches of `batch_size`, which are queried by up
+    to `concurrency` threads under the Dexscreener rate limit. The pairs returned for a batch are split
+    by their base token. A batch that fails after all retries is skipped without stopping the others.
+    Since a response holds at most `DEXSCREENER_MAX_PAIRS_PER_RESPONSE` pairs, the mint addresses missing
+    from a full response are queried again one by one.
+
+    :param mint_addresses: The mint addresses to query.
+    :param max_retries: The maximum number of retries per batch.
+    :param retry_after: The wait time in seconds before retrying a batch.
+    :param not_found_mint_addresses: A list to collect the mint addresses that no token details were found for into, if any. Mint addresses of failed batches are left out.
+    :param batch_size: The number of mint addresses per request. Dexscreener accepts up to 30.
+    :param concurrency: The maximum number of requests in flight.
+
+    :return: A dictionary of the token details, keyed by mint address.
+    """
     token_details_dict = {}
     total_mint_addresses = len(mint_addresses)
-    count = 1
+    mint_addresses_batches = [
+        mint_addresses[i:i + batch_size]
+        for i in range(0, total_mint_addresses, batch_size)
+    ]
+    unresolved_mint_addresses = []
 
     print('\n')
 
-    for i in range(0, total_mint_addresses):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        pairs_batches = executor.map(
+            lambda i: query_token_details_batch(
+                mint_addresses_batches[i], i * batch_size + 1,
+                total_mint_addresses, max_retries, retry_after),
+            range(len(mint_addresses_batches)))
+
+        for mint_addresses_batch, pairs in zip(mint_addresses_batches,
+                                               pairs_batches):
+            if pairs is None:
+                continue
+
+            add_token_details(token_details_dict, pairs)
 
-        print('Querying token details {} out of {}'.format(
-            i + 1, total_mint_addresses))
+            missing_mint_addresses = [
+                mint_address for mint_address in mint_addresses_batch
+                if mint_address not in token_details_dict
+            ]
 
-        mint_address = mint_addresses[i]
+            if len(mint_addresses_batch) > 1 and len(
+                    pairs) >= DEXSCREENER_MAX_PAIRS_PER_RESPONSE:
+                unresolved_mint_addresses.extend(missing_mint_addresses)
+            elif not_found_mint_addresses is not None:
+                not_found_mint_addresses.extend(missing_mint_addresses)
 
-        url = "https://api.dexscreener.com/latest/dex/tokens/{}".format(
-            mint_address)
+        if unresolved_mint_addresses:
+            print(
+                'Querying {} mint addresses missing from full responses one by one...'
+                .format(len(unresolved_mint_addresses)))
 
-        headers = {
-            "accept": "application/json",
-        }
+        pairs_batches = executor.map(
+            lambda mint_address: query_token_details_batch(
+                [mint_address], None, total_mint_addresses, max_retries,
+                retry_after), unresolved_mint_addresses)
+
+        for mint_address, pairs in zip(unresolved_mint_addresses,
+                                       pairs_batches):
+            if pairs is None:
+                continue
+
+            add_token_details(token_details_dict, pairs)
+
+            if (not_found_mint_addresses is not None
+                    and mint_address not in token_details_dict):
+                not_found_mint_addresses.append(mint_address)
+
+    return token_details_dict
 
-        retry_count = 0
 
-        while retry_count < max_retries:
+def query_token_details_batch(mint_addresses_batch, start_number,
+                              total_mint_addresses, max_retries, retry_after):
+    """
+    Query the Dexscreener pairs of a batch of mint addresses.
 
-            response = requests.get(url, headers=headers, verify=False)
+    :param mint_addresses_batch: The mint addresses of the batch.
+    :param start_number: The position of the first mint address of the batch, starting from 1, for the progress messages. None for the one by one queries.
+    :param total_mint_addresses: The total number of mint addresses, for the progress messages.
+    :param max_retries: The maximum number of retries.
+    :param retry_after: The wait time in seconds before retrying.
 
-            if response.status_code == 200:
+    :return: The list of pairs returned, or None if the query failed after all retries.
+    """
+    if start_number is not None:
+        print('Querying token details {} - {} out of {}'.format(
+            start_number, start_number + len(mint_addresses_batch) - 1,
+            total_mint_addresses))
 
-                token_details = response.json().get('pairs', [])
+    url = "https://api.dexscreener.com/latest/dex/tokens/{}".format(
+        ','.join(mint_addresses_batch))
 
-                if not token_details:
+    headers = {
+        "accept": "application/json",
+    }
 
-                    print(
-                        'Token details for mint address {} cannot be found. Skipping...'
-                        .format(mint_address))
+    retry_count = 0
 
-                else:
+    while retry_count < max_retries:
 
-                    for token in token_details:
-                        count += 1
-                        mint_address = token.get('baseToken',
-                                                 {}).get('address', '')
+        rate_limiter.wait()
 
-                        if not mint_address:
-                            continue
+        try:
+            response = http_client.get(url, headers=headers)
+        except RequestException as e:
+            retry_count += 1
 
-                        if mint_address not in token_details_dict:
-                            token_details_dict[mint_address] = {
-                                'chainId':
-                                token.get('chainId', ''),
-                                'dexId':
-                                token.get('dexId', ''),
-                                'name':
-                                token.get('baseToken', {}).get('name', ''),
-                                'symbol':
-                                token.get('baseToken', {}).get('symbol', ''),
-                                'volume':
-                                token.get('volume', {}),
-                                'priceChange':
-                                token.get('priceChange', {}),
-                                'liquidity':
-                                token.get('liquidity', {}),
-                                'fdv':
-                                token.get('fdv', 0),
-                                'info':
-                                token.get('info', {}),
-                            }
+            print(
+                'Query failed with error {}. Retrying ({}) after {} seconds...'
+                .format(type(e).__name__, retry_count, retry_after))
 
-                break
+            time.sleep(retry_after)
+            continue
 
-            else:
-                retry_count += 1
+        if response.status_code == 200:
 
+            pairs = response.json().get('pairs') or []
+
+            if not pairs:
                 print(
-                    'Query failed and return code is {}. Retrying ({}) after {} seconds...'
-                    .format(response.status_code, retry_count, retry_after))
+                    'Token details for mint address(es) {} cannot be found. Skipping...'
+                    .format(', '.join(mint_addresses_batch)))
 
-                time.sleep(retry_after)
+            return pairs
 
-        if retry_count >= max_retries:
-            print('Maximum retries reached. Skipping the rest...')
-            break
+        else:
+            retry_count += 1
 
-    return token_details_dict
+            print(
+                'Query failed and return code is {}. Retrying ({}) after {} seconds...'
+                .format(response.status_code, retry_count, retry_after))
+
+            time.sleep(retry_after)
+
+    print('Maximum retries reached for mint address(es) {}. Skipping...'.format(
+        ', '.join(mint_addresses_batch)))
+
+    return None
+
+
+def add_token_details(token_details_dict, pairs):
+    """
+    Split the pairs returned by Dexscreener by base token, keeping the first pair of each token.
+    """
+    for token in pairs:
+        mint_address = token.get('baseToken', {}).get('address', '')
+
+        if not mint_address:
+            continue
+
+        if mint_address not in token_details_dict:
+            token_details_dict[mint_address] = {
+                'chainId': token.get('chainId', ''),
+                'dexId': token.get('dexId', ''),
+                'name': token.get('baseToken', {}).get('name', ''),
+                'symbol': token.get('baseToken', {}).get('symbol', ''),
+                'volume': token.get('volume', {}),
+                'priceChange': token.get('priceChange', {}),
+                'liquidity': token.get('liquidity', {}),
+                'fdv': token.get('fdv', 0),
+                'info': token.get('info', {}),
+            }
@@ -0,0 +1,288 @@
+import os
+import sys
+import time
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import save_json_file
+from query_birdeye import get_birdeye_tokens
+from query_token_vybe_network import get_vybe_network_tokens
+from query_raydium_pools import get_raydium_pools_page
+from config import (EXCLUDED_MINT_ADDRESSES, BIRDEYE_QUERY_LIMIT,
+                    DISCOVERY_PAGES, DISCOVERY_RAYDIUM_PAGE_SIZE,
+                    DISCOVERY_CONCURRENCY, SCHEDULER_SOURCES)
+
+### Functions ###
+
+
+def get_float(value):
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_birdeye_seeds(page):
+    """
+    :return: The seeds of a page of the tokens with the highest 24 hours volume on Birdeye.
+    """
+    return [{
+        'mint_address': token.get('address', ''),
+        'volume_24h': get_float(token.get('v24hUSD')),
+        'pool_volume_24h': None,
+        'market_cap': get_float(token.get('mc'))
+    } for token in get_birdeye_tokens(offset=page * BIRDEYE_QUERY_LIMIT)]
+
+
+def get_vybe_network_seeds(page):
+    """
+    :return: The seeds of a page of the tokens with the highest market cap on Vybe Network.
+    """
+    return [{
+        'mint_address': token.get('mintAddress', ''),
+        'volume_24h': get_float(token.get('usdValueVolume24h')),
+        'pool_volume_24h': None,
+        'market_cap': get_float(token.get('marketCap'))
+    } for token in get_vybe_network_tokens(page)]
+
+
+def get_raydium_seeds(page):
+    """
+    :return: The seeds of the tokens of a page of the Raydium pools with the highest 24 hours volume, with the 24 hours volume of the pool.
+
+    The volume of a pool is not the volume of its tokens, so it is kept apart in `pool_volume_24h`.
+    """
+    pools_data, _ = get_raydium_pools_page('all', 'volume24h', 'desc',
+                                           DISCOVERY_RAYDIUM_PAGE_SIZE,
+                                           page + 1)
+    seeds = []
+
+    for pool in pools_data:
+        pool_volume_24h = get_float(pool.get('day', {}).get('volume'))
+
+        for mint in [pool.get('mintA', {}), pool.get('mintB', {})]:
+            seeds.append({
+                'mint_address': mint.get('address', ''),
+                'volume_24h': None,
+                'pool_volume_24h': pool_volume_24h,
+                'market_cap': None
+            })
+
+    return seeds
+
+
+DISCOVERY_SOURCES = {
+    'BIRDEYE': get_birdeye_seeds,
+    'VYBE_NETWORK': get_vybe_network_seeds,
+    'RAYDIUM': get_raydium_seeds
+}
+
+RANKING_METRICS = {
+    'VOLUME': 'volume_24h',
+    'POOL_VOLUME': 'pool_volume_24h',
+    'MARKET_CAP': 'market_cap'
+}
+
+
+def merge_seed(seeds_dict, seed, source):
+    """
+    Merge a seed into the seeds found so far, keeping the highest 24 hours volume and market cap reported for the mint address, and summing the 24 hours volume of its pools.
+    """
+    merged_seed = seeds_dict.get(seed['mint_address'])
+
+    if merged_seed is None:
+        seeds_dict[seed['mint_address']] = {
+            'mint_address': seed['mint_address'],
+            'volume_24h': seed['volume_24h'],
+            'pool_volume_24h': seed['pool_volume_24h'],
+            'market_cap': seed['market_cap'],
+            'sources': [source]
+        }
+        return
+
+    for metric in ['volume_24h', 'market_cap']:
+        if seed[metric] is not None and (merged_seed[metric] is None
+                                         or seed[metric] > merged_seed[metric]):
+            merged_seed[metric] = seed[metric]
+
+    if seed['pool_volume_24h'] is not None:
+        merged_seed['pool_volume_24h'] = (merged_seed['pool_volume_24h']
+                                          or 0) + seed['pool_volume_24h']
+
+    if source not in merged_seed['sources']:
+        merged_seed['sources'].append(source)
+
+
+def get_page_seeds(source, page):
+    """
+    Query a page of a discovery source, and time it.
+
+    :return: A tuple of the seeds of the page, or None if it failed, the error if it failed, and the latency of the page in seconds.
+    """
+    start_time = time.time()
+
+    try:
+        return DISCOVERY_SOURCES[source](page), None, time.time() - start_time
+    except Exception as e:
+        return None, e, time.time() - start_time
+
+
+def discover_seeds(sources,
+                   rank_by='VOLUME',
+                   pages=None,
+                   concurrency=DISCOVERY_CONCURRENCY):
+    """
+    Query the pages of the discovery sources concurrently, and merge the tokens found into one ranked list of seeds.
+
+    The pages of every source share one bounded thread pool, and each page is merged as soon as it
+    arrives. A failed page is reported and skipped, so a source that is down does not hold up the others.
+
+    :param sources: The names of the discovery sources, from `DISCOVERY_SOURCES`.
+    :param rank_by: VOLUME: rank the seeds by their own 24 hours volume from Birdeye or Vybe Network, POOL_VOLUME: by the summed 24 hours volume of their Raydium pools, or MARKET_CAP: by their market cap. Seeds without the metric come last, ranked by their pool volume.
+    :param pages: The number of pages to query per source. Default is `DISCOVERY_PAGES`.
+    :param concurrency: The number of pages to query in parallel.
+
+    :return: A tuple of the ranked list of seeds, and the statistics of each source, ie. its pages queried and failed, items found and the summed latency of its pages in seconds.
+    """
+    excluded_mint_addresses = set(EXCLUDED_MINT_ADDRESSES)
+    ranking_metric = RANKING_METRICS[rank_by]
+    seeds_dict = {}
+    source_stats = {
+        source: {
+            'pages': 0,
+            'failed_pages': 0,
+            'items': 0,
+            'latency': 0
+        }
+        for source in sources
+    }
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        futures = {
+            executor.submit(get_page_seeds, source, page): (source, page)
+            for source in sources
+            for page in range((pages or DISCOVERY_PAGES)[source])
+        }
+
+        for future in as_completed(futures):
+            source, page = futures[future]
+            stats = source_stats[source]
+            seeds, error, latency = future.result()
+            stats['pages'] += 1
+            stats['latency'] += latency
+
+            if error is not None:
+                stats['failed_pages'] += 1
+                print('\nPage {} of {} failed with error {}'.format(
+                    page, source, error))
+                continue
+
+            stats['items'] += len(seeds)
+
+            for seed in seeds:
+                if seed['mint_address'] and seed[
+                        'mint_address'] not in excluded_mint_addresses:
+                    merge_seed(seeds_dict, seed, source)
+
+    ranked_seeds = sorted(
+        seeds_dict.values(),
+        key=lambda x: (x[ranking_metric] is None, -(x[ranking_metric] or 0),
+                       -(x['pool_volume_24h'] or 0), x['mint_address']))
+
+    return ranked_seeds, source_stats
+
+
+def print_source_stats(source_stats):
+
+    print('\n========== Discovery statistics ==========')
+    for source, stats in source_stats.items():
+        print(
+            '{}: {} / {} pages succeeded, {} items found in {:.2f} seconds'.
+            format(source, stats['pages'] - stats['failed_pages'],
+                   stats['pages'], stats['items'], stats['latency']))
+    print('==========================================')
+
+
+## Main Program ##
+
+if __name__ == "__main__":
+
+    # Get arguments from terminal
+    parser = argparse.ArgumentParser(
+        description="Get parameters for the script.")
+    parser.add_argument(
+        '-src',
+        '--sources',
+        type=str,
+        default=','.join(SCHEDULER_SOURCES),
+        help=
+        "The discovery sources to query. Use comma separator. Available values : BIRDEYE, VYBE_NETWORK, RAYDIUM. Default is '{}'."
+        .format(','.join(SCHEDULER_SOURCES)))
+    parser.add_argument(
+        '-rb',
+        '--rank_by',
+        type=str,
+        default='VOLUME',
+        help=
+        "VOLUME: rank the seeds by their 24 hours volume, POOL_VOLUME: by the 24 hours volume of their Raydium pools, or MARKET_CAP: by their market cap. Default is VOLUME."
+    )
+    parser.add_argument(
+        '-n',
+        '--max_seeds',
+        type=int,
+        default=0,
+        help=
+        "The maximum number of top ranked seeds to save. Default is 0, ie. all of them."
+    )
+    parser.add_argument(
+        '-c',
+        '--concurrency',
+        type=int,
+        default=DISCOVERY_CONCURRENCY,
+        help="The number of pages to query in parallel. Default is {}.".
+        format(DISCOVERY_CONCURRENCY))
+    args = parser.parse_args()
+
+    sources = [
+        source.strip().upper() for source in args.sources.split(',')
+        if source.strip()
+    ]
+    rank_by = str(args.rank_by).upper()
+    max_seeds = args.max_seeds
+    concurrency = args.concurrency
+
+    for source in sources:
+        if source not in DISCOVERY_SOURCES:
+            print(
+                "\nDiscovery source {} is not supported. Supported discovery sources are BIRDEYE, VYBE_NETWORK, and RAYDIUM.\n"
+                .format(source))
+            sys.exit(1)
+
+    if rank_by not in RANKING_METRICS:
+        print(
+            "\nRanking {} is not supported. Supported rankings are VOLUME, POOL_VOLUME and MARKET_CAP.\n"
+            .format(rank_by))
+        sys.exit(1)
+
+    ranked_seeds, source_stats = discover_seeds(sources, rank_by,
+                                                concurrency=concurrency)
+
+    if max_seeds > 0:
+        ranked_seeds = ranked_seeds[:max_seeds]
+
+    print_source_stats(source_stats)
+    print('\nNo. of unique seeds found: {}'.format(len(ranked_seeds)))
+
+    saved_data_folder_file_path = './saved_data'
+    if not os.path.exists(saved_data_folder_file_path):
+        os.makedirs(saved_data_folder_file_path)
+
+    current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_name = f"{saved_data_folder_file_path}/discovery_mint_addresses_{current_datetime}.json"
+
+    save_json_file(file_name,
+                   [seed['mint_address'] for seed in ranked_seeds])
+
+    print('\nRun the command below to crawl the seeds in INPUT mode:')
+    print('python main.py -m INPUT -f {}'.format(file_name))
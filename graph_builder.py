@@ -0,0 +1,642 @@
+import numpy as np
+import pandas as pd
+from utils import can_be_float, convert_utc_to_user_timezone
+from interning import mint_address_table, signer_table
+
+# The trade columns used by `build_graph_data_vectorized`, as named in the columnar trade store
+GRAPH_TRADE_COLUMNS = [
+    'block_time', 'sell_mint_address', 'buy_mint_address',
+    'sell_amount_in_usd', 'buy_amount_in_usd', 'sell_amount',
+    'sell_price_in_usd', 'buy_amount', 'buy_price_in_usd', 'signer'
+]
+
+
+def get_node_data(mint_address, token_details):
+
+    token_website_detail = token_details.get('info', {}).get('websites', [])
+    if token_website_detail:
+        token_website = token_website_detail[0].get('url', '')
+    else:
+        token_website = ''
+
+    token_telegram = ''
+    token_twitter = ''
+    token_socials_detail = token_details.get('info', {}).get('socials', [])
+    for token_social in token_socials_detail:
+        if token_social['type'] == 'telegram':
+            token_telegram = token_social.get('url', '')
+        elif token_social['type'] == 'twitter':
+            token_twitter = token_social.get('url', '')
+
+    return {
+        'mint_address': mint_address,
+        'name': token_details.get('name', ''),
+        'symbol': token_details.get('symbol', ''),
+        'volume': token_details.get('volume', {}),
+        'price_change': token_details.get('priceChange', {}),
+        'liquidity': token_details.get('liquidity', {}),
+        'fdv': token_details.get('fdv', 0),
+        'website': token_website,
+        'telegram': token_telegram,
+        'twitter': token_twitter
+    }
+
+
+def get_trade_amount_in_usd(trade_sell, trade_buy):
+    """
+    Get the USD value of a trade from the sell side USD amount, falling back to the buy side USD amount,
+    then to the sell side amount times its USD price, then to the buy side amount times its USD price.
+    """
+    trade_sell_amount_in_usd = trade_sell['AmountInUSD']
+    if trade_sell_amount_in_usd == '0' or not can_be_float(
+            trade_sell_amount_in_usd):
+        trade_buy_amount_in_usd = trade_buy['AmountInUSD']
+        if trade_buy_amount_in_usd == '0' or not can_be_float(
+                trade_buy_amount_in_usd):
+            trade_sell_amount = trade_sell['Amount']
+            trade_sell_price_in_usd = trade_sell['PriceInUSD']
+            if trade_sell_amount == '0' or not can_be_float(
+                    trade_sell_amount) or trade_sell_price_in_usd == 0:
+                trade_buy_amount = trade_buy['Amount']
+                trade_buy_price_in_usd = trade_buy['PriceInUSD']
+                if trade_buy_amount == '0' or not can_be_float(
+                        trade_buy_amount) or trade_buy_price_in_usd == 0:
+                    trade_amount_in_usd = 0
+                else:
+                    trade_amount_in_usd = float(
+                        trade_buy_amount) * trade_buy_price_in_usd
+            else:
+                trade_amount_in_usd = float(
+                    trade_sell_amount) * trade_sell_price_in_usd
+        else:
+            trade_amount_in_usd = float(trade_buy_amount_in_usd)
+    else:
+        trade_amount_in_usd = float(trade_sell_amount_in_usd)
+
+    return trade_amount_in_usd
+
+
+def get_transaction_window(earliest_local_block_time,
+                           latest_local_block_time):
+
+    return {
+        'earliest_local_block_time':
+        earliest_local_block_time.strftime('%Y-%m-%d %H:%M:%S %Z'),
+        'latest_local_block_time':
+        latest_local_block_time.strftime('%Y-%m-%d %H:%M:%S %Z')
+    }
+
+
+def get_new_graph_state():
+    """
+    :return: An empty graph state, ie. the signer state and the block time range behind the graph data, which lets new trades be folded into the graph data later.
+    """
+    return {
+        'signatures': set(),
+        'earliest_block_time': None,
+        'latest_block_time': None,
+        'edge_signers': {},
+        'node_signers': {},
+        'signer_total_trade_amount_in_usd': {}
+    }
+
+
+def build_graph_data(combined_dex_trades_data,
+                     token_details_dict,
+                     graph_state=None):
+    """
+    Aggregate the summarized DEX trades into the graph data, one trade at a time.
+
+    A node is created for every token with token details. An edge is keyed by the direction of the first
+    trade between its two tokens, and holds the forward, reverse and net USD volumes and the number of
+    unique signers in each direction. The mint addresses and signers are interned, so the nodes are keyed
+    by mint address ID, the edges by (source ID, target ID) tuples and the signer totals by signer ID,
+    until `get_saved_graph_data` converts them back to strings.
+
+    :param combined_dex_trades_data: The summarized DEX trades.
+    :param token_details_dict: The token details, keyed by mint address.
+    :param graph_state: A new graph state from `get_new_graph_state` to collect the signer state into, if any.
+
+    :return: A tuple of the graph data and the total USD volume traded by each signer.
+    """
+    graph_data = {'nodes': {}, 'edges': {}}
+
+    if graph_state is None:
+        graph_state = get_new_graph_state()
+
+    update_graph_data(graph_data, graph_state, combined_dex_trades_data,
+                      token_details_dict)
+
+    return graph_data, graph_state['signer_total_trade_amount_in_usd']
+
+
+def update_graph_data(graph_data, graph_state, combined_dex_trades_data,
+                      token_details_dict):
+    """
+    Fold summarized DEX trades into existing graph data, one trade at a time.
+
+    The volumes, the signer counts of the edges and nodes, the signer totals and the transaction window
+    are updated in place from the graph state, so the trades already in the graph data are not aggregated
+    again. Building the graph data is folding the trades into empty graph data.
+
+    :param graph_data: The graph data keyed by interned IDs.
+    :param graph_state: The graph state of the graph data, which is updated too.
+    :param combined_dex_trades_data: The new summarized DEX trades.
+    :param token_details_dict: The token details of the mint addresses that are not nodes yet, keyed by mint address.
+    """
+    edge_key_signer_dict = graph_state['edge_signers']
+    node_signer_dict = graph_state['node_signers']
+    signer_total_trade_amount_in_usd_dict = graph_state[
+        'signer_total_trade_amount_in_usd']
+    earliest_block_time = graph_state['earliest_block_time']
+    latest_block_time = graph_state['latest_block_time']
+
+    for dex_trade in combined_dex_trades_data:
+
+        # The ISO 8601 UTC block times sort chronologically as strings
+        block_time = dex_trade['Block']['Time']
+
+        if earliest_block_time is None or block_time < earliest_block_time:
+            earliest_block_time = block_time
+        if latest_block_time is None or block_time > latest_block_time:
+            latest_block_time = block_time
+
+        trade_sell = dex_trade['Trade']['Sell']
+        trade_buy = dex_trade['Trade']['Buy']
+
+        trade_sell_mint_address_id = mint_address_table.get_id(
+            trade_sell['Currency']['MintAddress'])
+        trade_buy_mint_address_id = mint_address_table.get_id(
+            trade_buy['Currency']['MintAddress'])
+
+        signer = signer_table.get_id(dex_trade['Signer'])
+
+        for mint_address_id in [
+                trade_sell_mint_address_id, trade_buy_mint_address_id
+        ]:
+            if mint_address_id not in graph_data['nodes']:
+                mint_address = mint_address_table.get_value(mint_address_id)
+                token_details = token_details_dict.get(mint_address, {})
+
+                if not token_details:
+                    continue
+
+                graph_data['nodes'][mint_address_id] = get_node_data(
+                    mint_address, token_details)
+
+        if trade_sell_mint_address_id not in graph_data[
+                'nodes'] or trade_buy_mint_address_id not in graph_data[
+                    'nodes']:
+            continue
+
+        trade_amount_in_usd = get_trade_amount_in_usd(trade_sell, trade_buy)
+
+        edge_key_main = (trade_sell_mint_address_id, trade_buy_mint_address_id)
+        edge_key_reverse = (trade_buy_mint_address_id,
+                            trade_sell_mint_address_id)
+
+        if edge_key_main not in graph_data[
+                'edges'] and edge_key_reverse not in graph_data['edges']:
+            graph_data['edges'][edge_key_main] = {
+                'trade_amount_in_usd_forward': trade_amount_in_usd,
+                'trade_amount_in_usd_reverse': 0,
+                'trade_amount_in_usd_net': trade_amount_in_usd,
+                'no_of_signers_forward': 1,
+                'no_of_signers_reverse': 0,
+                'no_of_signers_combined': 1
+            }
+            edge_key_signer_dict[edge_key_main] = {
+                'forward': {signer},
+                'reverse': set(),
+                'combined': {signer}
+            }
+        else:
+            if edge_key_main in graph_data['edges']:
+                graph_data['edges'][edge_key_main][
+                    'trade_amount_in_usd_forward'] += trade_amount_in_usd
+                graph_data['edges'][edge_key_main][
+                    'trade_amount_in_usd_net'] += trade_amount_in_usd
+                if signer not in edge_key_signer_dict[edge_key_main][
+                        'combined']:
+                    graph_data['edges'][edge_key_main][
+                        'no_of_signers_combined'] += 1
+                    edge_key_signer_dict[edge_key_main]['combined'].add(
+                        signer)
+                if signer not in edge_key_signer_dict[edge_key_main][
+                        'forward']:
+                    graph_data['edges'][edge_key_main][
+                        'no_of_signers_forward'] += 1
+                    edge_key_signer_dict[edge_key_main]['forward'].add(signer)
+            else:
+                graph_data['edges'][edge_key_reverse][
+                    'trade_amount_in_usd_reverse'] += trade_amount_in_usd
+                graph_data['edges'][edge_key_reverse][
+                    'trade_amount_in_usd_net'] -= trade_amount_in_usd
+                if signer not in edge_key_signer_dict[edge_key_reverse][
+                        'combined']:
+                    graph_data['edges'][edge_key_reverse][
+                        'no_of_signers_combined'] += 1
+                    edge_key_signer_dict[edge_key_reverse]['combined'].add(
+                        signer)
+                if signer not in edge_key_signer_dict[edge_key_reverse][
+                        'reverse']:
+                    graph_data['edges'][edge_key_reverse][
+                        'no_of_signers_reverse'] += 1
+                    edge_key_signer_dict[edge_key_reverse]['reverse'].add(
+                        signer)
+
+        for mint_address_id in [
+                trade_sell_mint_address_id, trade_buy_mint_address_id
+        ]:
+            if mint_address_id not in node_signer_dict:
+                node_signer_dict[mint_address_id] = {signer}
+            else:
+                node_signer_dict[mint_address_id].add(signer)
+
+        if signer not in signer_total_trade_amount_in_usd_dict:
+            signer_total_trade_amount_in_usd_dict[signer] = trade_amount_in_usd
+        else:
+            signer_total_trade_amount_in_usd_dict[
+                signer] += trade_amount_in_usd
+
+    # Exact number of unique signers per node, since summing the per-edge counts double-counts signers
+    for mint_address_id, node_data in graph_data['nodes'].items():
+        node_data['no_of_signers_combined'] = len(
+            node_signer_dict.get(mint_address_id, ()))
+
+    graph_state['earliest_block_time'] = earliest_block_time
+    graph_state['latest_block_time'] = latest_block_time
+
+    if earliest_block_time is not None:
+        graph_data['transaction_window'] = get_transaction_window(
+            convert_utc_to_user_timezone(earliest_block_time),
+            convert_utc_to_user_timezone(latest_block_time))
+
+
+def get_parsed_amounts(amounts):
+    """
+    :return: A tuple of the amounts parsed as floats and whether each amount is usable, ie. a number other than the string '0'.
+    """
+    is_amount_usable = (pd.to_numeric(amounts, errors='coerce').notna()
+                        & (amounts != '0')).to_numpy()
+
+    # pandas parses with a faster but not correctly rounded algorithm, so the usable amounts are parsed again like `float`
+    parsed_amounts = np.full(len(amounts), np.nan)
+    parsed_amounts[is_amount_usable] = amounts.to_numpy(
+        dtype=object)[is_amount_usable].astype(float)
+
+    return parsed_amounts, is_amount_usable
+
+
+def get_no_of_unique_pairs(group_codes, member_codes, no_of_groups):
+    """
+    :return: The number of unique members of each group, indexed by group code.
+    """
+    no_of_members = int(member_codes.max()) + 1 if len(member_codes) else 1
+    unique_pair_keys = pd.unique(
+        group_codes.astype(np.int64) * no_of_members + member_codes)
+
+    return np.bincount(unique_pair_keys // no_of_members,
+                       minlength=no_of_groups)
+
+
+def get_unique_group_members(group_codes, member_codes, group_keys,
+                             member_ids):
+    """
+    :return: A dictionary of the set of unique member IDs of each group, keyed by group key.
+    """
+    no_of_members = len(member_ids)
+    group_members = {group_key: set() for group_key in group_keys}
+
+    for unique_pair_key in pd.unique(
+            group_codes.astype(np.int64) * no_of_members +
+            member_codes).tolist():
+        group_members[group_keys[unique_pair_key // no_of_members]].add(
+            member_ids[unique_pair_key % no_of_members])
+
+    return group_members
+
+
+def build_graph_data_vectorized(combined_dex_trades_data,
+                                token_details_dict,
+                                graph_state=None):
+    """
+    Aggregate the summarized DEX trades into the graph data with pandas and NumPy.
+
+    Produces the same graph data as `build_graph_data`: the trades are loaded into columns once, the USD
+    value fallbacks are resolved column-wise, the edge of each token pair is keyed by the direction of
+    its first trade, and the volumes and unique signer counts are computed per edge and per node with
+    group counts. The volumes are summed in trade order, so they match the sequential sums exactly. The
+    graph data is keyed by interned IDs like `build_graph_data`.
+
+    :param combined_dex_trades_data: The summarized DEX trades, or a data frame of their `GRAPH_TRADE_COLUMNS` loaded from the trade store.
+    :param token_details_dict: The token details, keyed by mint address.
+    :param graph_state: A new graph state from `get_new_graph_state` to collect the signer state into, if any.
+
+    :return: A tuple of the graph data and the total USD volume traded by each signer.
+    """
+    graph_data = {'nodes': {}, 'edges': {}}
+
+    if isinstance(combined_dex_trades_data, pd.DataFrame):
+        trades = combined_dex_trades_data[GRAPH_TRADE_COLUMNS]
+    else:
+        trades = pd.DataFrame.from_records(
+            [(dex_trade['Block']['Time'], trade_sell['Currency']['MintAddress'],
+              trade_buy['Currency']['MintAddress'], trade_sell['AmountInUSD'],
+              trade_buy['AmountInUSD'], trade_sell['Amount'],
+              trade_sell['PriceInUSD'], trade_buy['Amount'],
+              trade_buy['PriceInUSD'], dex_trade['Signer'])
+             for dex_trade in combined_dex_trades_data
+             for trade_sell, trade_buy in [(dex_trade['Trade']['Sell'],
+                                            dex_trade['Trade']['Buy'])]],
+            columns=GRAPH_TRADE_COLUMNS)
+
+    # Nodes are created in the order their tokens first appear in the trades
+    trade_mint_addresses = np.empty(2 * len(trades), dtype=object)
+    trade_mint_addresses[0::2] = trades['sell_mint_address'].to_numpy()
+    trade_mint_addresses[1::2] = trades['buy_mint_address'].to_numpy()
+
+    node_mint_addresses = []
+
+    for mint_address in pd.unique(trade_mint_addresses):
+        token_details = token_details_dict.get(mint_address, {})
+
+        if token_details:
+            node_mint_addresses.append(mint_address)
+            graph_data['nodes'][mint_address_table.get_id(
+                mint_address)] = get_node_data(mint_address, token_details)
+
+    # The ISO 8601 UTC block times sort chronologically as strings
+    earliest_block_time = trades['block_time'].min()
+    latest_block_time = trades['block_time'].max()
+    graph_data['transaction_window'] = get_transaction_window(
+        convert_utc_to_user_timezone(earliest_block_time),
+        convert_utc_to_user_timezone(latest_block_time))
+
+    trades = trades[trades['sell_mint_address'].isin(node_mint_addresses)
+                    & trades['buy_mint_address'].isin(node_mint_addresses)]
+    no_of_graph_trades = len(trades)
+
+    # Same fallback chain as `get_trade_amount_in_usd`, parsing each fallback only for the trades still unresolved
+    trade_amount_in_usd = np.zeros(no_of_graph_trades)
+    is_unresolved = np.ones(no_of_graph_trades, dtype=bool)
+
+    for amount_column, price_column in [
+        ('sell_amount_in_usd', None), ('buy_amount_in_usd', None),
+        ('sell_amount', 'sell_price_in_usd'), ('buy_amount', 'buy_price_in_usd')
+    ]:
+        unresolved_indices = np.flatnonzero(is_unresolved)
+        amounts, is_amount_usable = get_parsed_amounts(
+            trades[amount_column].iloc[unresolved_indices])
+
+        if price_column is not None:
+            prices = trades[price_column].iloc[unresolved_indices].to_numpy(
+                dtype=float)
+            amounts = amounts * prices
+            is_amount_usable = is_amount_usable & (prices != 0)
+
+        trade_amount_in_usd[
+            unresolved_indices[is_amount_usable]] = amounts[is_amount_usable]
+        is_unresolved[unresolved_indices[is_amount_usable]] = False
+
+    mint_address_codes, mint_addresses = pd.factorize(
+        np.concatenate([
+            trades['sell_mint_address'].to_numpy(),
+            trades['buy_mint_address'].to_numpy()
+        ]))
+    mint_address_ids = mint_address_table.get_ids(mint_addresses)
+    sell_codes = mint_address_codes[:no_of_graph_trades].astype(np.int64)
+    buy_codes = mint_address_codes[no_of_graph_trades:].astype(np.int64)
+    signer_codes, signers = pd.factorize(trades['signer'])
+
+    # Edges are numbered in the order their token pairs first appear, and keyed by the direction of their first trade
+    edge_codes, _ = pd.factorize(
+        np.minimum(sell_codes, buy_codes) * len(mint_addresses) +
+        np.maximum(sell_codes, buy_codes))
+    no_of_edges = int(edge_codes.max()) + 1 if no_of_graph_trades else 0
+    first_trade_indices = pd.Series(
+        edge_codes).drop_duplicates().index.to_numpy()
+    edge_sell_codes = sell_codes[first_trade_indices]
+    edge_buy_codes = buy_codes[first_trade_indices]
+    is_forward = sell_codes == edge_sell_codes[edge_codes]
+
+    # bincount adds the weights in trade order, like the sequential loop
+    trade_amount_in_usd_forward = np.bincount(
+        edge_codes[is_forward],
+        weights=trade_amount_in_usd[is_forward],
+        minlength=no_of_edges)
+    trade_amount_in_usd_reverse = np.bincount(
+        edge_codes[~is_forward],
+        weights=trade_amount_in_usd[~is_forward],
+        minlength=no_of_edges)
+    trade_amount_in_usd_net = np.bincount(edge_codes,
+                                          weights=np.where(
+                                              is_forward, trade_amount_in_usd,
+                                              -trade_amount_in_usd),
+                                          minlength=no_of_edges)
+
+    # The sequential sums stay the integer 0 until a trade with a USD value is added, so they are cast back to match
+    is_resolved = ~is_unresolved
+    no_of_resolved_trades_forward = np.bincount(
+        edge_codes[is_forward & is_resolved], minlength=no_of_edges)
+    no_of_resolved_trades_reverse = np.bincount(
+        edge_codes[~is_forward & is_resolved], minlength=no_of_edges)
+
+    no_of_signers_forward = get_no_of_unique_pairs(edge_codes[is_forward],
+                                                   signer_codes[is_forward],
+                                                   no_of_edges)
+    no_of_signers_reverse = get_no_of_unique_pairs(edge_codes[~is_forward],
+                                                   signer_codes[~is_forward],
+                                                   no_of_edges)
+    no_of_signers_combined = get_no_of_unique_pairs(edge_codes, signer_codes,
+                                                    no_of_edges)
+
+    for (edge_sell_code, edge_buy_code, forward, reverse, net,
+         resolved_forward, resolved_reverse, signers_forward, signers_reverse,
+         signers_combined) in zip(
+             edge_sell_codes.tolist(), edge_buy_codes.tolist(),
+             trade_amount_in_usd_forward.tolist(),
+             trade_amount_in_usd_reverse.tolist(),
+             trade_amount_in_usd_net.tolist(),
+             no_of_resolved_trades_forward.tolist(),
+             no_of_resolved_trades_reverse.tolist(),
+             no_of_signers_forward.tolist(), no_of_signers_reverse.tolist(),
+             no_of_signers_combined.tolist()):
+        edge_key = (mint_address_ids[edge_sell_code],
+                    mint_address_ids[edge_buy_code])
+        graph_data['edges'][edge_key] = {
+            'trade_amount_in_usd_forward': forward if resolved_forward else 0,
+            'trade_amount_in_usd_reverse': reverse if resolved_reverse else 0,
+            'trade_amount_in_usd_net':
+            net if resolved_forward or resolved_reverse else 0,
+            'no_of_signers_forward': signers_forward,
+            'no_of_signers_reverse': signers_reverse,
+            'no_of_signers_combined': signers_combined
+        }
+
+    node_no_of_signers_combined = get_no_of_unique_pairs(
+        np.concatenate([sell_codes, buy_codes]),
+        np.concatenate([signer_codes, signer_codes]), len(mint_addresses))
+
+    for node_data in graph_data['nodes'].values():
+        node_data['no_of_signers_combined'] = 0
+
+    for mint_address_id, no_of_signers in zip(
+            mint_address_ids, node_no_of_signers_combined.tolist()):
+        graph_data['nodes'][mint_address_id][
+            'no_of_signers_combined'] = no_of_signers
+
+    signer_total_trade_amount_in_usd = np.bincount(
+        signer_codes, weights=trade_amount_in_usd, minlength=len(signers))
+    no_of_resolved_trades_per_signer = np.bincount(signer_codes[is_resolved],
+                                                   minlength=len(signers))
+    signer_total_trade_amount_in_usd_dict = {
+        signer_id: total if no_of_resolved_trades else 0
+        for signer_id, total, no_of_resolved_trades in zip(
+            signer_table.get_ids(signers),
+            signer_total_trade_amount_in_usd.tolist(),
+            no_of_resolved_trades_per_signer.tolist())
+    }
+
+    if graph_state is not None:
+        edge_keys = list(graph_data['edges'])
+        signer_ids = signer_table.get_ids(signers)
+        edge_signers_forward = get_unique_group_members(
+            edge_codes[is_forward], signer_codes[is_forward], edge_keys,
+            signer_ids)
+        edge_signers_reverse = get_unique_group_members(
+            edge_codes[~is_forward], signer_codes[~is_forward], edge_keys,
+            signer_ids)
+
+        graph_state['earliest_block_time'] = earliest_block_time
+        graph_state['latest_block_time'] = latest_block_time
+        graph_state['edge_signers'] = {
+            edge_key: {
+                'forward': edge_signers_forward[edge_key],
+                'reverse': edge_signers_reverse[edge_key],
+                'combined':
+                edge_signers_forward[edge_key] | edge_signers_reverse[edge_key]
+            }
+            for edge_key in edge_keys
+        }
+        graph_state['node_signers'] = get_unique_group_members(
+            np.concatenate([sell_codes, buy_codes]),
+            np.concatenate([signer_codes, signer_codes]), mint_address_ids,
+            signer_ids)
+        graph_state['signer_total_trade_amount_in_usd'] = (
+            signer_total_trade_amount_in_usd_dict)
+
+    return graph_data, signer_total_trade_amount_in_usd_dict
+
+
+def get_saved_graph_data(graph_data):
+    """
+    Convert the graph data keyed by interned IDs back to the saved format, keyed by mint address and by 'source-target' edge keys.
+    """
+    saved_graph_data = dict(graph_data)
+    saved_graph_data['nodes'] = {
+        mint_address_table.get_value(mint_address_id): node_data
+        for mint_address_id, node_data in graph_data['nodes'].items()
+    }
+    saved_graph_data['edges'] = {
+        mint_address_table.get_value(source_id) + '-' +
+        mint_address_table.get_value(target_id): edge_data
+        for (source_id, target_id), edge_data in graph_data['edges'].items()
+    }
+
+    return saved_graph_data
+
+
+def get_interned_graph_data(saved_graph_data):
+    """
+    Convert the saved graph data back to the graph data keyed by interned IDs.
+    """
+    graph_data = dict(saved_graph_data)
+    graph_data['nodes'] = {
+        mint_address_table.get_id(mint_address): node_data
+        for mint_address, node_data in saved_graph_data['nodes'].items()
+    }
+    graph_data['edges'] = {}
+
+    for edge_key, edge_data in saved_graph_data['edges'].items():
+        source, target = edge_key.split('-')
+        graph_data['edges'][(mint_address_table.get_id(source),
+                             mint_address_table.get_id(target))] = edge_data
+
+    return graph_data
+
+
+def get_saved_signer_total_trade_amount_in_usd_dict(
+        signer_total_trade_amount_in_usd_dict):
+    """
+    Convert the total USD volume traded by each signer back to the saved format, keyed by signer.
+    """
+    return {
+        signer_table.get_value(signer_id): trade_amount_in_usd
+        for signer_id, trade_amount_in_usd in
+        signer_total_trade_amount_in_usd_dict.items()
+    }
+
+
+def get_saved_graph_state(graph_state):
+    """
+    Convert the graph state keyed by interned IDs to the saved format.
+
+    The combined signers of each edge and the signers of each node are left out, since they can be
+    rebuilt from the forward and reverse signers of the edges.
+    """
+    return {
+        'signatures':
+        sorted(graph_state['signatures']),
+        'earliest_block_time':
+        graph_state['earliest_block_time'],
+        'latest_block_time':
+        graph_state['latest_block_time'],
+        'edge_signers': {
+            mint_address_table.get_value(source_id) + '-' +
+            mint_address_table.get_value(target_id): {
+                'forward': signer_table.get_values(edge_signers['forward']),
+                'reverse': signer_table.get_values(edge_signers['reverse'])
+            }
+            for (source_id,
+                 target_id), edge_signers in graph_state['edge_signers'].items()
+        },
+        'signer_total_trade_amount_in_usd':
+        get_saved_signer_total_trade_amount_in_usd_dict(
+            graph_state['signer_total_trade_amount_in_usd'])
+    }
+
+
+def get_interned_graph_state(saved_graph_state):
+    """
+    Convert the saved graph state back to the graph state keyed by interned IDs.
+    """
+    graph_state = get_new_graph_state()
+    graph_state['signatures'] = set(saved_graph_state['signatures'])
+    graph_state['earliest_block_time'] = saved_graph_state[
+        'earliest_block_time']
+    graph_state['latest_block_time'] = saved_graph_state['latest_block_time']
+
+    for edge_key, saved_edge_signers in saved_graph_state[
+            'edge_signers'].items():
+        source, target = edge_key.split('-')
+        source_id = mint_address_table.get_id(source)
+        target_id = mint_address_table.get_id(target)
+        edge_signers = {
+            'forward': set(signer_table.get_ids(saved_edge_signers['forward'])),
+            'reverse': set(signer_table.get_ids(saved_edge_signers['reverse']))
+        }
+        edge_signers[
+            'combined'] = edge_signers['forward'] | edge_signers['reverse']
+        graph_state['edge_signers'][(source_id, target_id)] = edge_signers
+
+        for mint_address_id in [source_id, target_id]:
+            graph_state['node_signers'].setdefault(
+                mint_address_id, set()).update(edge_signers['combined'])
+
+    for signer, trade_amount_in_usd in saved_graph_state[
+            'signer_total_trade_amount_in_usd'].items():
+        graph_state['signer_total_trade_amount_in_usd'][signer_table.get_id(
+            signer)] = trade_amount_in_usd
+
+    return graph_state
@@ -0,0 +1,325 @@
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
+from utils import load_json_file, save_json_file
+from config import (GRAPH_LAYOUT, LAYOUT_ITERATIONS,
+                    LAYOUT_WARM_START_ITERATIONS, LAYOUT_EXACT_MAX_NODES,
+                    LAYOUT_CACHE_MAX_ENTRIES)
+
+# References:
+# - https://networkx.org/documentation/stable/reference/generated/networkx.drawing.layout.spring_layout.html
+# - https://en.wikipedia.org/wiki/Barnes%E2%80%93Hut_simulation
+
+
+class LayoutCache:
+    """
+    On-disk LRU cache of the node positions of the graph plot, keyed by mint address.
+
+    The positions of a plot are stored when it is drawn, so that the next snapshot of the graph can start
+    the layout from them. The least recently plotted nodes are evicted above `max_entries`.
+    """
+
+    def __init__(self, file_path, max_entries=LAYOUT_CACHE_MAX_ENTRIES):
+        self.file_path = file_path
+        self.max_entries = max_entries
+
+        # Ordered from the least to the most recently plotted
+        self.entries = OrderedDict()
+        if os.path.exists(file_path):
+            self.entries.update(load_json_file(file_path))
+
+    def get_positions(self, node_keys):
+        """
+        :return: The cached positions of the node keys, for the keys that are in the cache.
+        """
+        return {
+            node_key: self.entries[node_key]
+            for node_key in node_keys if node_key in self.entries
+        }
+
+    def update(self, positions):
+
+        for node_key, position in positions.items():
+            self.entries.pop(node_key, None)
+            self.entries[node_key] = [float(position[0]), float(position[1])]
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+
+        save_json_file(self.file_path, self.entries)
+
+
+def get_node_key(G, node):
+    """
+    :return: The mint address of the node, or of the token that an "other" node of collapsed leaves belongs to, prefixed with 'OTHER_'.
+    """
+    if isinstance(node, tuple):
+        return 'OTHER_' + G.nodes[node[1]]['mint_address']
+
+    return G.nodes[node]['mint_address']
+
+
+def get_spiral_layout(G, initial_pos=None):
+    """
+    :return: The positions of the nodes on a spiral. The initial positions are ignored.
+    """
+    return nx.spiral_layout(G,
+                            scale=1,
+                            center=None,
+                            dim=2,
+                            resolution=0.8,
+                            equidistant=True)
+
+
+def get_exact_repulsion(pos, k):
+    """
+    :return: The repulsive displacement of every node from every other node, in O(n^2).
+    """
+    delta_x = pos[:, 0, np.newaxis] - pos[np.newaxis, :, 0]
+    delta_y = pos[:, 1, np.newaxis] - pos[np.newaxis, :, 1]
+    factor = k**2 / np.maximum(delta_x**2 + delta_y**2, (0.01 * k)**2)
+
+    return np.stack([(delta_x * factor).sum(axis=1),
+                     (delta_y * factor).sum(axis=1)],
+                    axis=1)
+
+
+def get_approximate_repulsion(pos, k):
+    """
+    Approximate the repulsive displacement of every node with a single-level Barnes-Hut style grid.
+
+    The nodes are binned into a grid of about sqrt(n) / 6 nodes per cell. A node is pushed by every
+    node in the 3x3 cells around its own, exactly, and by every farther cell as a whole, from the
+    centre of mass of the cell. Both parts take about O(n^1.5) instead of O(n^2).
+    """
+    n = len(pos)
+    min_pos = pos.min(axis=0)
+    extent = max(np.ptp(pos, axis=0).max(), k)
+    grid_size = max(int(np.ceil(np.sqrt(6 * np.sqrt(n)))), 1)
+    cell_size = extent / grid_size * (1 + 1e-9)
+
+    node_cells = np.minimum(((pos - min_pos) / cell_size).astype(np.int64),
+                            grid_size - 1)
+    node_cell_ids = node_cells[:, 0] * grid_size + node_cells[:, 1]
+    cell_ids, node_cell_indices, cell_masses = np.unique(node_cell_ids,
+                                                         return_inverse=True,
+                                                         return_counts=True)
+    node_cell_indices = node_cell_indices.ravel()
+    cell_centres = np.stack([
+        np.bincount(node_cell_indices, weights=pos[:, axis]) / cell_masses
+        for axis in range(2)
+    ],
+                            axis=1)
+    cells = np.stack([cell_ids // grid_size, cell_ids % grid_size], axis=1)
+
+    # The cells farther than the 3x3 cells around each occupied cell
+    is_far_cell = np.abs(cells[:, np.newaxis, :] -
+                         cells[np.newaxis, :, :]).max(axis=2) > 1
+    far_masses = np.where(is_far_cell, cell_masses * k**2, 0)
+
+    displacement = np.zeros_like(pos)
+
+    # Far field, in chunks of nodes to bound the memory of the n x cells arrays
+    chunk_size = max(2**20 // len(cell_ids), 1)
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        delta_x = pos[start:end, 0, np.newaxis] - cell_centres[np.newaxis, :, 0]
+        delta_y = pos[start:end, 1, np.newaxis] - cell_centres[np.newaxis, :, 1]
+        factor = far_masses[node_cell_indices[start:end]] / np.maximum(
+            delta_x**2 + delta_y**2, (0.01 * k)**2)
+        displacement[start:end, 0] = (delta_x * factor).sum(axis=1)
+        displacement[start:end, 1] = (delta_y * factor).sum(axis=1)
+
+    # Near field, from the pairs of nodes in neighbouring cells
+    pairs = cKDTree(pos).query_pairs(r=2 * np.sqrt(2) * cell_size,
+                                     output_type='ndarray')
+    if len(pairs):
+        is_near_pair = np.ones(len(pairs), dtype=bool)
+        for axis in range(2):
+            is_near_pair &= np.abs(node_cells[pairs[:, 0], axis] -
+                                   node_cells[pairs[:, 1], axis]) <= 1
+        pairs = pairs[is_near_pair]
+        delta = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+        distance_squared = np.maximum((delta**2).sum(axis=1), (0.01 * k)**2)
+        forces = delta * (k**2 / distance_squared)[:, np.newaxis]
+
+        for axis in range(2):
+            displacement[:, axis] += np.bincount(
+                pairs[:, 0], weights=forces[:, axis], minlength=n)
+            displacement[:, axis] -= np.bincount(
+                pairs[:, 1], weights=forces[:, axis], minlength=n)
+
+    return displacement
+
+
+def get_force_directed_layout(G,
+                              initial_pos=None,
+                              iterations=LAYOUT_ITERATIONS,
+                              warm_start_iterations=LAYOUT_WARM_START_ITERATIONS,
+                              exact_max_nodes=LAYOUT_EXACT_MAX_NODES,
+                              seed=0):
+    """
+    Place the nodes with a Fruchterman-Reingold force-directed layout on the sparse adjacency matrix of the graph.
+
+    Edges pull their tokens together with a strength that grows with the log of their net volume, so
+    tokens with heavy flows end up close. Up to `exact_max_nodes` nodes, every pair of nodes repels
+    exactly, and above it the repulsion is approximated, see `get_approximate_repulsion`.
+
+    If at least half of the nodes have initial positions, the layout is warm started: the new nodes start
+    next to their placed neighbours, the moves are capped to half the ideal length of an edge, and only
+    `warm_start_iterations` are run, so the placed nodes stay close to where they were.
+
+    :param G: The graph to lay out.
+    :param initial_pos: The initial positions of some of the nodes, eg. from the previous snapshot.
+    :param iterations: The maximum number of iterations without a warm start.
+    :param warm_start_iterations: The maximum number of iterations with a warm start.
+    :param exact_max_nodes: The maximum number of nodes to compute the exact repulsion for.
+    :param seed: The seed of the random initial positions.
+
+    :return: The positions of the nodes, keyed by node.
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    initial_pos = initial_pos or {}
+    node_indices = {node: i for i, node in enumerate(nodes)}
+    rng = np.random.default_rng(seed)
+    k = 1 / np.sqrt(n)
+
+    # Symmetric sparse adjacency matrix weighted by the log of the net volume, scaled to (0, 1]
+    edge_rows = []
+    edge_columns = []
+    edge_weights = []
+    for source, target, attributes in G.edges(data=True):
+        edge_rows.append(node_indices[source])
+        edge_columns.append(node_indices[target])
+        edge_weights.append(np.log1p(attributes.get('weight_net', 1)))
+    edge_weights = np.asarray(edge_weights, dtype=float)
+    edge_weights = edge_weights / max(edge_weights.max(initial=0), 1e-9)
+    adjacency = sp.coo_matrix((np.concatenate(
+        [edge_weights, edge_weights]), (np.concatenate(
+            [edge_rows, edge_columns]), np.concatenate([edge_columns,
+                                                        edge_rows]))),
+                              shape=(n, n)).tocsr()
+    adjacency.sum_duplicates()
+    adjacency = adjacency.tocoo()
+
+    pos = rng.random((n, 2))
+    is_placed = np.array([node in initial_pos for node in nodes])
+    is_warm_start = is_placed.sum() >= n / 2
+
+    if is_placed.any():
+        pos[is_placed] = np.array(
+            [initial_pos[node] for node in nodes if node in initial_pos],
+            dtype=float)
+        min_pos = pos[is_placed].min(axis=0)
+        extent = np.maximum(np.ptp(pos[is_placed], axis=0), k)
+        pos[~is_placed] = min_pos + pos[~is_placed] * extent
+
+        # Start the new nodes next to the mean of their placed neighbours, if any
+        placed_adjacency = adjacency.tocsr()[:, is_placed]
+        no_of_placed_neighbours = np.asarray(
+            placed_adjacency.getnnz(axis=1)).ravel()
+        has_placed_neighbours = ~is_placed & (no_of_placed_neighbours > 0)
+        if has_placed_neighbours.any():
+            neighbour_pos = (placed_adjacency != 0).astype(float).dot(
+                pos[is_placed])
+            pos[has_placed_neighbours] = (
+                neighbour_pos[has_placed_neighbours] /
+                no_of_placed_neighbours[has_placed_neighbours, np.newaxis] +
+                rng.normal(0, k, (has_placed_neighbours.sum(), 2)))
+
+    if is_warm_start:
+        max_iterations = warm_start_iterations
+        temperature = k / 2
+    else:
+        max_iterations = iterations
+        temperature = 0.1 * max(np.ptp(pos, axis=0).max(), k)
+    cooling = temperature / (max_iterations + 1)
+
+    rows = adjacency.row
+    columns = adjacency.col
+    weights = adjacency.data
+
+    for iteration in range(max_iterations):
+        if n <= exact_max_nodes:
+            displacement = get_exact_repulsion(pos, k)
+        else:
+            displacement = get_approximate_repulsion(pos, k)
+
+        delta = pos[rows] - pos[columns]
+        distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 0.01 * k)
+        forces = delta * (weights * distance / k)[:, np.newaxis]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(rows,
+                                                 weights=forces[:, axis],
+                                                 minlength=n)
+
+        # Weak pull to the centre, so that the components of the graph do not drift apart across snapshots
+        displacement -= pos - pos.mean(axis=0)
+
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]),
+                            0.01 * k)
+        moves = displacement * (np.minimum(length, temperature) /
+                                length)[:, np.newaxis]
+        pos += moves
+        temperature -= cooling
+
+        if np.hypot(moves[:, 0], moves[:, 1]).mean() < 1e-3 * k:
+            break
+
+    return {node: pos[i] for i, node in enumerate(nodes)}
+
+
+LAYOUTS = {'SPIRAL': get_spiral_layout, 'FORCE': get_force_directed_layout}
+
+
+def get_graph_layout(G, layout=GRAPH_LAYOUT, layout_cache_file_path=None):
+    """
+    Lay out the graph plot. The force-directed layout starts from the positions cached by the previous plots if a cache file is given.
+
+    :param G: The graph to lay out, with the mint address of every node.
+    :param layout: The name of the layout, from `LAYOUTS`.
+    :param layout_cache_file_path: The file of the layout cache, or None to not use the cache.
+
+    :return: The positions of the nodes, keyed by node.
+    """
+    start_time = time.time()
+
+    # The spiral layout only depends on the order of the nodes, so only the force-directed layout uses the cache
+    if layout != 'FORCE':
+        layout_cache_file_path = None
+
+    node_keys = {node: get_node_key(G, node) for node in G.nodes()}
+    initial_pos = {}
+
+    if layout_cache_file_path:
+        layout_cache = LayoutCache(layout_cache_file_path)
+        cached_positions = layout_cache.get_positions(node_keys.values())
+        initial_pos = {
+            node: cached_positions[node_key]
+            for node, node_key in node_keys.items()
+            if node_key in cached_positions
+        }
+
+    pos = LAYOUTS[layout](G, initial_pos)
+
+    print('\nGraph layout: {}, {} nodes, {} positions reused, {:.2f} seconds'.
+          format(layout, len(pos), len(initial_pos),
+                 time.time() - start_time))
+
+    if layout_cache_file_path:
+        layout_cache.update(
+            {node_keys[node]: position
+             for node, position in pos.items()})
+        layout_cache.save()
+
+    return pos
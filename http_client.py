@@ -0,0 +1,136 @@
+import time
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+                    HTTP_STREAM_CHUNK_SIZE)
+
+# Shared HTTP transport used by every module that talks to an external API.
+# A single requests.Session keeps one keep-alive connection pool per host, so
+# repeated calls to Bitquery, Dexscreener, Vybe Network, Raydium and Birdeye
+# reuse the same TCP + TLS connection instead of opening a new one each time.
+
+_session = None
+_session_lock = threading.Lock()
+_host_stats = {}
+_host_stats_lock = threading.Lock()
+
+
+def get_session():
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                                      pool_maxsize=HTTP_POOL_MAXSIZE,
+                                      max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive'
+                })
+                _session = session
+
+    return _session
+
+
+def record_host_bytes(url, no_of_bytes):
+
+    host = urlparse(url).netloc
+
+    with _host_stats_lock:
+        if host not in _host_stats:
+            _host_stats[host] = {'requests': 0, 'bytes': 0}
+        _host_stats[host]['bytes'] += no_of_bytes
+
+
+def request(method, url, timeout=None, stream=False, **kwargs):
+
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    kwargs.setdefault('verify', False)
+
+    host = urlparse(url).netloc
+
+    with _host_stats_lock:
+        if host not in _host_stats:
+            _host_stats[host] = {'requests': 0, 'bytes': 0}
+        _host_stats[host]['requests'] += 1
+
+    response = get_session().request(method,
+                                     url,
+                                     timeout=timeout,
+                                     stream=stream,
+                                     **kwargs)
+
+    if not stream:
+        record_host_bytes(url, len(response.content))
+
+    return response
+
+
+def iter_response_content(response, chunk_size=HTTP_STREAM_CHUNK_SIZE):
+    """
+    Iterate over the decompressed body of a streamed response, counting the bytes received.
+    """
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        record_host_bytes(response.url, len(chunk))
+        yield chunk
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out requests to at most `max_requests_per_minute`.
+    """
+
+    def __init__(self, max_requests_per_minute):
+        self.interval = 60 / max_requests_per_minute
+        self.next_request_time = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+
+        with self.lock:
+            now = time.monotonic()
+            request_time = max(now, self.next_request_time)
+            self.next_request_time = request_time + self.interval
+
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+def get(url, **kwargs):
+
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+
+    return request('POST', url, **kwargs)
+
+
+def get_host_stats():
+
+    with _host_stats_lock:
+        return {host: dict(stats) for host, stats in _host_stats.items()}
+
+
+def print_host_stats():
+
+    host_stats = get_host_stats()
+
+    if not host_stats:
+        return
+
+    print('\n========== HTTP transport statistics ==========')
+    for host, stats in sorted(host_stats.items()):
+        print('{}: {} requests, {:,.2f} KB received'.format(
+            host, stats['requests'], stats['bytes'] / 1024))
+    print('===============================================')
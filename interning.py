@@ -0,0 +1,51 @@
+class InternTable:
+    """
+    Interning table that maps each string, eg. a mint address or a signer, to a dense integer ID.
+
+    IDs are assigned from 0 in the order the strings are first seen, so the strings can be looked up
+    again by ID from a list. The pipeline works on the IDs, which are cheaper to store and hash than the
+    44-character base58 addresses, and converts them back to strings when saving or plotting.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __len__(self):
+
+        return len(self.values)
+
+    def get_id(self, value):
+
+        value_id = self.ids.get(value)
+
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+
+        return value_id
+
+    def get_ids(self, values):
+
+        return [self.get_id(value) for value in values]
+
+    def get_value(self, value_id):
+
+        return self.values[value_id]
+
+    def get_values(self, value_ids):
+
+        return [self.values[value_id] for value_id in value_ids]
+
+    def clear(self):
+        """
+        Forget every string and ID, eg. between two runs in the same process, whose IDs are never mixed.
+        """
+        self.ids.clear()
+        self.values.clear()
+
+
+# Shared by every stage of a run, so that an ID means the same address everywhere
+mint_address_table = InternTable()
+signer_table = InternTable()
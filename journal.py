@@ -0,0 +1,154 @@
+import os
+import json
+import threading
+from utils import save_json_file
+from config import JOURNAL_FSYNC_BATCH_SIZE
+
+
+def get_journal_file_path(file_path):
+
+    return os.path.splitext(file_path)[0] + '.ndjson'
+
+
+def format_journal_lines(records):
+
+    return ''.join(
+        json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+        for record in records)
+
+
+def load_journal_records(journal_file_path):
+    """
+    Read every complete record of an NDJSON journal.
+
+    A partially written last line, which is left behind when the program dies in the middle of an append,
+    is ignored.
+
+    :param journal_file_path: The path to the NDJSON journal.
+
+    :return: A list of the journal records in the order they were appended.
+    """
+    records = []
+
+    if not os.path.exists(journal_file_path):
+        return records
+
+    with open(journal_file_path, 'r') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+
+    return records
+
+
+class Journal:
+    """
+    Append-only NDJSON checkpoint journal backing one saved JSON artifact.
+
+    Each step appends only its new records instead of rewriting the whole artifact. Appended lines are
+    flushed to the OS immediately and fsynced to disk once every `fsync_batch_size` records. `compact`
+    turns the journal into the JSON artifact that the LOAD_* modes read.
+    """
+
+    def __init__(self, file_path, fsync_batch_size=JOURNAL_FSYNC_BATCH_SIZE):
+        self.file_path = file_path
+        self.journal_file_path = get_journal_file_path(file_path)
+        self.fsync_batch_size = fsync_batch_size
+        self.no_of_unsynced_records = 0
+        self.lock = threading.Lock()
+        self.file = open(self.journal_file_path, 'a')
+
+    def append(self, records):
+
+        if not records:
+            return
+
+        lines = format_journal_lines(records)
+
+        with self.lock:
+            self.file.write(lines)
+            self.file.flush()
+            self.no_of_unsynced_records += len(records)
+
+            if self.no_of_unsynced_records >= self.fsync_batch_size:
+                os.fsync(self.file.fileno())
+                self.no_of_unsynced_records = 0
+
+    def sync(self):
+
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.no_of_unsynced_records = 0
+
+    def close(self):
+
+        self.sync()
+
+        with self.lock:
+            self.file.close()
+
+    def truncate(self, no_of_records):
+        """
+        Keep only the first `no_of_records` complete records of the journal.
+
+        Used when resuming, to drop records appended after the last step that was confirmed as completed.
+
+        :param no_of_records: The number of records to keep.
+
+        :return: The list of records kept.
+        """
+        with self.lock:
+            self.file.close()
+
+            records = load_journal_records(
+                self.journal_file_path)[:no_of_records]
+
+            with open(self.journal_file_path, 'w') as f:
+                f.write(format_journal_lines(records))
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.file = open(self.journal_file_path, 'a')
+            self.no_of_unsynced_records = 0
+
+        return records
+
+    def remove(self):
+
+        self.close()
+
+        if os.path.exists(self.journal_file_path):
+            os.remove(self.journal_file_path)
+
+    def compact(self,
+                unique=False,
+                remove_journal=True,
+                save_records=save_json_file):
+        """
+        Write the journal records into the JSON artifact.
+
+        :param unique: Drop repeated records, keeping the first occurrence. Only for hashable records.
+        :param remove_journal: Delete the journal once the JSON artifact is written.
+        :param save_records: The function that writes the records to the artifact file, `save_json_file` by default.
+
+        :return: The list of records written.
+        """
+        self.close()
+
+        records = load_journal_records(self.journal_file_path)
+
+        if unique:
+            records = list(dict.fromkeys(records))
+
+        save_records(self.file_path, records)
+
+        if remove_journal:
+            os.remove(self.journal_file_path)
+
+        return records
@@ -1,58 +1,57 @@
-import requests
 import os
 import json
 import pytz
 from datetime import datetime, timedelta
 from tzlocal import get_localzone
-from collections import deque
+from collections import deque, OrderedDict
 import warnings
 import time
 import argparse
 import sys
 import copy
+from requests.exceptions import RequestException
 from itertools import groupby
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from bisect import bisect_left, bisect_right
 from utils import *
+from journal import Journal, load_journal_records
+from batch_sizer import AdaptiveBatchSizer
+from streaming_json import iter_json_array_items
+from trade_cache import TradeCache
+from token_details_cache import TokenDetailsCache
 import dexscreener
+from sliding_window_graph import SlidingWindowGraph
+from bitquery_stream import BitquerySubscription
+import http_client
+from bitquery_auth import generate_oAuth
+from graph_builder import (build_graph_data, build_graph_data_vectorized,
+                           update_graph_data, get_new_graph_state,
+                           get_saved_graph_data, get_interned_graph_data,
+                           get_saved_graph_state, get_interned_graph_state,
+                           get_saved_signer_total_trade_amount_in_usd_dict,
+                           GRAPH_TRADE_COLUMNS)
+from interning import mint_address_table
+from trade_store import (save_trades, load_trades, load_trades_frame,
+                         is_trade_store_file)
 from plot_graph import plot_nodes_edges_graph
-from config import (BITQUERY_CLIENT_ID, BITQUERY_CLIENT_SECRET,
-                    BITQUERY_V1_API_KEY, BITQUERY_API_VERSION,
+from config import (BITQUERY_V1_API_KEY, BITQUERY_API_VERSION,
                     BITQUERY_API_VERSION_URL_MAP, EXCLUDED_MINT_ADDRESSES,
                     variables, MAX_RETRIES, RETRY_AFTER,
-                    MAX_NO_OF_SIGNATURES_PER_BATCH)
+                    MAX_NO_OF_SIGNATURES_PER_BATCH, BFS_CONCURRENCY,
+                    SIGNATURE_BATCH_CONCURRENCY, ADAPTIVE_BATCH_SIZING,
+                    STREAM_DEX_TRADES, TRADE_CACHE, TOKEN_DETAILS_CACHE,
+                    GRAPH_ENGINE, TRADE_STORE_FORMAT, SLIDING_WINDOW_HOURS,
+                    LIVE_SNAPSHOT_SECONDS, LIVE_MAX_SEEN_SIGNATURES,
+                    LIVE_BACKFILL_PAGE_SIZE,
+                    PLOT_TOP_K_EDGES_PER_NODE, PLOT_EDGE_BUDGET,
+                    GRAPH_LAYOUT, LAYOUT_CACHE)
 
 warnings.filterwarnings("ignore", module="urllib3")
 
-### Functions ###
-
-
-def generate_oAuth():
-
-    url = "https://oauth2.bitquery.io/oauth2/token"
-
-    payload = 'grant_type=client_credentials&client_id={}&client_secret={}&scope=api'.format(
-        BITQUERY_CLIENT_ID, BITQUERY_CLIENT_SECRET)
-
-    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-
-    response = requests.request("POST",
-                                url,
-                                headers=headers,
-                                data=payload,
-                                verify=False)
-    resp = json.loads(response.text)
-
-    print("========== oAuth's reponse ==========")
-    print(resp)
-    print('=====================================')
+unique_signatures_lock = threading.Lock()
 
-    access_token = resp['access_token']
-
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {access_token}'
-    }
-
-    return headers
+### Functions ###
 
 
 def get_api_base_url():
@@ -67,27 +66,76 @@ def get_api_base_url():
         return url
 
 
-def bitqueryAPICall(payload, max_retries=MAX_RETRIES, retry_after=RETRY_AFTER):
+def bitqueryAPICall(payload,
+                    max_retries=MAX_RETRIES,
+                    retry_after=RETRY_AFTER,
+                    return_status=False,
+                    stream_handler=None):
+    """
+    Send a GraphQL query to Bitquery and return the DEX trades data.
 
+    :param payload: The GraphQL query and variables.
+    :param max_retries: The maximum number of attempts.
+    :param retry_after: The wait time in seconds after a failed attempt.
+    :param return_status: Also return the failure of the query: None if it succeeded, 'NO_DATA' if the response has no DEX trades data field, eg. a GraphQL error, or 'MAX_RETRIES' if it ran out of retries.
+    :param stream_handler: A function that consumes an iterator of the DEX trades data decoded incrementally from the response body. Its result is returned in place of the list of DEX trades data, so the whole response is never held in memory. On failure, it is given an empty iterator.
+
+    :return: A list of DEX trades data (or the result of `stream_handler`), or a tuple of it and the failure if `return_status` is set.
+    """
     retry_count = 0
 
     while retry_count < max_retries:
 
-        if BITQUERY_API_VERSION == 'v1':
-            response = requests.post(url,
-                                     json=payload,
-                                     headers=headers,
-                                     verify=False)
-        else:
-            response = requests.post(url,
-                                     headers=headers,
-                                     data=json.dumps(payload),
-                                     verify=False)
+        try:
+            if BITQUERY_API_VERSION == 'v1':
+                response = http_client.post(url,
+                                            json=payload,
+                                            headers=headers,
+                                            stream=stream_handler is not None)
+            else:
+                response = http_client.post(url,
+                                            headers=headers,
+                                            data=json.dumps(payload),
+                                            stream=stream_handler is not None)
+
+            if stream_handler is not None and response.status_code != 200:
+                response.close()
+
+            elif stream_handler is not None:
+                try:
+                    dex_trades_data = stream_handler(
+                        iter_json_array_items(
+                            http_client.iter_response_content(response),
+                            'DEXTrades'))
+                    failure = None
+                except ValueError:
+                    print('The DEX Trades data is missing. Skipping...')
+
+                    dex_trades_data = stream_handler(iter(()))
+                    failure = 'NO_DATA'
+                finally:
+                    response.close()
+
+                if return_status:
+                    return dex_trades_data, failure
+
+                return dex_trades_data
+
+        except RequestException as e:
+            retry_count += 1
+
+            print('Query failed with error {}. Retrying ({}) after {} seconds...'.
+                  format(type(e).__name__, retry_count, retry_after))
+
+            time.sleep(retry_after)
+            continue
 
         if response.status_code == 200:
+            failure = None
+
             try:
-                dex_trades_data = response.json().get('data', {}).get(
-                    'Solana', {}).get('DEXTrades', [])
+                dex_trades_data = response.json(
+                )['data']['Solana']['DEXTrades']
 
                 if not isinstance(dex_trades_data, list):
                     print(
@@ -95,10 +143,15 @@ def bitqueryAPICall(payload, max_retries=MAX_RETRIES, retry_after=RETRY_AFTER):
                     )
 
                     dex_trades_data = []
+                    failure = 'NO_DATA'
             except:
                 print('The DEX Trades data is missing. Skipping...')
 
                 dex_trades_data = []
+                failure = 'NO_DATA'
+
+            if return_status:
+                return dex_trades_data, failure
 
             return dex_trades_data
 
@@ -121,7 +174,15 @@ def bitqueryAPICall(payload, max_retries=MAX_RETRIES, retry_after=RETRY_AFTER):
 
     print('Maximum retries reached. Skipping...')
 
-    return []
+    if stream_handler is not None:
+        dex_trades_data = stream_handler(iter(()))
+    else:
+        dex_trades_data = []
+
+    if return_status:
+        return dex_trades_data, 'MAX_RETRIES'
+
+    return dex_trades_data
 
 
 def accumulate_txn_signatures(mint_address):
@@ -169,9 +230,53 @@ def accumulate_txn_signatures(mint_address):
     return new_mint_addresses
 
 
+def expand_mint_address(mint_address):
+    """
+    Query the transaction signatures of a mint address and return its children mint addresses.
+
+    Mint addresses already expanded by an interrupted run are answered from the checkpoint journal
+    instead of being queried again.
+
+    :param mint_address: The mint address to expand.
+
+    :return: A set of children mint addresses.
+    """
+    if mint_address in completed_expansions:
+        print('Mint address {} was already queried. Restored from checkpoint.'.
+              format(mint_address))
+
+        return set(completed_expansions[mint_address])
+
+    children_mint_addresses = accumulate_txn_signatures(mint_address)
+
+    expansions_journal.append([{
+        'mint_address': mint_address,
+        'children': list(children_mint_addresses)
+    }])
+
+    return children_mint_addresses
+
+
+def restore_harvested_signatures():
+    """
+    Reload the signatures and the expanded mint addresses journaled by an interrupted run.
+    """
+    unique_signatures.update(
+        load_journal_records(signatures_journal.journal_file_path))
+
+    for record in load_journal_records(expansions_journal.journal_file_path):
+        completed_expansions[record['mint_address']] = record['children']
+
+    if completed_expansions:
+        print(
+            '\nRestored {} queried mint addresses and {} unique signatures from checkpoint.'
+            .format(len(completed_expansions), len(unique_signatures)))
+
+
 def get_mint_addresses_and_unique_signatures(dex_trades_data):
 
     new_mint_addresses = set()
+    new_signatures = []
 
     for trade in dex_trades_data:
         buy_mint_address = trade['Trade']['Buy']['Currency']['MintAddress']
@@ -183,23 +288,37 @@ def get_mint_addresses_and_unique_signatures(dex_trades_data):
             new_mint_addresses.add(sell_mint_address)
 
         signature = trade['Transaction']['Signature']
-        unique_signatures.add(signature)
+
+        with unique_signatures_lock:
+            if signature not in unique_signatures:
+                unique_signatures.add(signature)
+                new_signatures.append(signature)
+
+    signatures_journal.append(new_signatures)
 
     return new_mint_addresses
 
 
-def bfs_accumulate_unique_signatures(mint_address, max_node_depth):
+def bfs_accumulate_unique_signatures(mint_address,
+                                     max_node_depth,
+                                     concurrency=BFS_CONCURRENCY):
     """
     Traverse the tree of mint addresses up to the specified depth using BFS.
     
     :param mint_address: The starting mint address.
     :param max_node_depth: The depth to which the function should traverse.
+    :param concurrency: The number of mint addresses queried in parallel. A value of 1 keeps the sequential crawl.
 
     :return: A set of unique mint addresses.
     """
     if max_node_depth <= 0:
+        mint_addresses_journal.append([mint_address])
         return {mint_address}
 
+    if concurrency > 1:
+        return bfs_accumulate_unique_signatures_concurrently(
+            mint_address, max_node_depth, concurrency)
+
     queue = deque([(mint_address, 0)])
     depth_node_count_dict = {0: 1}
     previous_node_depth = -1
@@ -210,6 +329,7 @@ def bfs_accumulate_unique_signatures(mint_address, max_node_depth):
 
         if current_mint_address not in unique_mint_addresses:
             unique_mint_addresses.add(current_mint_address)
+            mint_addresses_journal.append([current_mint_address])
 
             if current_node_depth < max_node_depth:
 
@@ -222,14 +342,9 @@ def bfs_accumulate_unique_signatures(mint_address, max_node_depth):
                       format(current_mint_address, current_node_depth,
                              mint_address_depth_count,
                              depth_node_count_dict[current_node_depth]))
-                children_mint_addresses = accumulate_txn_signatures(
+                children_mint_addresses = expand_mint_address(
                     current_mint_address)
 
-                save_json_file(saved_unique_mint_addresses_file_path,
-                               list(unique_mint_addresses))
-                save_json_file(saved_unique_signatures_file_path,
-                               list(unique_signatures))
-
                 for children_mint_address in children_mint_addresses:
                     if children_mint_address not in unique_mint_addresses:
                         queue.append(
@@ -244,141 +359,1050 @@ def bfs_accumulate_unique_signatures(mint_address, max_node_depth):
     return unique_mint_addresses
 
 
-def get_dex_trades_data(
-        unique_signatures,
-        max_no_of_signatures_per_batch=MAX_NO_OF_SIGNATURES_PER_BATCH):
-
-    unique_signatures_list = list(unique_signatures)
-    total_unique_signatures = len(unique_signatures)
-
-    for i in range(0, total_unique_signatures, max_no_of_signatures_per_batch):
-
-        unique_signatures_batch = unique_signatures_list[
-            i:i + max_no_of_signatures_per_batch]
-
-        unique_signatures_batch_json = json.dumps(unique_signatures_batch)
-
-        query = f"""
-        query {{
-        Solana {{
-            DEXTrades(
-            where: {{Transaction: {{Signature: {{in: {unique_signatures_batch_json}}}}}}}
-            orderBy: {{ascendingByField: "Transaction_Signature", ascending: Trade_Index}}
-            ) {{
-            Trade {{
-                Buy {{
-                Amount
-                AmountInUSD
-                Currency {{
-                    MintAddress
-                    Name
-                    Symbol
-                }}
-                PriceInUSD
-                }}
-                Dex {{
-                    ProgramAddress
-                    ProtocolName
-                }}
-                Sell {{
-                Amount
-                AmountInUSD
-                Currency {{
-                    MintAddress
-                    Name
-                    Symbol
-                }}
-                PriceInUSD
-                }}
-                Index
+def bfs_accumulate_unique_signatures_concurrently(mint_address, max_node_depth,
+                                                  concurrency):
+    """
+    Traverse the tree of mint addresses up to the specified depth, expanding a whole depth level at once.
+
+    Every mint address of the current depth is queried in parallel by a bounded pool of worker threads.
+    The children of the level form the next frontier after removing the visited mint addresses, so the
+    mint addresses and signatures collected are the same as in the sequential crawl.
+
+    :param mint_address: The starting mint address.
+    :param max_node_depth: The depth to which the function should traverse.
+    :param concurrency: The maximum number of mint addresses queried in parallel.
+
+    :return: A set of unique mint addresses.
+    """
+    frontier = [mint_address]
+    unique_mint_addresses = set()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        for current_node_depth in range(max_node_depth):
+
+            frontier = [
+                frontier_mint_address for frontier_mint_address in frontier
+                if frontier_mint_address not in unique_mint_addresses
+            ]
+
+            if not frontier:
+                break
+
+            unique_mint_addresses.update(frontier)
+            mint_addresses_journal.append(frontier)
+            total_depth_mint_addresses = len(frontier)
+
+            print('\nQuerying {} mint addresses from depth {} ({} in parallel)'.
+                  format(total_depth_mint_addresses, current_node_depth,
+                         concurrency))
+
+            futures = {
+                executor.submit(expand_mint_address,
+                                frontier_mint_address): frontier_mint_address
+                for frontier_mint_address in frontier
+            }
+
+            next_frontier = set()
+            mint_address_depth_count = 0
+
+            for future in as_completed(futures):
+                mint_address_depth_count += 1
+
+                print('Queried mint address {} from depth {} ({} / {})'.format(
+                    futures[future], current_node_depth,
+                    mint_address_depth_count, total_depth_mint_addresses))
+
+                next_frontier.update(future.result())
+
+            frontier = list(next_frontier)
+
+    last_depth_mint_addresses = [
+        frontier_mint_address for frontier_mint_address in frontier
+        if frontier_mint_address not in unique_mint_addresses
+    ]
+    unique_mint_addresses.update(last_depth_mint_addresses)
+    mint_addresses_journal.append(last_depth_mint_addresses)
+
+    return unique_mint_addresses
+
+
+def fetch_dex_trades_batch(unique_signatures_batch,
+                           start_number,
+                           end_number,
+                           total_unique_signatures,
+                           transaction_summaries=None,
+                           stream=STREAM_DEX_TRADES):
+    """
+    Query the DEX trades data of a batch of signatures and summarize it.
+
+    :param unique_signatures_batch: The transaction signatures of the batch.
+    :param start_number: The position of the first signature of the batch, starting from 1.
+    :param end_number: The position of the last signature of the batch.
+    :param total_unique_signatures: The total number of signatures, for the progress messages.
+    :param transaction_summaries: A list to collect the (signature, summarized trade, outcome) of every transaction queried into, if any. Only the transactions of a successful attempt are collected.
+    :param stream: Decode and summarize the DEX trades data while the response is being read, so that only one transaction's trades are held in memory.
+
+    :return: A tuple of the summarized trades, the number of DEX trades rows returned, the failure of the query (see `bitqueryAPICall`) and the query latency in seconds.
+    """
+
+    unique_signatures_batch_json = json.dumps(unique_signatures_batch)
+
+    query = f"""
+    query {{
+    Solana {{
+        DEXTrades(
+        where: {{Transaction: {{Signature: {{in: {unique_signatures_batch_json}}}}}}}
+        orderBy: {{ascendingByField: "Transaction_Signature", ascending: Trade_Index}}
+        ) {{
+        Trade {{
+            Buy {{
+            Amount
+            AmountInUSD
+            Currency {{
+                MintAddress
+                Name
+                Symbol
             }}
-            Transaction {{
-                Signature
-                Signer
+            PriceInUSD
             }}
-            Block {{
-                Time
+            Dex {{
+                ProgramAddress
+                ProtocolName
             }}
+            Sell {{
+            Amount
+            AmountInUSD
+            Currency {{
+                MintAddress
+                Name
+                Symbol
+            }}
+            PriceInUSD
             }}
+            Index
+        }}
+        Transaction {{
+            Signature
+            Signer
         }}
+        Block {{
+            Time
         }}
-        """
+        }}
+    }}
+    }}
+    """
+
+    print('\nQuerying transaction signature {} - {} out of {}'.format(
+        start_number, end_number, total_unique_signatures))
+
+    payload = {'query': query, 'variables': variables}
+    query_start_time = time.time()
+
+    # The stream handler runs once per attempt, and an attempt may fail part-way through the rows,
+    # so the transactions of each attempt are collected apart and only kept from a successful one
+    attempt_transaction_summaries = []
+
+    def stream_handler(dex_trades_data):
+        attempt_transaction_summaries.clear()
+        return process_dex_trades_data(dex_trades_data,
+                                       attempt_transaction_summaries)
+
+    if stream:
+        (summarized_trades,
+         no_of_rows), failure = bitqueryAPICall(payload,
+                                                return_status=True,
+                                                stream_handler=stream_handler)
+    else:
+        dex_trades_data, failure = bitqueryAPICall(payload,
+                                                     return_status=True)
+        summarized_trades, no_of_rows = stream_handler(dex_trades_data)
+
+    if transaction_summaries is not None and failure is None:
+        transaction_summaries.extend(attempt_transaction_summaries)
+
+    latency = time.time() - query_start_time
+
+    return summarized_trades, no_of_rows, failure, latency
+
 
-        start_number = i + 1
+def fetch_dex_trades_batch_with_bisection(unique_signatures_batch,
+                                          start_number,
+                                          total_unique_signatures,
+                                          batch_sizer=None,
+                                          transaction_summaries=None):
+    """
+    Query the DEX trades data of a batch, and bisect the batch if the response has no DEX trades data.
+
+    A batch whose query succeeds but returns no rows is confirmed as dead, since none of its signatures
+    has trades in the EAP retention window. A batch whose query runs out of retries, eg. during a 429
+    storm or an outage, is not bisected: its signatures are returned as unfetched, to be queried again.
+
+    :param unique_signatures_batch: The transaction signatures of the batch.
+    :param start_number: The position of the first signature of the batch, starting from 1.
+    :param total_unique_signatures: The total number of signatures, for the progress messages.
+    :param batch_sizer: The `AdaptiveBatchSizer` to report the outcome of the batch query to, if any.
+    :param transaction_summaries: A list to collect the (signature, summarized trade, outcome) of every transaction queried into, if any.
+
+    :return: A tuple of the summarized trades, the number of DEX trades rows returned, the list of dead signatures found and the list of signatures that could not be fetched.
+    """
+    end_number = start_number + len(unique_signatures_batch) - 1
+
+    summarized_trades, no_of_rows, failure, latency = fetch_dex_trades_batch(
+        unique_signatures_batch, start_number, end_number,
+        total_unique_signatures, transaction_summaries)
+
+    if batch_sizer is not None:
+        batch_sizer.record(len(unique_signatures_batch), latency, no_of_rows,
+                           failure is not None)
+
+    if no_of_rows:
+        return summarized_trades, no_of_rows, [], []
+    elif failure is None:
+        return [], 0, list(unique_signatures_batch), []
+    elif failure == 'MAX_RETRIES':
+        return [], 0, [], list(unique_signatures_batch)
 
-        if i + max_no_of_signatures_per_batch > total_unique_signatures:
-            end_number = total_unique_signatures
+    return bisect_dex_trades_batch(unique_signatures_batch, start_number,
+                                   total_unique_signatures,
+                                   transaction_summaries)
+
+
+def fetch_dex_trades_batch_with_cache(unique_signatures_batch,
+                                     start_number,
+                                     total_unique_signatures,
+                                     trade_cache,
+                                     batch_sizer=None):
+    """
+    Look up the summarized trades of a batch in the trade cache, and query only the missing signatures.
+
+    The missing signatures are queried with bisection (see `fetch_dex_trades_batch_with_bisection`), and
+    the transactions summarized from the queries that completed are added to the cache, but never those
+    of a failed query or of an unfetched signature. The summarized trades of the batch are returned in
+    signature order.
+
+    :param unique_signatures_batch: The transaction signatures of the batch.
+    :param start_number: The position of the first signature of the batch, starting from 1.
+    :param total_unique_signatures: The total number of signatures, for the progress messages.
+    :param trade_cache: The `TradeCache` to look up and store the summarized trades in.
+    :param batch_sizer: The `AdaptiveBatchSizer` to report the outcome of the batch query to, if any.
+
+    :return: A tuple of the summarized trades, the number of DEX trades rows returned, the list of dead signatures found and the list of signatures that could not be fetched.
+    """
+    end_number = start_number + len(unique_signatures_batch) - 1
+
+    cached_summarized_trades = trade_cache.get_many(unique_signatures_batch)
+    uncached_unique_signatures_batch = [
+        signature for signature in unique_signatures_batch
+        if signature not in cached_summarized_trades
+    ]
+
+    if cached_summarized_trades:
+        print('\nFound {} of transaction signature {} - {} in the trade cache'.
+              format(len(cached_summarized_trades), start_number, end_number))
+
+    transaction_summaries = []
+    no_of_rows = 0
+    dead_signatures = []
+    unfetched_signatures = []
+
+    if uncached_unique_signatures_batch:
+        _, no_of_rows, dead_signatures, unfetched_signatures = fetch_dex_trades_batch_with_bisection(
+            uncached_unique_signatures_batch, start_number,
+            total_unique_signatures, batch_sizer, transaction_summaries)
+
+        # A partial trade set would be served from the cache on every later run, so the unfetched signatures are never cached
+        unfetched_signature_set = set(unfetched_signatures)
+        trade_cache.put_many([
+            transaction_summary
+            for transaction_summary in transaction_summaries
+            if transaction_summary[0] not in unfetched_signature_set
+        ])
+
+    summarized_trades_by_signature = cached_summarized_trades
+    summarized_trades_by_signature.update(
+        (signature, summarized_trade)
+        for signature, summarized_trade, _ in transaction_summaries)
+
+    # The outcome of cached trades is checked again in case the excluded mint addresses have changed
+    summarized_trades = [
+        summarized_trades_by_signature[signature]
+        for signature in unique_signatures_batch
+        if signature in summarized_trades_by_signature
+        and get_summarized_trade_outcome(
+            summarized_trades_by_signature[signature]) == 'TRADE'
+    ]
+
+    return summarized_trades, no_of_rows, dead_signatures, unfetched_signatures
+
+
+def bisect_dex_trades_batch(unique_signatures_batch,
+                            start_number,
+                            total_unique_signatures,
+                            transaction_summaries=None):
+    """
+    Recover the DEX trades data of a batch whose response had no DEX trades data by splitting it in halves.
+
+    Each half is queried again. A half that returns data is kept. A half whose query succeeds but
+    returns no rows is confirmed as dead, since none of its signatures has trades in the EAP retention
+    window. A half whose response has no DEX trades data again is split again, until the signatures
+    that make the query fail are isolated. Those signatures are skipped by this run but not recorded as
+    dead, since the failure may be transient. The halves whose query runs out of retries are returned
+    as unfetched, to be queried again.
+
+    :param unique_signatures_batch: The transaction signatures of the batch.
+    :param start_number: The position of the first signature of the batch, starting from 1.
+    :param total_unique_signatures: The total number of signatures, for the progress messages.
+    :param transaction_summaries: A list to collect the (signature, summarized trade, outcome) of every transaction recovered into, if any.
+
+    :return: A tuple of the summarized trades recovered, the number of DEX trades rows returned, the list of dead signatures found and the list of signatures that could not be fetched.
+    """
+    if len(unique_signatures_batch) == 1:
+        print('Skipping transaction signature {}, its query failed.'.format(
+            start_number))
+        return [], 0, [], []
+
+    print('Bisecting transaction signature {} - {}...'.format(
+        start_number, start_number + len(unique_signatures_batch) - 1))
+
+    middle = len(unique_signatures_batch) // 2
+    summarized_trades = []
+    no_of_rows = 0
+    dead_signatures = []
+    unfetched_signatures = []
+
+    for half_unique_signatures_batch, half_start_number in [
+        (unique_signatures_batch[:middle], start_number),
+        (unique_signatures_batch[middle:], start_number + middle)
+    ]:
+        half_summarized_trades, half_no_of_rows, half_failure, _ = fetch_dex_trades_batch(
+            half_unique_signatures_batch, half_start_number,
+            half_start_number + len(half_unique_signatures_batch) - 1,
+            total_unique_signatures, transaction_summaries)
+
+        if half_no_of_rows:
+            summarized_trades.extend(half_summarized_trades)
+            no_of_rows += half_no_of_rows
+        elif half_failure is None:
+            dead_signatures.extend(half_unique_signatures_batch)
+        elif half_failure == 'MAX_RETRIES':
+            unfetched_signatures.extend(half_unique_signatures_batch)
         else:
-            end_number = i + max_no_of_signatures_per_batch
+            half_summarized_trades, half_no_of_rows, half_dead_signatures, half_unfetched_signatures = bisect_dex_trades_batch(
+                half_unique_signatures_batch, half_start_number,
+                total_unique_signatures, transaction_summaries)
+            summarized_trades.extend(half_summarized_trades)
+            no_of_rows += half_no_of_rows
+            dead_signatures.extend(half_dead_signatures)
+            unfetched_signatures.extend(half_unfetched_signatures)
+
+    return summarized_trades, no_of_rows, dead_signatures, unfetched_signatures
+
 
-        print('\nQuerying transaction signature {} - {} out of {}'.format(
-            start_number, end_number, total_unique_signatures))
+def get_dex_trades_data(
+        unique_signatures,
+        max_no_of_signatures_per_batch=MAX_NO_OF_SIGNATURES_PER_BATCH,
+        batch_concurrency=SIGNATURE_BATCH_CONCURRENCY,
+        adaptive_batch_sizing=ADAPTIVE_BATCH_SIZING,
+        use_trade_cache=TRADE_CACHE):
+    """
+    Query the DEX trades data of the signatures in batches and process them.
+
+    Up to `batch_concurrency` batches are fetched in parallel by worker threads, while the completed
+    batches are processed and journaled in batch order by the calling thread. A new batch is only
+    submitted once the oldest one is processed, so at most `batch_concurrency` raw responses are held
+    in memory and `combined_dex_trades_data` keeps the same order as a sequential run.
+
+    With adaptive batch sizing, the size of each new batch is tuned from the latency, the number of rows
+    and the failures of the batches processed so far (see `AdaptiveBatchSizer`).
+
+    Batches that return no rows are confirmed as dead, and batches whose response has no DEX trades data
+    are bisected (see `fetch_dex_trades_batch_with_bisection`). The dead signatures found are saved and
+    never queried again by later runs. If some signatures of a batch could not be fetched, eg. after
+    running out of retries, the batch is not checkpointed, no new batch is started, and the run exits
+    once the batches in flight are processed, so that it can be resumed later.
+
+    With the trade cache, signatures summarized by previous runs are read from the cache instead of
+    being queried again (see `fetch_dex_trades_batch_with_cache`).
+
+    :param unique_signatures: The transaction signatures to query.
+    :param max_no_of_signatures_per_batch: The maximum number of signatures per query.
+    :param batch_concurrency: The maximum number of batches fetched in parallel.
+    :param adaptive_batch_sizing: Tune the batch size at runtime instead of always using the maximum.
+    :param use_trade_cache: Look up and store the summarized trades in the persistent trade cache.
+    """
+    dead_signatures_journal = Journal(saved_dead_signatures_file_path)
+    dead_signatures = set(
+        load_journal_records(dead_signatures_journal.journal_file_path))
+
+    # Sorted so that the batches are the same when an interrupted run is resumed
+    unique_signatures_list = sorted(
+        signature for signature in unique_signatures
+        if signature not in dead_signatures)
+    total_unique_signatures = len(unique_signatures_list)
+
+    if len(unique_signatures_list) < len(unique_signatures):
+        print('\nSkipping {} dead signatures found by previous runs.'.format(
+            len(unique_signatures) - len(unique_signatures_list)))
+
+    trades_journal = Journal(saved_trades_file_path)
+    fetched_batches_journal = Journal(saved_fetched_batches_file_path)
+    fetched_batch_ends = restore_fetched_batches(trades_journal,
+                                                 fetched_batches_journal,
+                                                 unique_signatures_list)
+    fetched_batch_starts = sorted(fetched_batch_ends)
+    in_flight_batches = deque()
+    i = 0
+    no_of_unfetched_signatures = 0
+
+    if adaptive_batch_sizing:
+        batch_sizer = AdaptiveBatchSizer(saved_batch_size_stats_file_path,
+                                         max_batch_size=max_no_of_signatures_per_batch)
+    else:
+        batch_sizer = None
+
+    if use_trade_cache:
+        trade_cache = TradeCache(saved_trade_cache_file_path)
+    else:
+        trade_cache = None
 
-        payload = {'query': query, 'variables': variables}
-        dex_trades_data = bitqueryAPICall(payload)
+    with ThreadPoolExecutor(max_workers=batch_concurrency) as executor:
 
-        if len(dex_trades_data) == 0:
+        while True:
+
+            # Fill the fetch stage up to the concurrency limit
+            while len(in_flight_batches
+                      ) < batch_concurrency and not no_of_unfetched_signatures:
+
+                while i in fetched_batch_ends:
+                    i = fetched_batch_ends[i]
+
+                if i >= total_unique_signatures:
+                    break
+
+                if batch_sizer is not None:
+                    batch_size = batch_sizer.get_batch_size()
+                else:
+                    batch_size = max_no_of_signatures_per_batch
+
+                # Stop before the next batch restored from checkpoint
+                next_fetched_batch_index = bisect_right(
+                    fetched_batch_starts, i)
+                if next_fetched_batch_index < len(fetched_batch_starts):
+                    batch_end = min(
+                        i + batch_size,
+                        fetched_batch_starts[next_fetched_batch_index])
+                else:
+                    batch_end = min(i + batch_size, total_unique_signatures)
+
+                if trade_cache is not None:
+                    future = executor.submit(
+                        fetch_dex_trades_batch_with_cache,
+                        unique_signatures_list[i:batch_end], i + 1,
+                        total_unique_signatures, trade_cache, batch_sizer)
+                else:
+                    future = executor.submit(
+                        fetch_dex_trades_batch_with_bisection,
+                        unique_signatures_list[i:batch_end], i + 1,
+                        total_unique_signatures, batch_sizer)
+                in_flight_batches.append((i, batch_end, future))
+                i = batch_end
+
+            if not in_flight_batches:
+                break
+
+            # Process the oldest batch while the others are still being fetched
+            batch_start, batch_end, future = in_flight_batches.popleft()
+            summarized_trades, no_of_rows, batch_dead_signatures, batch_unfetched_signatures = future.result(
+            )
+
+            if batch_dead_signatures:
+                print(
+                    '\n{} dead signatures found in transaction signature {} - {}. They will not be queried again.'
+                    .format(len(batch_dead_signatures), batch_start + 1,
+                            batch_end))
+                dead_signatures_journal.append(batch_dead_signatures)
+
+            # The batch is fetched again in full by a resumed run, from the trade cache if enabled
+            if batch_unfetched_signatures:
+                print(
+                    '\n{} signatures in transaction signature {} - {} could not be fetched.'
+                    .format(len(batch_unfetched_signatures), batch_start + 1,
+                            batch_end))
+                no_of_unfetched_signatures += len(batch_unfetched_signatures)
+                continue
+
+            if no_of_rows == 0 and not summarized_trades:
+                print(
+                    '\nNo DEX trades data retrieved in transaction signature {} - {}.'
+                    .format(batch_start + 1, batch_end))
+            else:
+                print(
+                    'No. of unprocessed DEX Trades queried for transaction signature {} - {}: {}'
+                    .format(batch_start + 1, batch_end, no_of_rows))
+
+                add_summarized_trades(summarized_trades)
+                trades_journal.append(summarized_trades)
+
+            fetched_batches_journal.append([{
+                'first_signature': unique_signatures_list[batch_start],
+                'last_signature': unique_signatures_list[batch_end - 1],
+                'no_of_trades': len(summarized_trades)
+            }])
+
+    if batch_sizer is not None:
+        batch_sizer.save_stats(current_datetime)
+
+    if trade_cache is not None:
+        trade_cache.close()
+
+    dead_signatures_journal.close()
+
+    if no_of_unfetched_signatures:
+        trades_journal.close()
+        fetched_batches_journal.close()
+
+        print('\n{} signatures could not be fetched.'.format(
+            no_of_unfetched_signatures))
+
+        if mode in ['BFS', 'INPUT', 'LOAD_SIGNATURES']:
             print(
-                '\nNo DEX trades data retrieved in this batch of transaction signatures. Use newer transaction signatures instead.'
+                'Run the command below to resume once the API is available again:'
             )
-            continue
+            print('python main.py -r {}\n'.format(current_datetime))
         else:
-            print(
-                'No. of unprocessed DEX Trades queried for this batch of transaction signatures: {}'
-                .format(len(dex_trades_data)))
+            print('Run the program again once the API is available again.\n')
+        sys.exit(1)
 
-        process_dex_trades_data(dex_trades_data)
+    trades_journal.compact(save_records=save_trades)
+    fetched_batches_journal.remove()
+    save_json_file(saved_remaining_mint_addresses_file_path,
+                   mint_address_table.get_values(remaining_mint_addresses))
 
-        save_json_file(saved_trades_file_path, combined_dex_trades_data)
-        save_json_file(saved_remaining_mint_addresses_file_path,
-                       list(remaining_mint_addresses))
 
+def restore_fetched_batches(trades_journal, fetched_batches_journal,
+                            unique_signatures_list):
+    """
+    Reload the signature batches and the DEX trades already fetched by an interrupted run.
 
-def process_dex_trades_data(dex_trades_data):
+    Trades journaled after the last batch confirmed as fetched are dropped, so that a batch is either
+    fully restored or fetched again. Batches are journaled by their first and last signatures, so they
+    are found in the sorted signatures even if dead signatures have been removed since.
 
-    for _, transactions in groupby(
+    :param trades_journal: The journal of the summarized DEX trades.
+    :param fetched_batches_journal: The journal of the fetched signature batches.
+    :param unique_signatures_list: The sorted list of signatures to query.
+
+    :return: A dictionary that maps the start index of each fetched batch to its end index.
+    """
+    fetched_batches = load_journal_records(
+        fetched_batches_journal.journal_file_path)
+    journaled_trades = load_journal_records(trades_journal.journal_file_path)
+
+    fetched_batch_ends = {}
+    no_of_fetched_trades = 0
+
+    for fetched_batch in fetched_batches:
+        if no_of_fetched_trades + fetched_batch['no_of_trades'] > len(
+                journaled_trades):
+            break
+        no_of_fetched_trades += fetched_batch['no_of_trades']
+
+        fetched_batch_start = bisect_left(unique_signatures_list,
+                                          fetched_batch['first_signature'])
+        fetched_batch_end = bisect_right(unique_signatures_list,
+                                         fetched_batch['last_signature'])
+        if fetched_batch_start < fetched_batch_end:
+            fetched_batch_ends[fetched_batch_start] = fetched_batch_end
+
+    fetched_trades = trades_journal.truncate(no_of_fetched_trades)
+    add_summarized_trades(fetched_trades)
+
+    if fetched_batch_ends:
+        print(
+            '\nRestored {} fetched signature batches and {} processed DEX trades from checkpoint.'
+            .format(len(fetched_batch_ends), len(fetched_trades)))
+
+    return fetched_batch_ends
+
+
+def get_or_load_dex_trades_data(unique_signatures):
+    """
+    Fetch the DEX trades data of the signatures, or reload it if a resumed run has already fetched all of it.
+    """
+    if run_manifest['stage'] == 'TRADES':
+        get_dex_trades_data(unique_signatures,
+                            batch_concurrency=batch_concurrency)
+        update_run_stage('GRAPH')
+    else:
+        combined_dex_trades_data.extend(load_trades(saved_trades_file_path))
+        remaining_mint_addresses.update(
+            mint_address_table.get_ids(
+                load_json_file(saved_remaining_mint_addresses_file_path)))
+
+
+def update_run_stage(stage):
+
+    run_manifest['stage'] = stage
+    save_json_file(run_manifest_file_path, run_manifest)
+
+
+def process_dex_trades_data(dex_trades_data, transaction_summaries=None):
+    """
+    Summarize the DEX trades data of each transaction into a single trade, and drop MEV and excluded trades.
+
+    The DEX trades data can be any iterable ordered by transaction signature, such as a stream decoded from
+    a response, in which case only one transaction's trades are held in memory at a time.
+
+    :param dex_trades_data: The DEX trades data ordered by transaction signature and trade index.
+    :param transaction_summaries: A list to collect the (signature, summarized trade, outcome) of every transaction into, including the MEV and excluded ones, if any.
+
+    :return: A tuple of the list of summarized trades and the number of DEX trades rows read.
+    """
+    summarized_trades = []
+    no_of_rows = 0
+
+    for signature, transactions in groupby(
             dex_trades_data, key=lambda x: x['Transaction']['Signature']):
         transactions_list = list(transactions)
+        no_of_rows += len(transactions_list)
 
         first_transaction = transactions_list[0]
         last_transaction = transactions_list[-1]
 
-        first_transaction_trade = first_transaction['Trade']
-        last_transaction_trade = last_transaction['Trade']
-        transaction_block = first_transaction['Block']
+        summarized_trade = {
+            'Block': first_transaction['Block'],
+            'Trade': {
+                'Sell': copy.deepcopy(first_transaction['Trade']['Sell']),
+                'Buy': copy.deepcopy(last_transaction['Trade']['Buy'])
+            },
+            'Signer': copy.deepcopy(first_transaction['Transaction']['Signer'])
+        }
+        outcome = get_summarized_trade_outcome(summarized_trade)
 
-        first_transaction_trade_sell_mint_address = first_transaction_trade[
-            'Sell']['Currency']['MintAddress']
-        last_transaction_trade_buy_mint_address = last_transaction_trade[
-            'Buy']['Currency']['MintAddress']
+        if transaction_summaries is not None:
+            transaction_summaries.append((signature, summarized_trade, outcome))
 
-        # Check if MEV
-        if first_transaction_trade_sell_mint_address == last_transaction_trade_buy_mint_address:
-            continue
+        if outcome == 'TRADE':
+            summarized_trades.append(summarized_trade)
 
-        # Check if addresses are excluded
-        elif (first_transaction_trade_sell_mint_address
-              in EXCLUDED_MINT_ADDRESSES
-              or last_transaction_trade_buy_mint_address
-              in EXCLUDED_MINT_ADDRESSES):
-            continue
+    return summarized_trades, no_of_rows
+
+
+def get_summarized_trade_outcome(summarized_trade):
+    """
+    :return: 'MEV' if the trade sells and buys the same token, 'EXCLUDED' if either token is excluded, or 'TRADE' otherwise.
+    """
+    sell_mint_address = summarized_trade['Trade']['Sell']['Currency'][
+        'MintAddress']
+    buy_mint_address = summarized_trade['Trade']['Buy']['Currency'][
+        'MintAddress']
+
+    # Check if MEV
+    if sell_mint_address == buy_mint_address:
+        return 'MEV'
+
+    # Check if addresses are excluded
+    elif (sell_mint_address in EXCLUDED_MINT_ADDRESSES
+          or buy_mint_address in EXCLUDED_MINT_ADDRESSES):
+        return 'EXCLUDED'
 
+    return 'TRADE'
+
+
+def add_summarized_trades(summarized_trades):
+
+    for summarized_trade in summarized_trades:
+        remaining_mint_addresses.add(
+            mint_address_table.get_id(
+                summarized_trade['Trade']['Sell']['Currency']['MintAddress']))
+        remaining_mint_addresses.add(
+            mint_address_table.get_id(
+                summarized_trade['Trade']['Buy']['Currency']['MintAddress']))
+
+    combined_dex_trades_data.extend(summarized_trades)
+
+
+def get_token_details_dict(mint_addresses,
+                           use_token_details_cache=TOKEN_DETAILS_CACHE):
+    """
+    Get the Dexscreener token details of the mint addresses, querying only the ones missing from the token details cache or stale.
+
+    :param mint_addresses: The mint addresses of the graph nodes.
+    :param use_token_details_cache: Look up and store the token details in the persistent token details cache.
+
+    :return: A dictionary of the token details, keyed by mint address.
+    """
+    if not use_token_details_cache:
+        return dexscreener.get_token_details(mint_addresses)
+
+    token_details_cache = TokenDetailsCache(
+        saved_token_details_cache_file_path)
+    stale_mint_addresses = token_details_cache.get_stale_mint_addresses(
+        mint_addresses)
+
+    print('\n{} out of {} token details found in the token details cache.'.
+          format(len(mint_addresses) - len(stale_mint_addresses),
+                 len(mint_addresses)))
+
+    if stale_mint_addresses:
+        not_found_mint_addresses = []
+        token_details_cache.update(
+            dexscreener.get_token_details(
+                stale_mint_addresses,
+                not_found_mint_addresses=not_found_mint_addresses),
+            not_found_mint_addresses)
+
+    token_details_dict = token_details_cache.get_many(mint_addresses)
+    token_details_cache.save()
+
+    return token_details_dict
+
+
+def get_live_dex_trades_query(mint_addresses,
+                              since_utc_str=None,
+                              page_size=LIVE_BACKFILL_PAGE_SIZE,
+                              offset=0):
+    """
+    Get the GraphQL query of the DEX trades of the mint addresses in LIVE mode.
+
+    :param mint_addresses: The mint addresses to watch.
+    :param since_utc_str: Query a page of the DEX trades since this UTC time once, in block time order, eg. to backfill a gap. Subscribe to the new DEX trades if None.
+    :param page_size: The maximum number of DEX trades rows of the page.
+    :param offset: The number of DEX trades rows to skip before the page.
+
+    :return: The GraphQL query.
+    """
+    mint_addresses_json = json.dumps(mint_addresses)
+
+    if since_utc_str is None:
+        operation = 'subscription'
+        block_filter = ''
+        order_by = ''
+    else:
+        operation = 'query'
+        block_filter = f', Block: {{Time: {{since: "{since_utc_str}"}}}}'
+        order_by = f'orderBy: {{ascending: Block_Time}}\n        limit: {{count: {page_size}, offset: {offset}}}'
+
+    query = f"""
+    {operation} {{
+    Solana {{
+        DEXTrades(
+        where: {{Transaction: {{Result: {{Success: true}}}}{block_filter}, any: [{{Trade: {{Buy: {{Currency: {{MintAddress: {{in: {mint_addresses_json}}}}}}}}}}}, {{Trade: {{Sell: {{Currency: {{MintAddress: {{in: {mint_addresses_json}}}}}}}}}}}]}}
+        {order_by}
+        ) {{
+        Trade {{
+            Buy {{
+            Amount
+            AmountInUSD
+            Currency {{
+                MintAddress
+                Name
+                Symbol
+            }}
+            PriceInUSD
+            }}
+            Dex {{
+                ProgramAddress
+                ProtocolName
+            }}
+            Sell {{
+            Amount
+            AmountInUSD
+            Currency {{
+                MintAddress
+                Name
+                Symbol
+            }}
+            PriceInUSD
+            }}
+            Index
+        }}
+        Transaction {{
+            Signature
+            Signer
+        }}
+        Block {{
+            Time
+        }}
+        }}
+    }}
+    }}
+    """
+
+    return query
+
+
+def add_live_dex_trades(dex_trades_data, sliding_window_graph,
+                        latest_block_time):
+    """
+    Summarize the DEX trades data received in LIVE mode and add the trades to the sliding window graph.
+
+    Transactions already added, eg. by an overlapping backfill, are dropped by their signatures. The same
+    MEV and exclusion rules as in the other modes apply (see `process_dex_trades_data`), and the token
+    details of new tokens are queried before their trades are added.
+
+    :param dex_trades_data: The DEX trades data received.
+    :param sliding_window_graph: The `SlidingWindowGraph` to add the trades to.
+    :param latest_block_time: The latest block time received so far, or None.
+
+    :return: The latest block time received, including this DEX trades data.
+    """
+    new_dex_trades_data = sorted(
+        (dex_trade for dex_trade in dex_trades_data
+         if dex_trade['Transaction']['Signature'] not in seen_signatures),
+        key=lambda x: (x['Transaction']['Signature'], x['Trade'].get(
+            'Index', 0)))
+
+    if not new_dex_trades_data:
+        return latest_block_time
+
+    summarized_trades, no_of_rows = process_dex_trades_data(
+        new_dex_trades_data)
+
+    for dex_trade in new_dex_trades_data:
+        seen_signatures[dex_trade['Transaction']['Signature']] = None
+
+        block_time = dex_trade['Block']['Time']
+        if latest_block_time is None or block_time > latest_block_time:
+            latest_block_time = block_time
+
+    while len(seen_signatures) > LIVE_MAX_SEEN_SIGNATURES:
+        seen_signatures.popitem(last=False)
+
+    new_mint_addresses = []
+    for summarized_trade in summarized_trades:
+        for trade_side in ['Sell', 'Buy']:
+            mint_address = summarized_trade['Trade'][trade_side]['Currency'][
+                'MintAddress']
+
+            if mint_address not in looked_up_mint_addresses:
+                looked_up_mint_addresses.add(mint_address)
+                new_mint_addresses.append(mint_address)
+
+    if new_mint_addresses:
+        sliding_window_graph.add_token_details(
+            get_token_details_dict(new_mint_addresses))
+
+    no_of_added_trades = sliding_window_graph.add_trades(summarized_trades)
+
+    print(
+        'No. of DEX Trades received: {}, transactions summarized: {}, added to the window: {}'
+        .format(no_of_rows, len(summarized_trades), no_of_added_trades))
+
+    return latest_block_time
+
+
+def backfill_live_dex_trades(mint_addresses,
+                             sliding_window_graph,
+                             since_utc_str,
+                             latest_block_time,
+                             page_size=LIVE_BACKFILL_PAGE_SIZE):
+    """
+    Query the DEX trades of the mint addresses since a UTC time page by page, and add them to the sliding window graph.
+
+    The pages are in block time order. A full page may end in the middle of a block time, so its rows of
+    the last block time are only added with the next page, which starts from that block time. If a whole
+    page has one block time, the next page is offset within it. This way, the trades of a transaction are
+    always added together.
+
+    :param mint_addresses: The mint addresses to watch.
+    :param sliding_window_graph: The `SlidingWindowGraph` to add the trades to.
+    :param since_utc_str: The UTC time to backfill from.
+    :param latest_block_time: The latest block time received so far, or None.
+    :param page_size: The maximum number of DEX trades rows per page, below the Bitquery row limit.
+
+    :return: A tuple of the latest block time received, and whether the backfill completed. If a page fails, the trades of the pages before it are kept, and the backfill should be retried from `since_utc_str`.
+    """
+    print('\nBackfilling the DEX trades data since {}...'.format(since_utc_str))
+
+    offset = 0
+    pending_dex_trades_data = []
+
+    while True:
+        payload = {
+            'query':
+            get_live_dex_trades_query(mint_addresses, since_utc_str, page_size,
+                                      offset),
+            'variables':
+            variables
+        }
+        dex_trades_data, failure = bitqueryAPICall(payload, return_status=True)
+
+        if failure is not None:
+            print('Backfill failed. It will be retried.')
+            return latest_block_time, False
+
+        if len(dex_trades_data) < page_size:
+            latest_block_time = add_live_dex_trades(
+                pending_dex_trades_data + dex_trades_data,
+                sliding_window_graph, latest_block_time)
+            return latest_block_time, True
+
+        pending_dex_trades_data.extend(dex_trades_data)
+        last_block_time = dex_trades_data[-1]['Block']['Time']
+
+        if last_block_time > since_utc_str:
+            latest_block_time = add_live_dex_trades(
+                [
+                    dex_trade for dex_trade in pending_dex_trades_data
+                    if dex_trade['Block']['Time'] < last_block_time
+                ], sliding_window_graph, latest_block_time)
+            pending_dex_trades_data = []
+            since_utc_str = last_block_time
+            offset = 0
         else:
-            summarized_trade = {
-                'Block': transaction_block,
-                'Trade': {
-                    'Sell': copy.deepcopy(first_transaction_trade['Sell']),
-                    'Buy': copy.deepcopy(last_transaction_trade['Buy'])
-                },
-                'Signer':
-                copy.deepcopy(first_transaction['Transaction']['Signer'])
-            }
+            offset += page_size
 
-            combined_dex_trades_data.append(summarized_trade)
-            remaining_mint_addresses.add(
-                first_transaction_trade_sell_mint_address)
-            remaining_mint_addresses.add(
-                last_transaction_trade_buy_mint_address)
+
+def save_live_graph_data(sliding_window_graph):
+    """
+    Save a snapshot of the graph data of the sliding window and the total USD volume traded by each signer in it.
+    """
+    saved_graph_data_file_path = f"{saved_data_folder_file_path}/graph_data_{current_datetime}.json"
+    saved_signer_total_trade_amount_data_file_path = f"{saved_data_folder_file_path}/signer_total_trade_amount_data_{current_datetime}.json"
+
+    save_json_file(saved_graph_data_file_path,
+                   get_saved_graph_data(sliding_window_graph.get_graph_data()))
+    save_json_file(
+        saved_signer_total_trade_amount_data_file_path,
+        sliding_window_graph.get_signer_total_trade_amount_in_usd_dict())
+
+
+def watch_live_dex_trades(mint_addresses, sliding_window_graph,
+                          since_utc_str):
+    """
+    Subscribe to the DEX trades of the mint addresses and add them to the sliding window graph until Ctrl-C, or until the subscription stops.
+
+    The trades already in the window are backfilled once the subscription is open, so that no trade is
+    missed in between. After a reconnection, or after messages were dropped from the full buffer, the
+    trades since the latest block time received are backfilled again. The start of a gap is kept until its
+    backfill completes, and a failed backfill is retried every `RETRY_AFTER` seconds, so a gap is never
+    lost to the trades streamed in the meantime. A snapshot of the graph data is saved every
+    `LIVE_SNAPSHOT_SECONDS`.
+
+    :param mint_addresses: The mint addresses to watch.
+    :param sliding_window_graph: The `SlidingWindowGraph` to add the trades to.
+    :param since_utc_str: The UTC time of the start of the window.
+    """
+    subscription = BitquerySubscription(
+        url, headers, get_live_dex_trades_query(mint_addresses), variables)
+    subscription.start()
+
+    latest_block_time = None
+    backfill_since_utc_str = since_utc_str
+    last_backfill_time = None
+    last_snapshot_time = time.time()
+
+    print('\nWatching the DEX trades. Press Ctrl-C to stop.')
+
+    try:
+        while True:
+            if backfill_since_utc_str is not None and (
+                    last_backfill_time is None
+                    or time.time() - last_backfill_time >= RETRY_AFTER):
+                last_backfill_time = time.time()
+                latest_block_time, is_completed = backfill_live_dex_trades(
+                    mint_addresses, sliding_window_graph,
+                    backfill_since_utc_str, latest_block_time)
+
+                if is_completed:
+                    backfill_since_utc_str = None
+
+            event = subscription.get_event(timeout=1)
+            is_gap = False
+
+            if event is not None:
+                event_type, dex_trades_data = event
+
+                if event_type == 'STOPPED':
+                    break
+                elif event_type == 'RECONNECTED':
+                    is_gap = True
+                else:
+                    latest_block_time = add_live_dex_trades(
+                        dex_trades_data, sliding_window_graph,
+                        latest_block_time)
+
+            if subscription.pop_is_data_dropped():
+                print(
+                    'The subscription buffer is full and DEX trades data was dropped.'
+                )
+                is_gap = True
+
+            # A gap starts at the latest block time received, unless an earlier gap is still pending
+            if is_gap and backfill_since_utc_str is None:
+                backfill_since_utc_str = latest_block_time or since_utc_str
+                last_backfill_time = None
+
+            if time.time() - last_snapshot_time >= LIVE_SNAPSHOT_SECONDS:
+                save_live_graph_data(sliding_window_graph)
+                last_snapshot_time = time.time()
+
+    except KeyboardInterrupt:
+        print('\nStopping the subscription...')
+
+    finally:
+        subscription.stop()
+
+    save_live_graph_data(sliding_window_graph)
+
+
+def save_graph_data(graph_data, graph_state):
+    """
+    Save the graph data, its graph state and the total USD volume traded by each signer.
+    """
+    saved_graph_data_file_path = f"{saved_data_folder_file_path}/graph_data_{current_datetime}.json"
+    saved_graph_state_file_path = f"{saved_data_folder_file_path}/graph_state_{current_datetime}.json"
+    saved_signer_total_trade_amount_data_file_path = f"{saved_data_folder_file_path}/signer_total_trade_amount_data_{current_datetime}.json"
+
+    save_json_file(saved_graph_data_file_path,
+                   get_saved_graph_data(graph_data))
+    save_json_file(saved_graph_state_file_path,
+                   get_saved_graph_state(graph_state))
+    save_json_file(
+        saved_signer_total_trade_amount_data_file_path,
+        get_saved_signer_total_trade_amount_in_usd_dict(
+            graph_state['signer_total_trade_amount_in_usd']))
+
+
+def load_graph_data(graph_data_file_path):
+    """
+    Load and validate saved graph data.
+
+    :return: The graph data keyed by interned IDs.
+    """
+    graph_data = load_json_file(graph_data_file_path)
+
+    if not isinstance(graph_data, dict):
+        print("\nThe graph data is in the wrong format.\n")
+        sys.exit(1)
+
+    if 'nodes' not in graph_data or 'edges' not in graph_data:
+        print("\nThe graph data is missing nodes or edges.\n")
+        sys.exit(1)
+
+    return get_interned_graph_data(graph_data)
+
+
+def load_graph_state(graph_state_file_path):
+    """
+    Load and validate a saved graph state.
+
+    :return: The graph state keyed by interned IDs.
+    """
+    graph_state = load_json_file(graph_state_file_path)
+
+    if not isinstance(graph_state, dict) or any(
+            key not in graph_state for key in [
+                'signatures', 'earliest_block_time', 'latest_block_time',
+                'edge_signers', 'signer_total_trade_amount_in_usd'
+            ]):
+        print("\nThe graph state is in the wrong format.\n")
+        sys.exit(1)
+
+    return get_interned_graph_state(graph_state)
 
 
 ## Main Program ##
@@ -397,14 +1421,18 @@ if __name__ == "__main__":
         "BFS: use Breadth First Search to traverse and query the tree of the provided mint address up to the specified depth and retrieve transaction signatures and DEX trades data, \
         INPUT: provide a list of mint addresses to query and retrieve transaction signatures and DEX trades data, \
         LOAD_SIGNATURES: load the transaction signatures from a saved JSON file and retrieve DEX trades data, \
-        LOAD_TRADES: skip the query process and load the DEX trades data from a saved JSON file, and \
+        LOAD_TRADES: skip the query process and load the DEX trades data from a saved JSON or .npz trade store file, \
+        UPDATE: load a saved graph data and its graph state, query the new DEX trades data of its tokens since its latest trade, and fold them into the graph data, \
+        LIVE: subscribe to the DEX trades data of the provided mint address or list of mint addresses and keep the graph data of a sliding time window up to date until stopped with Ctrl-C, and \
         PLOT: skip the query process and load the graph data from a saved JSON file."
     )
     parser.add_argument(
         '-a',
         '--address',
         type=str,
-        help="The first mint address to query. REQURED for BFS mode.")
+        help=
+        "The first mint address to query. REQURED for BFS mode. In LIVE mode, the mint address to watch instead of a list of mint addresses."
+    )
     parser.add_argument(
         '-d',
         '--depth',
@@ -418,7 +1446,7 @@ if __name__ == "__main__":
         '--file',
         type=str,
         help=
-        "The file to load the JSON that contains the list of mint addresses, the list of unique signatures, or the DEX trades data. REQURED for INPUT, LOAD_SIGNATURES, LOAD_TRADES, PLOT mode."
+        "The file to load the JSON that contains the list of mint addresses, the list of unique signatures, the DEX trades data, or the graph data. REQURED for INPUT, LOAD_SIGNATURES, LOAD_TRADES, UPDATE, PLOT mode. In LIVE mode, the list of mint addresses to watch."
     )
     parser.add_argument(
         '-af',
@@ -427,6 +1455,13 @@ if __name__ == "__main__":
         help=
         "The file to load the JSON that contains the list of remaining mint addresses. REQURED for LOAD_TRADES mode."
     )
+    parser.add_argument(
+        '-gsf',
+        '--graph_state_file',
+        type=str,
+        help=
+        "The file to load the JSON that contains the graph state saved with the graph data, ie. the signers of each edge, the signer totals and the signatures already in the graph data. REQURED for UPDATE mode."
+    )
     parser.add_argument(
         '-s',
         '--since_days',
@@ -459,6 +1494,84 @@ if __name__ == "__main__":
         help=
         "Filter token symbol and its related token symbol to be displayed for graph plot. Use comma separator. Use EITHER plot_filter_names or plot_filter_symbols but not both. Eg. 'WIF,NUB'."
     )
+    parser.add_argument(
+        '-c',
+        '--concurrency',
+        type=int,
+        default=BFS_CONCURRENCY,
+        help=
+        "The number of mint addresses of the same depth to query in parallel in BFS mode. Default is {}, which keeps the sequential crawl."
+        .format(BFS_CONCURRENCY))
+    parser.add_argument(
+        '-bc',
+        '--batch_concurrency',
+        type=int,
+        default=SIGNATURE_BATCH_CONCURRENCY,
+        help=
+        "The number of transaction signature batches to query in parallel while the completed batches are processed. Default is {}."
+        .format(SIGNATURE_BATCH_CONCURRENCY))
+    parser.add_argument(
+        '-r',
+        '--resume',
+        type=str,
+        default='',
+        help=
+        "The run ID of an interrupted BFS, INPUT or LOAD_SIGNATURES run to resume, eg. '20240624_225313'. The run ID is printed when the run starts and is the datetime suffix of its saved files. The mode, address, depth, file and since_days of the original run are reused."
+    )
+    parser.add_argument(
+        '-ge',
+        '--graph_engine',
+        type=str,
+        default=GRAPH_ENGINE,
+        help=
+        "PYTHON: aggregate the DEX trades data into the graph data one trade at a time, or PANDAS: aggregate it column-wise with pandas and NumPy, which is much faster on large runs and produces the same graph data. Default is {}."
+        .format(GRAPH_ENGINE))
+    parser.add_argument(
+        '-wh',
+        '--window_hours',
+        type=float,
+        default=SLIDING_WINDOW_HOURS,
+        help=
+        "The length in hours of the sliding time window of the graph data in LIVE mode. Default is {}."
+        .format(SLIDING_WINDOW_HOURS))
+    parser.add_argument(
+        '-np',
+        '--no_plot',
+        action='store_true',
+        help=
+        "Save the graph data without plotting it, eg. for unattended runs of the scheduler."
+    )
+    parser.add_argument(
+        '-k',
+        '--top_k',
+        type=int,
+        default=PLOT_TOP_K_EDGES_PER_NODE,
+        help=
+        "Only plot the top K edges by net volume of each token. Default is {}, ie. every edge."
+        .format(PLOT_TOP_K_EDGES_PER_NODE))
+    parser.add_argument(
+        '-eb',
+        '--edge_budget',
+        type=int,
+        default=PLOT_EDGE_BUDGET,
+        help=
+        "The maximum number of edges to plot. The net volume threshold that meets it is picked automatically. Default is {}, ie. no maximum."
+        .format(PLOT_EDGE_BUDGET))
+    parser.add_argument(
+        '-cl',
+        '--collapse_leaves',
+        action='store_true',
+        help=
+        "Collapse the tokens with a single edge that are dropped by top_k or edge_budget into an aggregate 'other' node per token they traded with."
+    )
+    parser.add_argument(
+        '-l',
+        '--layout',
+        type=str,
+        default=GRAPH_LAYOUT,
+        help=
+        "FORCE: place the tokens with a force-directed layout that starts from the positions of the previous plots, or SPIRAL: on a spiral. Default is {}."
+        .format(GRAPH_LAYOUT))
     args = parser.parse_args()
 
     mode = str(args.mode).upper()
@@ -466,17 +1579,72 @@ if __name__ == "__main__":
     max_node_depth = args.depth
     file_path = args.file
     addresses_file_path = args.addresses_file
+    graph_state_file_path = args.graph_state_file
+    window_hours = args.window_hours
+    no_plot = args.no_plot
+    top_k = args.top_k
+    edge_budget = args.edge_budget
+    is_collapsing_leaves = args.collapse_leaves
+    layout = str(args.layout).upper()
     since_days = args.since_days
     volume_threshold = args.volume
     plot_filter_names = args.plot_filter_names
     plot_filter_symbols = args.plot_filter_symbols
+    concurrency = args.concurrency
+    batch_concurrency = max(args.batch_concurrency, 1)
+    resume_run_id = args.resume
+    graph_engine = str(args.graph_engine).upper()
+    trade_store_format = TRADE_STORE_FORMAT
 
-    if mode not in ['BFS', 'INPUT', 'LOAD_SIGNATURES', 'LOAD_TRADES', 'PLOT']:
+    saved_data_folder_file_path = './saved_data'
+    if not os.path.exists(saved_data_folder_file_path):
+        os.makedirs(saved_data_folder_file_path)
+
+    if resume_run_id:
+        run_manifest_file_path = f"{saved_data_folder_file_path}/run_{resume_run_id}.json"
+
+        if not os.path.exists(run_manifest_file_path):
+            print("\nNo saved run found for the run ID {}.\n".format(
+                resume_run_id))
+            sys.exit(1)
+
+        run_manifest = load_json_file(run_manifest_file_path)
+
+        if run_manifest['stage'] == 'DONE':
+            print(
+                "\nRun {} has already completed. Use PLOT mode with its graph data instead.\n"
+                .format(resume_run_id))
+            sys.exit(1)
+
+        mode = run_manifest['mode']
+        mint_address = run_manifest['address']
+        max_node_depth = run_manifest['depth']
+        file_path = run_manifest['file']
+        since_days = run_manifest['since_days']
+        # Runs saved before the trade store format was recorded used JSON
+        trade_store_format = run_manifest.get('trade_store_format', 'JSON')
+
+    if mode not in [
+            'BFS', 'INPUT', 'LOAD_SIGNATURES', 'LOAD_TRADES', 'UPDATE', 'LIVE',
+            'PLOT'
+    ]:
         print(
-            "\nMode {} is not supported. Supported modes are BFS, INPUT, LOAD_SIGNATURES, LOAD_TRADES, and PLOT.\n"
+            "\nMode {} is not supported. Supported modes are BFS, INPUT, LOAD_SIGNATURES, LOAD_TRADES, UPDATE, LIVE, and PLOT.\n"
             .format(mode))
         sys.exit(1)
 
+    if graph_engine not in ['PYTHON', 'PANDAS']:
+        print(
+            "\nGraph engine {} is not supported. Supported graph engines are PYTHON and PANDAS.\n"
+            .format(graph_engine))
+        sys.exit(1)
+
+    if layout not in ['FORCE', 'SPIRAL']:
+        print(
+            "\nGraph layout {} is not supported. Supported graph layouts are FORCE and SPIRAL.\n"
+            .format(layout))
+        sys.exit(1)
+
     if plot_filter_names and plot_filter_symbols:
         print(
             "\nUse EITHER plot_filter_names or plot_filter_symbols but not both.\n"
@@ -492,8 +1660,11 @@ if __name__ == "__main__":
     # Start time for the script
     start_time = time.time()
 
-    # Get current datetime
-    current_datetime = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Get current datetime, which is also the run ID
+    if resume_run_id:
+        current_datetime = resume_run_id
+    else:
+        current_datetime = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Get datetime two days before the current local time
     local_timezone = get_localzone()
@@ -502,16 +1673,35 @@ if __name__ == "__main__":
     n_days_before_utc = n_days_before.astimezone(pytz.utc)
     n_days_before_utc_str = n_days_before_utc.strftime('%Y-%m-%dT%H:%M:%SZ')
 
+    if resume_run_id:
+        n_days_before_utc_str = run_manifest['since_utc']
+    elif mode in ['BFS', 'INPUT', 'LOAD_SIGNATURES']:
+        run_manifest_file_path = f"{saved_data_folder_file_path}/run_{current_datetime}.json"
+        run_manifest = {
+            'mode': mode,
+            'address': mint_address,
+            'depth': max_node_depth,
+            'file': file_path,
+            'since_days': since_days,
+            'since_utc': n_days_before_utc_str,
+            'trade_store_format': trade_store_format,
+            'stage': 'TRADES' if mode == 'LOAD_SIGNATURES' else 'SIGNATURES'
+        }
+
+    trades_file_extension = 'npz' if trade_store_format == 'NPZ' else 'json'
+
     unique_signatures = set()
     combined_dex_trades_data = []
     remaining_mint_addresses = set()
     graph_data = {'nodes': {}, 'edges': {}}
-    earliest_local_block_time = datetime.max.replace(tzinfo=local_timezone)
-    latest_local_block_time = datetime.min.replace(tzinfo=local_timezone)
-
-    saved_data_folder_file_path = './saved_data'
-    if not os.path.exists(saved_data_folder_file_path):
-        os.makedirs(saved_data_folder_file_path)
+    completed_expansions = {}
+    seen_signatures = OrderedDict()
+    looked_up_mint_addresses = set()
+    saved_batch_size_stats_file_path = f"{saved_data_folder_file_path}/signature_batch_size_stats.json"
+    saved_dead_signatures_file_path = f"{saved_data_folder_file_path}/dead_signatures.json"
+    saved_trade_cache_file_path = f"{saved_data_folder_file_path}/trade_cache.sqlite3"
+    saved_token_details_cache_file_path = f"{saved_data_folder_file_path}/token_details_cache.json"
+    saved_layout_cache_file_path = f"{saved_data_folder_file_path}/layout_positions.json"
 
     print('\n')
 
@@ -529,6 +1719,7 @@ if __name__ == "__main__":
             print("\nMode: {}".format(mode))
             print("First Mint Address: {}".format(mint_address))
             print("Max Node Depth: {}".format(max_node_depth))
+            print("Concurrency: {}".format(concurrency))
             print("No. of days ago to query the data from: {}".format(
                 since_days))
             print(
@@ -542,11 +1733,35 @@ if __name__ == "__main__":
 
             saved_unique_mint_addresses_file_path = f"{saved_data_folder_file_path}/unique_mint_addresses_BFS_{mint_address}_{current_datetime}.json"
             saved_unique_signatures_file_path = f"{saved_data_folder_file_path}/unique_signatures_BFS_{mint_address}_{current_datetime}.json"
-            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_BFS_{mint_address}_{current_datetime}.json"
+            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_BFS_{mint_address}_{current_datetime}.{trades_file_extension}"
             saved_remaining_mint_addresses_file_path = f"{saved_data_folder_file_path}/remaining_mint_addresses_BFS_{mint_address}_{current_datetime}.json"
+            saved_expanded_mint_addresses_file_path = f"{saved_data_folder_file_path}/expanded_mint_addresses_BFS_{mint_address}_{current_datetime}.json"
+            saved_fetched_batches_file_path = f"{saved_data_folder_file_path}/fetched_signature_batches_BFS_{mint_address}_{current_datetime}.json"
+
+            print("\nRun ID: {}".format(current_datetime))
+            save_json_file(run_manifest_file_path, run_manifest)
+
+            if run_manifest['stage'] == 'SIGNATURES':
+                mint_addresses_journal = Journal(
+                    saved_unique_mint_addresses_file_path)
+                signatures_journal = Journal(saved_unique_signatures_file_path)
+                expansions_journal = Journal(
+                    saved_expanded_mint_addresses_file_path)
+                restore_harvested_signatures()
+
+                unique_mint_addresses = bfs_accumulate_unique_signatures(
+                    mint_address, max_node_depth, concurrency)
+
+                mint_addresses_journal.compact(unique=True)
+                signatures_journal.compact(unique=True)
+                expansions_journal.remove()
+                update_run_stage('TRADES')
+            else:
+                unique_mint_addresses = load_json_file(
+                    saved_unique_mint_addresses_file_path)
+                unique_signatures = set(
+                    load_json_file(saved_unique_signatures_file_path))
 
-            unique_mint_addresses = bfs_accumulate_unique_signatures(
-                mint_address, max_node_depth)
             total_no_of_unique_mint_addresses = len(unique_mint_addresses)
 
             print('\nNo. of unprocessed unique mint addresses retrieved: {}'.
@@ -555,7 +1770,7 @@ if __name__ == "__main__":
             print('\nNo. of unique signatures retrieved: {}'.format(
                 len(unique_signatures)))
 
-            get_dex_trades_data(unique_signatures)
+            get_or_load_dex_trades_data(unique_signatures)
 
         elif mode == 'INPUT':
 
@@ -587,27 +1802,41 @@ if __name__ == "__main__":
                   format(total_no_of_unique_mint_addresses))
 
             saved_unique_signatures_file_path = f"{saved_data_folder_file_path}/unique_signatures_INPUT_{current_datetime}.json"
-            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_INPUT_{current_datetime}.json"
+            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_INPUT_{current_datetime}.{trades_file_extension}"
             saved_remaining_mint_addresses_file_path = f"{saved_data_folder_file_path}/remaining_mint_addresses_INPUT_{current_datetime}.json"
+            saved_expanded_mint_addresses_file_path = f"{saved_data_folder_file_path}/expanded_mint_addresses_INPUT_{current_datetime}.json"
+            saved_fetched_batches_file_path = f"{saved_data_folder_file_path}/fetched_signature_batches_INPUT_{current_datetime}.json"
 
-            mint_address_count = 1
+            print("\nRun ID: {}".format(current_datetime))
+            save_json_file(run_manifest_file_path, run_manifest)
 
-            for mint_address in unique_mint_addresses:
-                print('\nQuerying mint address {} ({} / {})'.format(
-                    mint_address, mint_address_count,
-                    total_no_of_unique_mint_addresses))
+            if run_manifest['stage'] == 'SIGNATURES':
+                signatures_journal = Journal(saved_unique_signatures_file_path)
+                expansions_journal = Journal(
+                    saved_expanded_mint_addresses_file_path)
+                restore_harvested_signatures()
+                mint_address_count = 1
 
-                accumulate_txn_signatures(mint_address)
+                for mint_address in unique_mint_addresses:
+                    print('\nQuerying mint address {} ({} / {})'.format(
+                        mint_address, mint_address_count,
+                        total_no_of_unique_mint_addresses))
 
-                save_json_file(saved_unique_signatures_file_path,
-                               list(unique_signatures))
+                    expand_mint_address(mint_address)
 
-                mint_address_count += 1
+                    mint_address_count += 1
+
+                signatures_journal.compact(unique=True)
+                expansions_journal.remove()
+                update_run_stage('TRADES')
+            else:
+                unique_signatures = set(
+                    load_json_file(saved_unique_signatures_file_path))
 
             print('\nNo. of unique signatures retrieved: {}'.format(
                 len(unique_signatures)))
 
-            get_dex_trades_data(unique_signatures)
+            get_or_load_dex_trades_data(unique_signatures)
 
         elif mode == 'LOAD_SIGNATURES':
 
@@ -634,10 +1863,14 @@ if __name__ == "__main__":
             print('\nNo. of unique signatures retrieved: {}'.format(
                 len(unique_signatures)))
 
-            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_LOAD_{current_datetime}.json"
+            saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_LOAD_{current_datetime}.{trades_file_extension}"
             saved_remaining_mint_addresses_file_path = f"{saved_data_folder_file_path}/remaining_mint_addresses_LOAD_{current_datetime}.json"
+            saved_fetched_batches_file_path = f"{saved_data_folder_file_path}/fetched_signature_batches_LOAD_{current_datetime}.json"
+
+            print("\nRun ID: {}".format(current_datetime))
+            save_json_file(run_manifest_file_path, run_manifest)
 
-            get_dex_trades_data(unique_signatures)
+            get_or_load_dex_trades_data(unique_signatures)
 
         else:
 
@@ -663,12 +1896,21 @@ if __name__ == "__main__":
                 )
                 sys.exit(1)
 
-            combined_dex_trades_data = load_json_file(file_path)
+            if not is_trade_store_file(file_path):
+                combined_dex_trades_data = load_json_file(file_path)
 
-            if not is_list_of_dicts(combined_dex_trades_data):
-                print(
-                    "\nThe list of DEX trades data is in the wrong format.\n")
-                sys.exit(1)
+                if not is_list_of_dicts(combined_dex_trades_data):
+                    print(
+                        "\nThe list of DEX trades data is in the wrong format.\n"
+                    )
+                    sys.exit(1)
+
+            elif graph_engine == 'PANDAS':
+                # Only the columns used by the graph build are read from the trade store
+                combined_dex_trades_data = load_trades_frame(
+                    file_path, GRAPH_TRADE_COLUMNS)
+            else:
+                combined_dex_trades_data = load_trades(file_path)
 
             remaining_mint_addresses = load_json_file(addresses_file_path)
 
@@ -676,213 +1918,189 @@ if __name__ == "__main__":
                 print("\nThe list of mint addresses is in the wrong format.\n")
                 sys.exit(1)
 
+            remaining_mint_addresses = set(
+                mint_address_table.get_ids(remaining_mint_addresses))
+
         print('\nNo. of processed DEX Trades data retrieved: {}'.format(
             len(combined_dex_trades_data)))
 
         print('\nNo. of processed unique mint addresses retrieved: {}'.format(
             len(remaining_mint_addresses)))
 
-        if combined_dex_trades_data:
+        if len(combined_dex_trades_data):
 
-            token_details_dict = dexscreener.get_token_details(
-                list(remaining_mint_addresses))
-            edge_key_signer_dict = {}
-            signer_total_trade_amount_in_usd_dict = {}
+            token_details_dict = get_token_details_dict(
+                mint_address_table.get_values(remaining_mint_addresses))
+            graph_state = get_new_graph_state()
+            # The DEX trades data loaded in LOAD_TRADES mode does not record its signatures, so its graph state cannot be updated
+            graph_state['signatures'].update(unique_signatures)
 
-            for dex_trade in combined_dex_trades_data:
+            if mode == 'LOAD_TRADES':
+                print(
+                    '\nThe loaded DEX trades data does not record its transaction signatures, so the saved graph state cannot be used in UPDATE mode.'
+                )
 
-                block_time = dex_trade['Block']['Time']
-                local_block_time = convert_utc_to_user_timezone(block_time)
+            if graph_engine == 'PANDAS':
+                graph_data, signer_total_trade_amount_in_usd_dict = build_graph_data_vectorized(
+                    combined_dex_trades_data, token_details_dict, graph_state)
+            else:
+                graph_data, signer_total_trade_amount_in_usd_dict = build_graph_data(
+                    combined_dex_trades_data, token_details_dict, graph_state)
 
-                if local_block_time < earliest_local_block_time:
-                    earliest_local_block_time = local_block_time
-                if local_block_time > latest_local_block_time:
-                    latest_local_block_time = local_block_time
+            save_graph_data(graph_data, graph_state)
 
-                trade_sell = dex_trade['Trade']['Sell']
-                trade_buy = dex_trade['Trade']['Buy']
+            if mode != 'LOAD_TRADES':
+                update_run_stage('DONE')
 
-                trade_sell_mint_address = trade_sell['Currency']['MintAddress']
-                trade_buy_mint_address = trade_buy['Currency']['MintAddress']
+        else:
+            print('\nNo DEX Trades data retrieved.')
 
-                signer = dex_trade['Signer']
+    elif mode == 'LIVE':
 
-                for mint_address in [
-                        trade_sell_mint_address, trade_buy_mint_address
-                ]:
-                    if mint_address not in graph_data['nodes']:
-                        token_details = token_details_dict.get(
-                            mint_address, {})
+        print("\nMode: {}".format(mode))
+        print("Mint Address to Watch: {}".format(mint_address))
+        print("File Path to the List of Mint Addresses to Watch: {}".format(
+            file_path))
+        print("Window Hours: {}".format(window_hours))
+        print("Minimum Volume Threshold in USD: {}".format(volume_threshold))
 
-                        if not token_details:
-                            continue
+        if BITQUERY_API_VERSION == 'v1':
+            print(
+                "\nLIVE mode needs the v2 or EAP streaming endpoint of Bitquery.\n"
+            )
+            sys.exit(1)
 
-                        token_website_detail = token_details.get(
-                            'info', {}).get('websites', [])
-                        if token_website_detail:
-                            token_website = token_website_detail[0].get(
-                                'url', '')
-                        else:
-                            token_website = ''
-
-                        token_telegram = ''
-                        token_twitter = ''
-                        token_socials_detail = token_details.get(
-                            'info', {}).get('socials', [])
-                        for token_social in token_socials_detail:
-                            if token_social['type'] == 'telegram':
-                                token_telegram = token_social.get('url', '')
-                            elif token_social['type'] == 'twitter':
-                                token_twitter = token_social.get('url', '')
-
-                        graph_data['nodes'][mint_address] = {
-                            'mint_address': mint_address,
-                            'name': token_details.get('name', ''),
-                            'symbol': token_details.get('symbol', ''),
-                            'volume': token_details.get('volume', {}),
-                            'price_change':
-                            token_details.get('priceChange', {}),
-                            'liquidity': token_details.get('liquidity', {}),
-                            'fdv': token_details.get('fdv', 0),
-                            'website': token_website,
-                            'telegram': token_telegram,
-                            'twitter': token_twitter
-                        }
-
-                if trade_sell_mint_address not in graph_data[
-                        'nodes'] or trade_buy_mint_address not in graph_data[
-                            'nodes']:
-                    continue
-
-                trade_sell_amount_in_usd = trade_sell['AmountInUSD']
-                if trade_sell_amount_in_usd == '0' or not can_be_float(
-                        trade_sell_amount_in_usd):
-                    trade_buy_amount_in_usd = trade_buy['AmountInUSD']
-                    if trade_buy_amount_in_usd == '0' or not can_be_float(
-                            trade_buy_amount_in_usd):
-                        trade_sell_amount = trade_sell['Amount']
-                        trade_sell_price_in_usd = trade_sell['PriceInUSD']
-                        if trade_sell_amount == '0' or not can_be_float(
-                                trade_sell_amount
-                        ) or trade_sell_price_in_usd == 0:
-                            trade_buy_amount = trade_buy['Amount']
-                            trade_buy_price_in_usd = trade_buy['PriceInUSD']
-                            if trade_buy_amount == '0' or not can_be_float(
-                                    trade_buy_amount
-                            ) or trade_buy_price_in_usd == 0:
-                                trade_amount_in_usd = 0
-                            else:
-                                trade_amount_in_usd = float(
-                                    trade_buy_amount) * trade_buy_price_in_usd
-                        else:
-                            trade_amount_in_usd = float(
-                                trade_sell_amount) * trade_sell_price_in_usd
-                    else:
-                        trade_amount_in_usd = float(trade_buy_amount_in_usd)
-                else:
-                    trade_amount_in_usd = float(trade_sell_amount_in_usd)
-
-                edge_key_main = trade_sell_mint_address + '-' + trade_buy_mint_address
-                edge_key_reverse = trade_buy_mint_address + '-' + trade_sell_mint_address
-
-                if edge_key_main not in graph_data[
-                        'edges'] and edge_key_reverse not in graph_data[
-                            'edges']:
-                    graph_data['edges'][edge_key_main] = {
-                        'trade_amount_in_usd_forward': trade_amount_in_usd,
-                        'trade_amount_in_usd_reverse': 0,
-                        'trade_amount_in_usd_net': trade_amount_in_usd,
-                        'no_of_signers_forward': 1,
-                        'no_of_signers_reverse': 0,
-                        'no_of_signers_combined': 1
-                    }
-                    edge_key_signer_dict[edge_key_main] = {
-                        'forward': [signer],
-                        'reverse': [],
-                        'combined': [signer]
-                    }
-                else:
-                    if edge_key_main in graph_data['edges']:
-                        graph_data['edges'][edge_key_main][
-                            'trade_amount_in_usd_forward'] += trade_amount_in_usd
-                        graph_data['edges'][edge_key_main][
-                            'trade_amount_in_usd_net'] += trade_amount_in_usd
-                        if signer not in edge_key_signer_dict[edge_key_main][
-                                'combined']:
-                            graph_data['edges'][edge_key_main][
-                                'no_of_signers_combined'] += 1
-                            edge_key_signer_dict[edge_key_main][
-                                'combined'].append(signer)
-                        if signer not in edge_key_signer_dict[edge_key_main][
-                                'forward']:
-                            graph_data['edges'][edge_key_main][
-                                'no_of_signers_forward'] += 1
-                            edge_key_signer_dict[edge_key_main][
-                                'forward'].append(signer)
-                    else:
-                        graph_data['edges'][edge_key_reverse][
-                            'trade_amount_in_usd_reverse'] += trade_amount_in_usd
-                        graph_data['edges'][edge_key_reverse][
-                            'trade_amount_in_usd_net'] -= trade_amount_in_usd
-                        if signer not in edge_key_signer_dict[
-                                edge_key_reverse]['combined']:
-                            graph_data['edges'][edge_key_reverse][
-                                'no_of_signers_combined'] += 1
-                            edge_key_signer_dict[edge_key_reverse][
-                                'combined'].append(signer)
-                        if signer not in edge_key_signer_dict[
-                                edge_key_reverse]['reverse']:
-                            graph_data['edges'][edge_key_reverse][
-                                'no_of_signers_reverse'] += 1
-                            edge_key_signer_dict[edge_key_reverse][
-                                'reverse'].append(signer)
-
-                if signer not in signer_total_trade_amount_in_usd_dict:
-                    signer_total_trade_amount_in_usd_dict[
-                        signer] = trade_amount_in_usd
-                else:
-                    signer_total_trade_amount_in_usd_dict[
-                        signer] += trade_amount_in_usd
-
-            graph_data['transaction_window'] = {
-                'earliest_local_block_time':
-                earliest_local_block_time.strftime('%Y-%m-%d %H:%M:%S %Z'),
-                'latest_local_block_time':
-                latest_local_block_time.strftime('%Y-%m-%d %H:%M:%S %Z')
-            }
+        if mint_address not in ['', None]:
+            live_mint_addresses = [mint_address]
+        elif file_path not in ['', None]:
+            live_mint_addresses = load_json_file(file_path)
 
-            saved_graph_data_file_path = f"{saved_data_folder_file_path}/graph_data_{current_datetime}.json"
-            saved_signer_total_trade_amount_data_file_path = f"{saved_data_folder_file_path}/signer_total_trade_amount_data_{current_datetime}.json"
+            if not is_list_of_strings(live_mint_addresses):
+                print("\nThe list of mint addresses is in the wrong format.\n")
+                sys.exit(1)
+        else:
+            print(
+                "\nPlease provide the mint address or the file path to load the list of mint addresses to watch in LIVE mode.\n"
+            )
+            sys.exit(1)
 
-            save_json_file(saved_graph_data_file_path, graph_data)
-            save_json_file(saved_signer_total_trade_amount_data_file_path,
-                           signer_total_trade_amount_in_usd_dict)
+        live_mint_addresses = [
+            live_mint_address for live_mint_address in live_mint_addresses
+            if live_mint_address not in EXCLUDED_MINT_ADDRESSES
+        ]
+        window_start_utc_str = (
+            current_time - timedelta(hours=window_hours)).astimezone(
+                pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
-        else:
-            print('\nNo DEX Trades data retrieved.')
+        print("\nRun ID: {}".format(current_datetime))
+
+        sliding_window_graph = SlidingWindowGraph(
+            get_token_details_dict(live_mint_addresses), window_hours)
+        looked_up_mint_addresses.update(live_mint_addresses)
+
+        watch_live_dex_trades(live_mint_addresses, sliding_window_graph,
+                              window_start_utc_str)
+
+        graph_data = sliding_window_graph.get_graph_data()
+
+    elif mode == 'UPDATE':
 
-    else:
         print("\nMode: {}".format(mode))
         print("File Path to the Saved Graph Data: {}".format(file_path))
-        print("No. of days ago to query the data from: {}".format(since_days))
+        print("File Path to the Saved Graph State: {}".format(
+            graph_state_file_path))
         print("Minimum Volume Threshold in USD: {}".format(volume_threshold))
 
         if file_path in ['', None]:
             print(
-                "\nPlease provide the file path to load the graph data data in PLOT mode.\n"
+                "\nPlease provide the file path to load the graph data in UPDATE mode.\n"
             )
             sys.exit(1)
 
-        graph_data = load_json_file(file_path)
+        if graph_state_file_path in ['', None]:
+            print(
+                "\nPlease provide the file path to load the graph state in UPDATE mode.\n"
+            )
+            sys.exit(1)
+
+        graph_data = load_graph_data(file_path)
+        graph_state = load_graph_state(graph_state_file_path)
 
-        if not isinstance(graph_data, dict):
-            print("\nThe graph data is in the wrong format.\n")
+        if graph_state['latest_block_time'] is not None and not graph_state[
+                'signatures']:
+            print(
+                "\nThe graph state does not record the signatures of its trades, eg. it was built in LOAD_TRADES mode, so the trades at its latest block time would be counted twice. Please update graph data built in BFS, INPUT or LOAD_SIGNATURES mode.\n"
+            )
             sys.exit(1)
 
-        if 'nodes' not in graph_data or 'edges' not in graph_data:
-            print("\nThe graph data is missing nodes or edges.\n")
+        # Trades at the latest block time are queried again, and dropped by their signatures
+        if graph_state['latest_block_time'] is not None:
+            n_days_before_utc_str = graph_state['latest_block_time']
+
+        print("Querying the DEX trades data since: {}".format(
+            n_days_before_utc_str))
+
+        saved_unique_signatures_file_path = f"{saved_data_folder_file_path}/unique_signatures_UPDATE_{current_datetime}.json"
+        saved_trades_file_path = f"{saved_data_folder_file_path}/combined_dex_trades_data_UPDATE_{current_datetime}.{trades_file_extension}"
+        saved_remaining_mint_addresses_file_path = f"{saved_data_folder_file_path}/remaining_mint_addresses_UPDATE_{current_datetime}.json"
+        saved_expanded_mint_addresses_file_path = f"{saved_data_folder_file_path}/expanded_mint_addresses_UPDATE_{current_datetime}.json"
+        saved_fetched_batches_file_path = f"{saved_data_folder_file_path}/fetched_signature_batches_UPDATE_{current_datetime}.json"
+
+        signatures_journal = Journal(saved_unique_signatures_file_path)
+        expansions_journal = Journal(saved_expanded_mint_addresses_file_path)
+        node_mint_addresses = mint_address_table.get_values(
+            graph_data['nodes'])
+        mint_address_count = 1
+
+        for mint_address in node_mint_addresses:
+            print('\nQuerying mint address {} ({} / {})'.format(
+                mint_address, mint_address_count, len(node_mint_addresses)))
+
+            expand_mint_address(mint_address)
+
+            mint_address_count += 1
+
+        signatures_journal.compact(unique=True)
+        expansions_journal.remove()
+
+        new_signatures = unique_signatures - graph_state['signatures']
+
+        print(
+            '\nNo. of unique signatures retrieved: {} ({} already in the graph data)'
+            .format(len(unique_signatures),
+                    len(unique_signatures) - len(new_signatures)))
+
+        get_dex_trades_data(new_signatures,
+                            batch_concurrency=batch_concurrency)
+
+        print('\nNo. of new processed DEX Trades data retrieved: {}'.format(
+            len(combined_dex_trades_data)))
+
+        token_details_dict = get_token_details_dict(
+            mint_address_table.get_values([
+                mint_address_id for mint_address_id in remaining_mint_addresses
+                if mint_address_id not in graph_data['nodes']
+            ]))
+        update_graph_data(graph_data, graph_state, combined_dex_trades_data,
+                          token_details_dict)
+        graph_state['signatures'].update(new_signatures)
+
+        save_graph_data(graph_data, graph_state)
+
+    else:
+        print("\nMode: {}".format(mode))
+        print("File Path to the Saved Graph Data: {}".format(file_path))
+        print("No. of days ago to query the data from: {}".format(since_days))
+        print("Minimum Volume Threshold in USD: {}".format(volume_threshold))
+
+        if file_path in ['', None]:
+            print(
+                "\nPlease provide the file path to load the graph data data in PLOT mode.\n"
+            )
             sys.exit(1)
 
+        graph_data = load_graph_data(file_path)
+
     if filter_type == 'NAME':
         plot_filter_name_list = plot_filter_names.strip().replace(
             ' ', '').split(',')
@@ -914,25 +2132,33 @@ if __name__ == "__main__":
     else:
         plot_filtered_addresses = []
 
-        if volume_threshold > 0:
+        if volume_threshold > 0 or top_k > 0 or edge_budget > 0:
             is_filtered = 'YES'
         else:
             is_filtered = 'NO'
 
-    plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
-                           volume_threshold, is_filtered)
+    if not no_plot:
+        plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
+                               volume_threshold, is_filtered, top_k,
+                               edge_budget, is_collapsing_leaves, layout,
+                               saved_layout_cache_file_path
+                               if LAYOUT_CACHE else None)
+
+    http_client.print_host_stats()
 
     print('\nTotal time taken: {:.2f} seconds'.format(time.time() -
                                                       start_time))
 
 # Nodes and Edges Data Structure
 
+# As saved by `get_saved_graph_data`. In memory, the nodes are keyed by interned mint address IDs and the edges by (source ID, target ID) tuples.
+
 # graph = {
 #     'nodes': {
-#         'A': {'mint_address': 'B7DD12..', 'name': 'dogwifhat', 'symbol': 'WIF', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': ''},
-#         'B': {'mint_address': 'C6AB72..', 'name': 'Popcat', 'symbol': 'POPCAT', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': ''},
-#         'C': {'mint_address': 'D2DG92..', 'name': 'nubcat', 'symbol': 'NUB', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': ''},
-#         'D': {'mint_address': 'VC5D56..', 'name': 'Peng', 'symbol': 'PENG', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': ''},
+#         'A': {'mint_address': 'B7DD12..', 'name': 'dogwifhat', 'symbol': 'WIF', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': '', 'no_of_signers_combined': 25},
+#         'B': {'mint_address': 'C6AB72..', 'name': 'Popcat', 'symbol': 'POPCAT', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': '', 'no_of_signers_combined': 30},
+#         'C': {'mint_address': 'D2DG92..', 'name': 'nubcat', 'symbol': 'NUB', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': '', 'no_of_signers_combined': 18},
+#         'D': {'mint_address': 'VC5D56..', 'name': 'Peng', 'symbol': 'PENG', 'volume': {}, 'price_change': {}, 'liquidity': {}, 'fdv': 123456, 'website': '', 'telegram': '', 'twitter': '', 'no_of_signers_combined': 2},
 #     },
 #     'edges': {
 #         'A-B': { 'trade_amount_in_usd_forward': 200, 'trade_amount_in_usd_reverse': 100, 'trade_amount_in_usd_net': 100, 'no_of_signers_forward': 12, 'no_of_signers_reverse': 6, 'no_of_signers_combined': 10 },
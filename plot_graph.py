@@ -2,11 +2,15 @@ import sys
 import networkx as nx
 import plotly.graph_objects as go
 import numpy as np
-from collections import deque
+import heapq
+from collections import Counter
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-from config import (EDGE_POINTS_QUANTITY, EDGE_POINTS_OPACITY,
-                    MARKED_MINT_ADDRESSES)
+from config import (EDGE_POINTS_QUANTITY, EDGE_POINTS_MIN_QUANTITY,
+                    EDGE_POINTS_OPACITY, MARKED_MINT_ADDRESSES,
+                    WEBGL_EDGE_THRESHOLD, WEBGL_EDGE_COLOUR_BINS,
+                    WEBGL_ARROW_SIZE, GRAPH_LAYOUT)
+from graph_layout import get_graph_layout
 
 # References:
 # - https://stackoverflow.com/questions/74607000/python-networkx-plotly-how-to-display-edges-mouse-over-text
@@ -14,33 +18,45 @@ from config import (EDGE_POINTS_QUANTITY, EDGE_POINTS_OPACITY,
 # - https://matplotlib.org/stable/users/explain/colors/colormaps.html
 
 
-def queue(a, b, qty):
-    """either x0 and x1 or y0 and y1, qty of points to create"""
-    q = deque()
-    q.append((0, qty - 1))  # indexing starts at 0
-    pts = [0] * qty
-    pts[0] = a
-    pts[-1] = b  # x0 is the first value, x1 is the last
-    while len(q) != 0:
-        left, right = q.popleft()  # remove working segment from queue
-        center = (left + right + 1) // 2  # creates index values for pts
-        pts[center] = (pts[left] + pts[right]) / 2
-        if right - left > 2:  # stop when qty met
-            q.append((left, center))
-            q.append((center, right))
-    return pts
-
-
-def make_middle_points(first_x, last_x, first_y, last_y, qty):
-    """line segment end points, how many midpoints, hovertext"""
-    # Add 2 because the origin will be in the list, pop first and last (the nodes)
-    middle_x_ = queue(first_x, last_x, qty + 2)
-    middle_y_ = queue(first_y, last_y, qty + 2)
-    middle_x_.pop(0)
-    middle_x_.pop()
-    middle_y_.pop(0)
-    middle_y_.pop()
-    return middle_x_, middle_y_
+def get_edge_points(edge_starts,
+                    edge_ends,
+                    max_qty=EDGE_POINTS_QUANTITY,
+                    min_qty=EDGE_POINTS_MIN_QUANTITY):
+    """
+    Place evenly spaced points along every edge at once, eg. as the invisible markers that show the edge information on hover.
+
+    The longest edge gets `max_qty` points and the shorter edges proportionally fewer, down to `min_qty`,
+    so that the points are about as dense on every edge. The nodes at both ends are left out.
+
+    :param edge_starts: An (n, 2) array of the positions of the source nodes of the edges.
+    :param edge_ends: An (n, 2) array of the positions of the target nodes of the edges.
+    :param max_qty: The number of points on the longest edge.
+    :param min_qty: The minimum number of points on an edge.
+
+    :return: A tuple of the flat arrays of the x and y coordinates of the points, edge by edge, and the number of points of each edge.
+    """
+    edge_vectors = edge_ends - edge_starts
+    edge_lengths = np.hypot(edge_vectors[:, 0], edge_vectors[:, 1])
+    max_edge_length = edge_lengths.max(initial=0)
+
+    if max_edge_length > 0:
+        edge_point_qtys = np.ceil(max_qty * edge_lengths /
+                                  max_edge_length).astype(int)
+    else:
+        edge_point_qtys = np.full(len(edge_lengths), max_qty)
+
+    edge_point_qtys = np.clip(edge_point_qtys, min(min_qty, max_qty), max_qty)
+
+    edge_indices = np.repeat(np.arange(len(edge_point_qtys)), edge_point_qtys)
+    # Number of each point on its edge, from 1 to the number of points of the edge
+    point_numbers = np.arange(len(edge_indices)) - np.repeat(
+        np.cumsum(edge_point_qtys) - edge_point_qtys, edge_point_qtys) + 1
+    fractions = point_numbers / (edge_point_qtys[edge_indices] + 1)
+
+    points = edge_starts[edge_indices] + fractions[:, None] * edge_vectors[
+        edge_indices]
+
+    return points[:, 0], points[:, 1], edge_point_qtys
 
 
 def weight_to_color(weight,
@@ -62,28 +78,130 @@ def weight_to_color(weight,
         return mcolors.to_hex(cmap(norm(weight)))
 
 
+def get_webgl_edge_traces(edge_starts,
+                          edge_ends,
+                          edge_weights,
+                          min_weight,
+                          max_weight,
+                          no_of_colour_bins=WEBGL_EDGE_COLOUR_BINS,
+                          arrow_size=WEBGL_ARROW_SIZE):
+    """
+    Draw the edges and their arrowheads as a few batched WebGL traces, in place of two layout annotations per edge.
+
+    Layout annotations are rendered as one SVG element each, which slows the browser down on large graphs.
+    Here, the edges are grouped into colour bins of their log weight, and each bin is drawn as one line
+    trace and one trace of filled triangles, computed with NumPy. Like the annotations, an edge is a line
+    from its source to its target node, with an arrowhead at its midpoint pointing to the target.
+
+    :param edge_starts: An (n, 2) array of the positions of the source nodes of the edges.
+    :param edge_ends: An (n, 2) array of the positions of the target nodes of the edges.
+    :param edge_weights: The net volumes of the edges, which set their colours.
+    :param min_weight: The lowest net volume of the plotted edges, which gets the first colour of the colour map.
+    :param max_weight: The highest net volume of the plotted edges, which gets the last colour of the colour map.
+    :param no_of_colour_bins: The number of colour bins, ie. the maximum number of colours and of trace pairs.
+    :param arrow_size: The length of the arrowheads, as a fraction of the size of the layout.
+
+    :return: The list of `Scattergl` traces.
+    """
+    log_min_weight = np.log10(min_weight)
+    log_max_weight = np.log10(max_weight)
+
+    if log_max_weight > log_min_weight:
+        norm_weights = (np.log10(edge_weights) - log_min_weight) / (
+            log_max_weight - log_min_weight)
+    else:
+        norm_weights = np.zeros(len(edge_weights))
+
+    colour_bins = np.clip((norm_weights * no_of_colour_bins).astype(int), 0,
+                          no_of_colour_bins - 1)
+
+    edge_vectors = edge_ends - edge_starts
+    edge_lengths = np.hypot(edge_vectors[:, 0], edge_vectors[:, 1])
+    directions = edge_vectors / np.where(edge_lengths > 0, edge_lengths,
+                                         1)[:, None]
+    normals = np.stack([-directions[:, 1], directions[:, 0]], axis=1)
+
+    layout_size = np.ptp(np.concatenate([edge_starts, edge_ends]), axis=0).max()
+    arrow_lengths = np.minimum(arrow_size * layout_size, edge_lengths / 2)
+
+    tips = edge_starts + edge_vectors / 2
+    bases = tips - directions * arrow_lengths[:, None]
+    half_widths = (arrow_lengths / 2)[:, None]
+
+    # Every line and triangle is followed by a NaN point, which plotly draws as a gap
+    lines = np.full((len(edge_starts), 3, 2), np.nan)
+    lines[:, 0] = edge_starts
+    lines[:, 1] = edge_ends
+
+    triangles = np.full((len(edge_starts), 5, 2), np.nan)
+    triangles[:, 0] = tips
+    triangles[:, 1] = bases + normals * half_widths
+    triangles[:, 2] = bases - normals * half_widths
+    triangles[:, 3] = tips
+
+    edge_traces = []
+
+    for colour_bin in np.unique(colour_bins):
+        is_in_bin = colour_bins == colour_bin
+        colour = mcolors.to_hex(
+            plt.cm.viridis((colour_bin + 0.5) / no_of_colour_bins))
+        bin_lines = lines[is_in_bin].reshape(-1, 2)
+        bin_triangles = triangles[is_in_bin].reshape(-1, 2)
+
+        edge_traces.append(
+            go.Scattergl(x=bin_lines[:, 0],
+                         y=bin_lines[:, 1],
+                         mode='lines',
+                         line=dict(width=2, color=colour),
+                         hoverinfo='skip',
+                         showlegend=False))
+        edge_traces.append(
+            go.Scattergl(x=bin_triangles[:, 0],
+                         y=bin_triangles[:, 1],
+                         mode='lines',
+                         fill='toself',
+                         fillcolor=colour,
+                         line=dict(width=1, color=colour),
+                         hoverinfo='skip',
+                         showlegend=False))
+
+    return edge_traces
+
+
 def create_plotly_graph(G, pos, edge_weights,
                         node_total_no_of_signers_combined_dict,
                         volume_threshold, earliest_local_block_time,
-                        latest_local_block_time, is_filtered):
+                        latest_local_block_time, is_filtered,
+                        is_exact_no_of_signers=True):
     edge_x_1 = []
     edge_y_1 = []
     edge_x_2 = []
     edge_y_2 = []
 
-    edge_middle_x = []
-    edge_middle_y = []
-    edge_hover_text = []
+    edge_starts = []
+    edge_ends = []
+    edge_infos = []
 
     annotations = []
+    edge_net_weights = []
+
+    # Large graphs are drawn with WebGL traces instead of SVG annotations and markers
+    is_webgl = G.number_of_edges() > WEBGL_EDGE_THRESHOLD
+    edge_scatter = go.Scattergl if is_webgl else go.Scatter
 
     min_weight = min(edge_weights)
     max_weight = max(edge_weights)
 
+    marked_nodes = {
+        node
+        for node in G.nodes()
+        if G.nodes[node]['mint_address'] in MARKED_MINT_ADDRESSES
+    }
+
     total_no_of_signers_combined_list = [
         no_of_signers for node, no_of_signers in
         node_total_no_of_signers_combined_dict.items()
-        if node not in MARKED_MINT_ADDRESSES
+        if node not in marked_nodes
     ]
     min_no_of_signers_combined = min(total_no_of_signers_combined_list)
     max_no_of_signers_combined = max(total_no_of_signers_combined_list)
@@ -116,7 +234,7 @@ def create_plotly_graph(G, pos, edge_weights,
 
         node_hover_text.append(node_info)
 
-        if node not in MARKED_MINT_ADDRESSES:
+        if node not in marked_nodes:
             node_colour = weight_to_color(node_total_no_of_signers_combined,
                                           min_no_of_signers_combined,
                                           max_no_of_signers_combined,
@@ -137,10 +255,8 @@ def create_plotly_graph(G, pos, edge_weights,
         edge_x_2.extend([midpoint_x, x1, None])
         edge_y_2.extend([midpoint_y, y1, None])
 
-        middle_x, middle_y = make_middle_points(x0, x1, y0, y1,
-                                                EDGE_POINTS_QUANTITY)
-        edge_middle_x.extend(middle_x)
-        edge_middle_y.extend(middle_y)
+        edge_starts.append((x0, y0))
+        edge_ends.append((x1, y1))
 
         edge_info = '{} --> {}<br>Net Volume: {:,.2f} USD<br>Volume from {} --> {}: {:,.2f} USD<br>Volume from {} --> {}: {:,.2f} USD<br>No. of Unique Wallet Addresses Combined: {}<br>No. of Unique Wallet Addresses that swaps from {} --> {}: {}<br>No. of Unique Wallet Addresses that swaps from {} --> {}: {}'.format(
             G.nodes[edge[0]]['name'] + ' (' + G.nodes[edge[0]]['symbol'] + ')',
@@ -154,7 +270,11 @@ def create_plotly_graph(G, pos, edge_weights,
             G.edges[edge]['no_of_signers_forward'], G.nodes[edge[1]]['symbol'],
             G.nodes[edge[0]]['symbol'], G.edges[edge]['no_of_signers_reverse'])
 
-        edge_hover_text.extend([edge_info] * EDGE_POINTS_QUANTITY)
+        edge_infos.append(edge_info)
+        edge_net_weights.append(G.edges[edge]['weight_net'])
+
+        if is_webgl:
+            continue
 
         arrow_color = weight_to_color(G.edges[edge]['weight_net'], min_weight,
                                       max_weight)
@@ -189,6 +309,14 @@ def create_plotly_graph(G, pos, edge_weights,
                  arrowwidth=2,
                  arrowcolor=arrow_color))
 
+    edge_starts = np.array(edge_starts, dtype=float)
+    edge_ends = np.array(edge_ends, dtype=float)
+
+    edge_middle_x, edge_middle_y, edge_point_qtys = get_edge_points(
+        edge_starts, edge_ends)
+    edge_hover_text = np.repeat(np.array(edge_infos, dtype=object),
+                                edge_point_qtys)
+
     node_trace = go.Scatter(
         x=node_x,
         y=node_y,
@@ -208,27 +336,34 @@ def create_plotly_graph(G, pos, edge_weights,
             sizemode='area',
             line_width=2))
 
-    edge_trace_1 = go.Scatter(x=edge_x_1,
-                              y=edge_y_1,
-                              line=dict(width=3, color='rgba(0,0,0,0)'),
-                              hoverinfo='text',
-                              mode='lines')
-
-    edge_trace_2 = go.Scatter(x=edge_x_2,
-                              y=edge_y_2,
-                              line=dict(width=3, color='rgba(0,0,0,0)'),
-                              hoverinfo='text',
-                              mode='lines')
-
-    mnode_trace = go.Scatter(x=edge_middle_x,
-                             y=edge_middle_y,
-                             mode="markers",
-                             showlegend=False,
-                             hovertemplate="%{hovertext}<extra></extra>",
-                             hovertext=edge_hover_text,
-                             hoverlabel=dict(bgcolor='lightblue',
-                                             font=dict(color='darkblue')),
-                             marker=go.Marker(opacity=EDGE_POINTS_OPACITY))
+    edge_trace_1 = edge_scatter(x=edge_x_1,
+                                y=edge_y_1,
+                                line=dict(width=3, color='rgba(0,0,0,0)'),
+                                hoverinfo='text',
+                                mode='lines')
+
+    edge_trace_2 = edge_scatter(x=edge_x_2,
+                                y=edge_y_2,
+                                line=dict(width=3, color='rgba(0,0,0,0)'),
+                                hoverinfo='text',
+                                mode='lines')
+
+    mnode_trace = edge_scatter(x=edge_middle_x,
+                               y=edge_middle_y,
+                               mode="markers",
+                               showlegend=False,
+                               hovertemplate="%{hovertext}<extra></extra>",
+                               hovertext=edge_hover_text,
+                               hoverlabel=dict(bgcolor='lightblue',
+                                               font=dict(color='darkblue')),
+                               marker=dict(opacity=EDGE_POINTS_OPACITY))
+
+    if is_webgl:
+        webgl_edge_traces = get_webgl_edge_traces(edge_starts, edge_ends,
+                                                  np.array(edge_net_weights),
+                                                  min_weight, max_weight)
+    else:
+        webgl_edge_traces = []
 
     colorbar_trace_1 = go.Scatter(
         x=[None],
@@ -252,6 +387,11 @@ def create_plotly_graph(G, pos, edge_weights,
         showlegend=False,
         hoverinfo='none')
 
+    if is_exact_no_of_signers:
+        no_of_signers_colorbar_title = 'Combined No. of Unique Wallet Addresses that interacts with the Token'
+    else:
+        no_of_signers_colorbar_title = 'Combined No. of Wallet Addresses (Unique per Edge) that interacts with the Token'
+
     colorbar_trace_2 = go.Scatter(
         x=[None],
         y=[None],
@@ -261,8 +401,7 @@ def create_plotly_graph(G, pos, edge_weights,
             cmin=min_no_of_signers_combined,
             cmax=max_no_of_signers_combined,
             colorbar=dict(
-                title=
-                'Combined No. of Wallet Addresses (Unique per Edge) that interacts with the Token',
+                title=no_of_signers_colorbar_title,
                 titleside='right',
                 thickness=15,
                 tickvals=[
@@ -281,7 +420,7 @@ def create_plotly_graph(G, pos, edge_weights,
         hoverinfo='none')
 
     fig = go.Figure(
-        data=[
+        data=webgl_edge_traces + [
             edge_trace_1, edge_trace_2, node_trace, mnode_trace,
             colorbar_trace_1, colorbar_trace_2
         ],
@@ -311,8 +450,233 @@ def create_plotly_graph(G, pos, edge_weights,
     return fig
 
 
-def plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
-                           volume_threshold, is_filtered):
+def get_top_k_edge_indices(plot_edges, top_k):
+    """
+    Find the edges among the top K by net volume of their endpoint with the higher degree.
+
+    Each edge is ranked by the node that would drop it, ie. the busier of its two tokens, so the many
+    leaves of a hub such as SOL or USDC only keep the top K edges of the hub. If both endpoints have the
+    same degree, the edge is kept if it is in the top K of either. Each node keeps a min-heap of at most
+    K edges, so the pass takes O(E log K).
+
+    :param plot_edges: The list of (source, target, edge attributes) of the edges.
+    :param top_k: The number of edges to keep per node.
+
+    :return: The set of the indices of the edges kept.
+    """
+    node_degrees = Counter()
+    for source, target, _ in plot_edges:
+        node_degrees[source] += 1
+        node_degrees[target] += 1
+
+    node_heaps = {}
+
+    for edge_index, (source, target, attributes) in enumerate(plot_edges):
+        entry = (attributes['weight_net'], edge_index)
+        max_degree = max(node_degrees[source], node_degrees[target])
+
+        for node in [source, target]:
+            if node_degrees[node] < max_degree:
+                continue
+
+            heap = node_heaps.setdefault(node, [])
+
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    return {
+        edge_index
+        for heap in node_heaps.values() for _, edge_index in heap
+    }
+
+
+def prune_plot_edges(plot_edges, top_k=0, max_edges=0):
+    """
+    Level-of-detail stage that drops the low-volume edges of a dense graph before it is plotted.
+
+    The top K edges by net volume of every node are kept first, see `get_top_k_edge_indices`. If more
+    edges than the edge budget are left, the net volume threshold that meets the budget is picked, ie.
+    only the `max_edges` edges with the highest net volume are kept. With heaps, the top K step takes
+    O(E log K) and the edge budget step O(E log max_edges). Neither step is applied if 0.
+
+    :param plot_edges: The list of (source, target, edge attributes) of the edges.
+    :param top_k: The number of edges to keep per node.
+    :param max_edges: The maximum total number of edges to keep.
+
+    :return: A tuple of the lists of the edges kept and of the edges dropped.
+    """
+    edge_indices = range(len(plot_edges))
+
+    if top_k > 0:
+        edge_indices = get_top_k_edge_indices(plot_edges, top_k)
+
+    if max_edges > 0 and len(edge_indices) > max_edges:
+        top_edges = heapq.nlargest(
+            max_edges, ((plot_edges[edge_index][2]['weight_net'], edge_index)
+                        for edge_index in edge_indices))
+        no_of_budget_dropped_edges = len(edge_indices) - max_edges
+        edge_indices = {edge_index for _, edge_index in top_edges}
+
+        print(
+            'Edge budget of {}: net volume threshold of {:,.2f} USD, {} edges ({:.2%}) dropped'
+            .format(max_edges, top_edges[-1][0], no_of_budget_dropped_edges,
+                    no_of_budget_dropped_edges / len(plot_edges)))
+
+    edge_indices = set(edge_indices)
+    kept_edges = []
+    dropped_edges = []
+
+    for edge_index, plot_edge in enumerate(plot_edges):
+        if edge_index in edge_indices:
+            kept_edges.append(plot_edge)
+        else:
+            dropped_edges.append(plot_edge)
+
+    print('Level of detail: {} out of {} edges kept'.format(
+        len(kept_edges), len(plot_edges)))
+
+    return kept_edges, dropped_edges
+
+
+def collapse_leaf_edges(kept_edges, dropped_edges, nodes):
+    """
+    Collapse the leaves dropped by the level-of-detail stage into an aggregate "other" node per token they traded with.
+
+    A leaf is a token with a single edge before pruning, to a token that is still plotted. The volumes and
+    signer counts of the leaves of a token are summed into one edge between the token and its "other"
+    node, so the signer counts are not unique across the leaves.
+
+    :param kept_edges: The list of (source, target, edge attributes) of the edges kept.
+    :param dropped_edges: The list of (source, target, edge attributes) of the edges dropped.
+    :param nodes: The node attributes, keyed by node.
+
+    :return: A tuple of the list of the aggregate edges, and of the node attributes of the "other" nodes, keyed by ('OTHER', node).
+    """
+    node_degrees = Counter()
+    for source, target, _ in kept_edges + dropped_edges:
+        node_degrees[source] += 1
+        node_degrees[target] += 1
+
+    plotted_nodes = {
+        node
+        for source, target, _ in kept_edges for node in [source, target]
+    }
+    other_details = {}
+
+    for source, target, attributes in dropped_edges:
+        if source in plotted_nodes and target not in plotted_nodes and node_degrees[
+                target] == 1:
+            node, leaf, is_source = source, target, True
+        elif target in plotted_nodes and source not in plotted_nodes and node_degrees[
+                source] == 1:
+            node, leaf, is_source = target, source, False
+        else:
+            continue
+
+        other_detail = other_details.setdefault(
+            node, {
+                'leaves': [],
+                'weight_out': 0,
+                'weight_in': 0,
+                'no_of_signers_out': 0,
+                'no_of_signers_in': 0,
+                'no_of_signers_combined': 0
+            })
+        other_detail['leaves'].append(leaf)
+
+        # Volumes and signers from the token to its leaves, and back
+        if is_source:
+            other_detail['weight_out'] += attributes['weight_forward']
+            other_detail['weight_in'] += attributes['weight_reverse']
+            other_detail['no_of_signers_out'] += attributes[
+                'no_of_signers_forward']
+            other_detail['no_of_signers_in'] += attributes[
+                'no_of_signers_reverse']
+        else:
+            other_detail['weight_out'] += attributes['weight_reverse']
+            other_detail['weight_in'] += attributes['weight_forward']
+            other_detail['no_of_signers_out'] += attributes[
+                'no_of_signers_reverse']
+            other_detail['no_of_signers_in'] += attributes[
+                'no_of_signers_forward']
+        other_detail['no_of_signers_combined'] += attributes[
+            'no_of_signers_combined']
+
+    other_edges = []
+    other_nodes = {}
+
+    for node, other_detail in other_details.items():
+        weight_net = other_detail['weight_out'] - other_detail['weight_in']
+
+        if weight_net == 0:
+            continue
+
+        other_node = ('OTHER', node)
+        leaves = other_detail['leaves']
+        other_nodes[other_node] = {
+            'mint_address': '',
+            'name': 'Other Tokens of ' + nodes[node]['symbol'],
+            'symbol': '{} Tokens'.format(len(leaves)),
+            'fdv': sum(nodes[leaf].get('fdv') or 0 for leaf in leaves),
+            'website': '',
+            'telegram': '',
+            'twitter': ''
+        }
+
+        if all('no_of_signers_combined' in nodes[leaf] for leaf in leaves):
+            other_nodes[other_node]['no_of_signers_combined'] = sum(
+                nodes[leaf]['no_of_signers_combined'] for leaf in leaves)
+
+        if weight_net > 0:
+            other_edges.append((node, other_node, {
+                'weight_forward': other_detail['weight_out'],
+                'weight_reverse': other_detail['weight_in'],
+                'weight_net': weight_net,
+                'no_of_signers_forward': other_detail['no_of_signers_out'],
+                'no_of_signers_reverse': other_detail['no_of_signers_in'],
+                'no_of_signers_combined': other_detail['no_of_signers_combined']
+            }))
+        else:
+            other_edges.append((other_node, node, {
+                'weight_forward': other_detail['weight_in'],
+                'weight_reverse': other_detail['weight_out'],
+                'weight_net': -weight_net,
+                'no_of_signers_forward': other_detail['no_of_signers_in'],
+                'no_of_signers_reverse': other_detail['no_of_signers_out'],
+                'no_of_signers_combined': other_detail['no_of_signers_combined']
+            }))
+
+    print('{} leaves collapsed into {} other nodes'.format(
+        sum(len(other_detail['leaves'])
+            for other_detail in other_details.values()), len(other_nodes)))
+
+    return other_edges, other_nodes
+
+
+def plot_nodes_edges_graph(graph_data,
+                           plot_filtered_addresses,
+                           volume_threshold,
+                           is_filtered,
+                           top_k=0,
+                           max_edges=0,
+                           is_collapsing_leaves=False,
+                           layout=GRAPH_LAYOUT,
+                           layout_cache_file_path=None):
+    """
+    Plot the graph data as a node-and-edge graph in the browser.
+
+    :param graph_data: The graph data, keyed by interned IDs.
+    :param plot_filtered_addresses: Only plot the edges of these mint address IDs, or every edge if empty.
+    :param volume_threshold: The minimum net volume in USD of the edges plotted.
+    :param is_filtered: 'YES' or 'NO', as shown in the title.
+    :param top_k: Only plot the top K edges by net volume of each node, see `prune_plot_edges`. 0 plots every edge.
+    :param max_edges: The maximum number of edges plotted, see `prune_plot_edges`. 0 plots every edge.
+    :param is_collapsing_leaves: Collapse the leaves dropped by `top_k` and `max_edges` into "other" nodes, see `collapse_leaf_edges`.
+    :param layout: The name of the graph layout, see `graph_layout.LAYOUTS`.
+    :param layout_cache_file_path: The file of the cached node positions to start the layout from, or None to not use the cache.
+    """
 
     G = nx.DiGraph()
 
@@ -327,9 +691,14 @@ def plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
     edge_weights = []
     filtered_nodes = set()
     node_total_no_of_signers_combined_dict = {}
+    plot_edges = []
 
-    for edge, edge_detail in edges.items():
-        source, target = edge.split('-')
+    # Graph data saved before the exact per-node signer counts were recorded falls back to summing the per-edge counts
+    is_exact_no_of_signers = bool(nodes) and all(
+        'no_of_signers_combined' in attributes for attributes in nodes.values())
+
+    # The nodes and edges are keyed by interned mint address IDs, see `graph_builder.get_interned_graph_data`
+    for (source, target), edge_detail in edges.items():
         weight_forward = edge_detail['trade_amount_in_usd_forward']
         weight_reverse = edge_detail['trade_amount_in_usd_reverse']
         weight_net = edge_detail['trade_amount_in_usd_net']
@@ -361,32 +730,42 @@ def plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
         if weight_net < volume_threshold:
             continue
 
-        if source not in node_total_no_of_signers_combined_dict:
-            node_total_no_of_signers_combined_dict[
-                source] = no_of_signers_combined
-        else:
-            node_total_no_of_signers_combined_dict[
-                source] += no_of_signers_combined
-
-        if target not in node_total_no_of_signers_combined_dict:
-            node_total_no_of_signers_combined_dict[
-                target] = no_of_signers_combined
-        else:
-            node_total_no_of_signers_combined_dict[
-                target] += no_of_signers_combined
+        plot_edges.append((source, target, {
+            'weight_forward': weight_forward,
+            'weight_reverse': weight_reverse,
+            'weight_net': weight_net,
+            'no_of_signers_forward': no_of_signers_forward,
+            'no_of_signers_reverse': no_of_signers_reverse,
+            'no_of_signers_combined': no_of_signers_combined
+        }))
+
+    if top_k > 0 or max_edges > 0:
+        plot_edges, dropped_edges = prune_plot_edges(plot_edges, top_k,
+                                                     max_edges)
+
+        if is_collapsing_leaves:
+            other_edges, other_nodes = collapse_leaf_edges(
+                plot_edges, dropped_edges, nodes)
+            plot_edges = plot_edges + other_edges
+            nodes = {**nodes, **other_nodes}
+
+    for source, target, attributes in plot_edges:
+        no_of_signers_combined = attributes['no_of_signers_combined']
+
+        if not is_exact_no_of_signers:
+            for node in [source, target]:
+                if node not in node_total_no_of_signers_combined_dict:
+                    node_total_no_of_signers_combined_dict[
+                        node] = no_of_signers_combined
+                else:
+                    node_total_no_of_signers_combined_dict[
+                        node] += no_of_signers_combined
 
         filtered_nodes.add(source)
         filtered_nodes.add(target)
-        edge_weights.append(weight_net)
+        edge_weights.append(attributes['weight_net'])
 
-        G.add_edge(source,
-                   target,
-                   weight_forward=weight_forward,
-                   weight_reverse=weight_reverse,
-                   weight_net=weight_net,
-                   no_of_signers_forward=no_of_signers_forward,
-                   no_of_signers_reverse=no_of_signers_reverse,
-                   no_of_signers_combined=no_of_signers_combined)
+        G.add_edge(source, target, **attributes)
 
     if not edge_weights:
         print('\nNo graph data available to plot.\n')
@@ -396,15 +775,15 @@ def plot_nodes_edges_graph(graph_data, plot_filtered_addresses,
         if node in filtered_nodes:
             G.add_node(node, **attributes)
 
-    pos = nx.spiral_layout(G,
-                           scale=1,
-                           center=None,
-                           dim=2,
-                           resolution=0.8,
-                           equidistant=True)
+            if is_exact_no_of_signers:
+                node_total_no_of_signers_combined_dict[node] = attributes[
+                    'no_of_signers_combined']
+
+    pos = get_graph_layout(G, layout, layout_cache_file_path)
 
     fig = create_plotly_graph(G, pos, edge_weights,
                               node_total_no_of_signers_combined_dict,
                               volume_threshold, earliest_local_block_time,
-                              latest_local_block_time, is_filtered)
+                              latest_local_block_time, is_filtered,
+                              is_exact_no_of_signers)
     fig.show()
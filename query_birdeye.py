@@ -1,57 +1,81 @@
-import requests
+import http_client
 import os
 import datetime
 from urllib3.exceptions import InsecureRequestWarning
 import urllib3
 from utils import save_json_file
-from config import BIRDEYE_AGENT_ID, BIRDEYE_USER_AGENT
+from config import BIRDEYE_AGENT_ID, BIRDEYE_USER_AGENT, BIRDEYE_QUERY_LIMIT
 
 urllib3.disable_warnings(InsecureRequestWarning)
 
-url = "https://multichain-api.birdeye.so/solana/gems"
-payload = {
-    "export": False,
-    "limit": 50,
-    "offset": 0,
-    "query": [],
-    "sort_by": "v24hUSD",
-    "sort_type": "desc"
-}
-
-headers = {
-    "Accept": "application/json, text/plain, */*",
-    "Accept-Encoding": "gzip, deflate, br, zstd",
-    "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
-    "Agent-Id": BIRDEYE_AGENT_ID,
-    "Origin": "https://birdeye.so",
-    "Referer": "https://birdeye.so/",
-    "User-Agent": BIRDEYE_USER_AGENT
-}
-
-response = requests.post(url, headers=headers, json=payload, verify=False)
-
-if response.status_code == 200:
-    print("\nRequest successful!")
-
-    try:
-        tokens_data = response.json().get('data', {}).get('items', [])
-
-        if not isinstance(tokens_data, list):
+
+def get_birdeye_tokens(offset=0, limit=BIRDEYE_QUERY_LIMIT):
+    """
+    Query a page of the tokens with the highest 24 hours volume on Birdeye.
+
+    :param offset: The number of tokens to skip.
+    :param limit: The number of tokens per page.
+
+    :return: The list of token data.
+    """
+    url = "https://multichain-api.birdeye.so/solana/gems"
+    payload = {
+        "export": False,
+        "limit": limit,
+        "offset": offset,
+        "query": [],
+        "sort_by": "v24hUSD",
+        "sort_type": "desc"
+    }
+
+    headers = {
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Encoding": "gzip, deflate, br, zstd",
+        "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
+        "Agent-Id": BIRDEYE_AGENT_ID,
+        "Origin": "https://birdeye.so",
+        "Referer": "https://birdeye.so/",
+        "User-Agent": BIRDEYE_USER_AGENT
+    }
+
+    response = http_client.post(url, headers=headers, json=payload)
+
+    if response.status_code == 200:
+        print("\nRequest successful!")
+
+        try:
+            tokens_data = response.json().get('data', {}).get('items', [])
+
+            if not isinstance(tokens_data, list):
+                tokens_data = []
+        except:
             tokens_data = []
-    except:
-        tokens_data = []
 
-    mint_addresses = [token['address'] for token in tokens_data]
+    else:
+        raise Exception('\nQuery failed and return code is {}.'.format(
+            response.status_code))
+
+    return tokens_data
+
+
+def get_birdeye_mint_addresses():
+    """
+    Query the mint addresses of the tokens with the highest 24 hours volume on Birdeye.
+
+    :return: The list of mint addresses.
+    """
+    return [token['address'] for token in get_birdeye_tokens()]
+
+
+if __name__ == "__main__":
 
-else:
-    raise Exception('\nQuery failed and return code is {}.'.format(
-        response.status_code))
+    mint_addresses = get_birdeye_mint_addresses()
 
-saved_data_folder_file_path = './saved_data'
-if not os.path.exists(saved_data_folder_file_path):
-    os.makedirs(saved_data_folder_file_path)
+    saved_data_folder_file_path = './saved_data'
+    if not os.path.exists(saved_data_folder_file_path):
+        os.makedirs(saved_data_folder_file_path)
 
-current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-file_name = f"{saved_data_folder_file_path}/birdeye_highest_24hr_volume_mint_addresses_{current_datetime}.json"
+    current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_name = f"{saved_data_folder_file_path}/birdeye_highest_24hr_volume_mint_addresses_{current_datetime}.json"
 
-save_json_file(file_name, mint_addresses)
+    save_json_file(file_name, mint_addresses)
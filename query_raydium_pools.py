@@ -1,15 +1,152 @@
-import requests
+import http_client
 import os
 import sys
 import datetime
 from urllib3.exceptions import InsecureRequestWarning
 import urllib3
 import argparse
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from utils import save_json_file
-from config import EXCLUDED_MINT_ADDRESSES
+from config import EXCLUDED_MINT_ADDRESSES, RAYDIUM_CONCURRENCY
 
 urllib3.disable_warnings(InsecureRequestWarning)
 
+# The volume of each pool over the period of a volume sort field
+RAYDIUM_POOL_VOLUME_PERIODS = {
+    'volume24h': 'day',
+    'volume7d': 'week',
+    'volume30d': 'month'
+}
+
+
+def get_raydium_pools_page(pool_type, pool_sort_field, sort_type, page_size,
+                           page):
+    """
+    Query a page of Raydium pools.
+
+    :return: A tuple of the list of pools of the page and whether there is a next page.
+    """
+    url = "https://api-v3.raydium.io/pools/info/list?poolType={}&poolSortField={}&sortType={}&pageSize={}&page={}".format(
+        pool_type, pool_sort_field, sort_type, page_size, page)
+
+    response = http_client.get(url)
+
+    if response.status_code == 200:
+
+        try:
+            page_data = response.json().get('data', {})
+            pools_data = page_data.get('data', [])
+
+            if not isinstance(pools_data, list):
+                pools_data = []
+
+            has_next_page = page_data.get('hasNextPage',
+                                          len(pools_data) == page_size)
+        except:
+            pools_data = []
+            has_next_page = False
+
+    else:
+        raise Exception('Query failed and return code is {}.'.format(
+            response.status_code))
+
+    return pools_data, has_next_page
+
+
+def get_pool_volume(pool, pool_sort_field):
+    """
+    :return: The USD volume of the pool over the period of the sort field, eg. 7 days for volume7d, or over 24 hours by default.
+    """
+    period = RAYDIUM_POOL_VOLUME_PERIODS.get(pool_sort_field, 'day')
+
+    try:
+        return float(pool.get(period, {}).get('volume') or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def get_raydium_pools_mint_addresses(pool_type='all',
+                                     pool_sort_field='volume24h',
+                                     sort_type='desc',
+                                     page_size=50,
+                                     page=1,
+                                     last_page=None,
+                                     concurrency=RAYDIUM_CONCURRENCY,
+                                     min_volume=0):
+    """
+    Query the mint addresses of the tokens in a range of pages of Raydium pools.
+
+    Up to `concurrency` pages are queried at once. The mint addresses of each page are merged as soon as
+    it arrives, so only the deduplicated set is held in memory. Paging stops after the last page, after
+    a page without a next page, or, with a minimum volume, after the first page with a pool below it.
+
+    :param pool_type: Pool Type. Available values : all, concentrated, standard.
+    :param pool_sort_field: Pool Field, eg. volume24h or liquidity.
+    :param sort_type: Sort Type. Available values : desc, asc.
+    :param page_size: Page Size. Max is 1000.
+    :param page: The first Page Index.
+    :param last_page: The last Page Index. 0 queries until the pages are exhausted. Defaults to `page`, ie. a single page.
+    :param concurrency: The number of pages to query in parallel.
+    :param min_volume: Skip the pools with a lower USD volume over the period of the sort field, and stop paging once one is found. The pools must be sorted by volume in descending order.
+
+    :return: The list of mint addresses, without the excluded mint addresses.
+    """
+    if last_page is None:
+        last_page = page
+
+    # Pages after the stop page are not queried, and it only moves down
+    stop_page = last_page if last_page > 0 else math.inf
+    next_page = page
+    mint_addresses = set()
+    futures = {}
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        while futures or next_page <= stop_page:
+
+            while next_page <= stop_page and len(futures) < max(
+                    concurrency, 1):
+                futures[executor.submit(get_raydium_pools_page, pool_type,
+                                        pool_sort_field, sort_type, page_size,
+                                        next_page)] = next_page
+                next_page += 1
+
+            done_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+            for future in done_futures:
+                current_page = futures.pop(future)
+                pools_data, has_next_page = future.result()
+                is_below_min_volume = False
+
+                for pool in pools_data:
+
+                    if min_volume > 0 and get_pool_volume(
+                            pool, pool_sort_field) < min_volume:
+                        is_below_min_volume = True
+                        continue
+
+                    mintA = pool.get('mintA', {})
+                    mintB = pool.get('mintB', {})
+
+                    mintA_address = mintA.get('address', '')
+                    mintB_address = mintB.get('address', '')
+
+                    if mintA_address and mintA_address not in EXCLUDED_MINT_ADDRESSES:
+                        mint_addresses.add(mintA_address)
+
+                    if mintB_address and mintB_address not in EXCLUDED_MINT_ADDRESSES:
+                        mint_addresses.add(mintB_address)
+
+                print('Page {} queried: {} pools, {} unique mint addresses so far'.
+                      format(current_page, len(pools_data),
+                             len(mint_addresses)))
+
+                if not has_next_page or is_below_min_volume:
+                    stop_page = min(stop_page, current_page)
+
+    return list(mint_addresses)
+
+
 if __name__ == "__main__":
 
     # Get arguments from terminal
@@ -44,6 +181,29 @@ if __name__ == "__main__":
                         type=int,
                         default=1,
                         help="Page Index. Default is 1.")
+    parser.add_argument(
+        '-pe',
+        '--page_end',
+        type=int,
+        default=None,
+        help=
+        "The last Page Index to query. 0 queries all pages until they are exhausted. Default is the Page Index, ie. a single page."
+    )
+    parser.add_argument(
+        '-c',
+        '--concurrency',
+        type=int,
+        default=RAYDIUM_CONCURRENCY,
+        help="The number of pages to query in parallel. Default is {}.".format(
+            RAYDIUM_CONCURRENCY))
+    parser.add_argument(
+        '-mv',
+        '--min_volume',
+        type=float,
+        default=0,
+        help=
+        "The minimum USD volume of a pool over the period of the Pool Field. Paging stops at the first pool below it. Only for volume24h, volume7d and volume30d in desc order. Default is 0, ie. no minimum."
+    )
     args = parser.parse_args()
 
     pool_type = str(args.pool_type).lower()
@@ -51,6 +211,9 @@ if __name__ == "__main__":
     sort_type = str(args.sort_type).lower()
     page_size = args.page_size
     page = args.page
+    page_end = args.page_end
+    concurrency = args.concurrency
+    min_volume = args.min_volume
 
     if pool_type not in ['all', 'concentrated', 'standard']:
         print(
@@ -73,40 +236,24 @@ if __name__ == "__main__":
             .format(sort_type))
         sys.exit(1)
 
-    url = "https://api-v3.raydium.io/pools/info/list?poolType={}&poolSortField={}&sortType={}&pageSize={}&page={}".format(
-        pool_type, pool_sort_field, sort_type, page_size, page)
-
-    response = requests.get(url, verify=False)
-
-    if response.status_code == 200:
-        print("\nRequest successful!")
-        mint_addresses = set()
-
-        try:
-            pools_data = response.json().get('data', {}).get('data', [])
-
-            if not isinstance(pools_data, list):
-                pools_data = []
-        except:
-            pools_data = []
-
-        for pool in pools_data:
-
-            mintA = pool.get('mintA', {})
-            mintB = pool.get('mintB', {})
-
-            mintA_address = mintA.get('address', '')
-            mintB_address = mintB.get('address', '')
-
-            if mintA_address not in EXCLUDED_MINT_ADDRESSES:
-                mint_addresses.add(mintA_address)
+    if page_end not in [None, 0] and page_end < page:
+        print(
+            "\nThe last Page Index {} is before the Page Index {}.\n".format(
+                page_end, page))
+        sys.exit(1)
 
-            if mintB_address not in EXCLUDED_MINT_ADDRESSES:
-                mint_addresses.add(mintB_address)
+    if min_volume > 0 and (pool_sort_field not in RAYDIUM_POOL_VOLUME_PERIODS
+                           or sort_type != 'desc'):
+        print(
+            "\nThe minimum volume needs the pools sorted by volume24h, volume7d or volume30d in desc order.\n"
+        )
+        sys.exit(1)
 
-    else:
-        raise Exception('Query failed and return code is {}.'.format(
-            response.status_code))
+    mint_addresses = get_raydium_pools_mint_addresses(pool_type,
+                                                      pool_sort_field,
+                                                      sort_type, page_size,
+                                                      page, page_end,
+                                                      concurrency, min_volume)
 
     saved_data_folder_file_path = './saved_data'
     if not os.path.exists(saved_data_folder_file_path):
@@ -115,4 +262,4 @@ if __name__ == "__main__":
     current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     file_name = f"{saved_data_folder_file_path}/raydium_pools_mint_addresses_{current_datetime}.json"
 
-    save_json_file(file_name, list(mint_addresses))
+    save_json_file(file_name, mint_addresses)
@@ -1,4 +1,4 @@
-import requests
+import http_client
 import os
 import datetime
 from urllib3.exceptions import InsecureRequestWarning
@@ -8,29 +8,56 @@ from config import VYBE_NETWORK_X_API_KEY, VYBE_NETWORK_QUERY_LIMIT
 
 urllib3.disable_warnings(InsecureRequestWarning)
 
-url = "https://api.vybenetwork.xyz/tokens?sortByDesc=marketCap&limit={}&page=0".format(
-    VYBE_NETWORK_QUERY_LIMIT)
 
-headers = {"accept": "application/json", "X-API-KEY": VYBE_NETWORK_X_API_KEY}
+def get_vybe_network_tokens(page=0, limit=VYBE_NETWORK_QUERY_LIMIT):
+    """
+    Query a page of the tokens with the highest market cap on Vybe Network.
 
-response = requests.get(url, headers=headers, verify=False)
+    :param page: The Page Index, from 0.
+    :param limit: The number of tokens per page.
 
-if response.status_code == 200:
-    print("\nRequest successful!")
-    tokens_data = response.json().get('data', [])
-    print('\nNo. of tokens queried: {}'.format(len(tokens_data)))
+    :return: The list of token data.
+    """
+    url = "https://api.vybenetwork.xyz/tokens?sortByDesc=marketCap&limit={}&page={}".format(
+        limit, page)
 
-    mint_addresses = [token['mintAddress'] for token in tokens_data]
+    headers = {
+        "accept": "application/json",
+        "X-API-KEY": VYBE_NETWORK_X_API_KEY
+    }
 
-else:
-    raise Exception('Query failed and return code is {}.'.format(
-        response.status_code))
+    response = http_client.get(url, headers=headers)
 
-saved_data_folder_file_path = './saved_data'
-if not os.path.exists(saved_data_folder_file_path):
-    os.makedirs(saved_data_folder_file_path)
+    if response.status_code == 200:
+        print("\nRequest successful!")
+        tokens_data = response.json().get('data', [])
+        print('\nNo. of tokens queried: {}'.format(len(tokens_data)))
 
-current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-file_name = f"{saved_data_folder_file_path}/vybe_network_highest_mcap_mint_addresses_{current_datetime}.json"
+    else:
+        raise Exception('Query failed and return code is {}.'.format(
+            response.status_code))
 
-save_json_file(file_name, mint_addresses)
+    return tokens_data
+
+
+def get_vybe_network_mint_addresses():
+    """
+    Query the mint addresses of the tokens with the highest market cap on Vybe Network.
+
+    :return: The list of mint addresses.
+    """
+    return [token['mintAddress'] for token in get_vybe_network_tokens()]
+
+
+if __name__ == "__main__":
+
+    mint_addresses = get_vybe_network_mint_addresses()
+
+    saved_data_folder_file_path = './saved_data'
+    if not os.path.exists(saved_data_folder_file_path):
+        os.makedirs(saved_data_folder_file_path)
+
+    current_datetime = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_name = f"{saved_data_folder_file_path}/vybe_network_highest_mcap_mint_addresses_{current_datetime}.json"
+
+    save_json_file(file_name, mint_addresses)
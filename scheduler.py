@@ -0,0 +1,295 @@
+import os
+import sys
+import time
+import runpy
+import argparse
+from collections import deque
+from datetime import datetime
+from interning import mint_address_table, signer_table
+from utils import load_json_file, save_json_file
+from discovery import DISCOVERY_SOURCES, discover_seeds
+from config import (EXCLUDED_MINT_ADDRESSES, SCHEDULER_SOURCES,
+                    SCHEDULER_SOURCE_INTERVALS,
+                    SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL,
+                    SCHEDULER_MAX_CRAWL_RETRIES)
+
+main_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'main.py')
+
+### Functions ###
+
+
+def discover_mint_addresses(source):
+    """
+    Run a discovery source over its pages.
+
+    :param source: The name of the discovery source, from `DISCOVERY_SOURCES`.
+
+    :return: The list of mint addresses discovered, ranked by 24 hours volume, or None if every page failed.
+    """
+    ranked_seeds, source_stats = discover_seeds([source])
+
+    if 0 < source_stats[source]['pages'] == source_stats[source][
+            'failed_pages']:
+        print('\nDiscovery from {} failed.'.format(source))
+        return None
+
+    return [seed['mint_address'] for seed in ranked_seeds]
+
+
+def enqueue_new_mint_addresses(mint_addresses):
+    """
+    Diff the output of a discovery source against the mint addresses seen so far, and enqueue the new ones to crawl.
+
+    :return: The list of new mint addresses.
+    """
+    new_mint_addresses = []
+
+    for mint_address in mint_addresses:
+        if (not mint_address or mint_address in EXCLUDED_MINT_ADDRESSES
+                or mint_address in seen_mint_addresses):
+            continue
+
+        seen_mint_addresses.add(mint_address)
+        crawl_queue.append(mint_address)
+        new_mint_addresses.append(mint_address)
+
+    return new_mint_addresses
+
+
+def save_scheduler_state():
+    """
+    Save the mint addresses seen so far, the queued ones and their failed crawls, so that a restarted scheduler neither crawls a mint address twice nor loses the queue.
+    """
+    save_json_file(
+        saved_scheduler_state_file_path, {
+            'seen_mint_addresses': sorted(seen_mint_addresses),
+            'queued_mint_addresses': list(crawl_queue),
+            'failed_crawl_counts': failed_crawl_counts
+        })
+
+
+def requeue_failed_mint_addresses(mint_addresses):
+    """
+    Put the mint addresses of a failed crawl back at the front of the queue, unless they already failed `SCHEDULER_MAX_CRAWL_RETRIES` times.
+
+    :return: The list of mint addresses given up on.
+    """
+    requeued_mint_addresses = []
+    dropped_mint_addresses = []
+
+    for mint_address in mint_addresses:
+        failed_crawl_counts[mint_address] = failed_crawl_counts.get(
+            mint_address, 0) + 1
+
+        if failed_crawl_counts[mint_address] > SCHEDULER_MAX_CRAWL_RETRIES:
+            del failed_crawl_counts[mint_address]
+            dropped_mint_addresses.append(mint_address)
+        else:
+            requeued_mint_addresses.append(mint_address)
+
+    crawl_queue.extendleft(reversed(requeued_mint_addresses))
+
+    return dropped_mint_addresses
+
+
+def run_crawl(mint_addresses):
+    """
+    Crawl a list of mint addresses with main.py in INPUT mode, in this process.
+
+    main.py runs as if started from the terminal, but the modules it imports stay loaded between crawls,
+    so the Bitquery access token, the HTTP keep-alive connection pools and the rate limiters are reused
+    instead of being set up again on every cycle.
+
+    :return: The run ID of the crawl, or None if it failed.
+    """
+    global last_crawl_datetime
+
+    # The IDs of a crawl are only used within it, so the interning tables are emptied instead of growing across crawls
+    mint_address_table.clear()
+    signer_table.clear()
+
+    # The files of a run are named after the second it starts at, so two crawls must not start in the same second
+    current_datetime = datetime.now().strftime("%Y%m%d_%H%M%S")
+    while current_datetime <= last_crawl_datetime:
+        time.sleep(0.1)
+        current_datetime = datetime.now().strftime("%Y%m%d_%H%M%S")
+    last_crawl_datetime = current_datetime
+
+    saved_mint_addresses_file_path = f"{saved_data_folder_file_path}/scheduler_mint_addresses_{current_datetime}.json"
+    save_json_file(saved_mint_addresses_file_path, mint_addresses)
+
+    argv = sys.argv
+    sys.argv = [
+        main_file_path, '-m', 'INPUT', '-f', saved_mint_addresses_file_path,
+        '-s',
+        str(since_days), '-np'
+    ]
+
+    try:
+        main_globals = runpy.run_path(main_file_path, run_name='__main__')
+    except SystemExit:
+        print('\nThe crawl of {} exited early.'.format(
+            saved_mint_addresses_file_path))
+        return None
+    except Exception as e:
+        print('\nThe crawl of {} failed with error {}'.format(
+            saved_mint_addresses_file_path, e))
+        return None
+    finally:
+        sys.argv = argv
+
+    return main_globals['current_datetime']
+
+
+def run_scheduler(sources, run_once=False):
+    """
+    Run the discovery sources on their intervals and crawl the newly discovered mint addresses until Ctrl-C.
+
+    A crawl takes at most `SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL` mint addresses from the queue, and the
+    sources that fall due in the meantime are run between two crawls.
+
+    :param sources: The names of the discovery sources to run.
+    :param run_once: Stop after one cycle, eg. to run the scheduler from cron.
+    """
+    next_discovery_times = {source: 0 for source in sources}
+
+    while True:
+        cycle_start_time = time.time()
+
+        for source in sources:
+            if time.time() < next_discovery_times[source]:
+                continue
+
+            discovery_start_time = time.time()
+            next_discovery_times[source] = (
+                discovery_start_time + SCHEDULER_SOURCE_INTERVALS[source])
+            mint_addresses = discover_mint_addresses(source)
+
+            if mint_addresses is None:
+                continue
+
+            new_mint_addresses = enqueue_new_mint_addresses(mint_addresses)
+
+            print(
+                '\n{}: {} mint addresses discovered, {} new, in {:.2f} seconds'
+                .format(source, len(mint_addresses), len(new_mint_addresses),
+                        time.time() - discovery_start_time))
+
+        save_scheduler_state()
+
+        if crawl_queue:
+            mint_addresses = [
+                crawl_queue.popleft() for _ in range(
+                    min(len(crawl_queue),
+                        SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL))
+            ]
+            crawl_start_time = time.time()
+
+            try:
+                run_id = run_crawl(mint_addresses)
+            except KeyboardInterrupt:
+                crawl_queue.extendleft(reversed(mint_addresses))
+                raise
+
+            if run_id is None:
+                dropped_mint_addresses = requeue_failed_mint_addresses(
+                    mint_addresses)
+                if dropped_mint_addresses:
+                    print('\nGave up on {} mint addresses after {} failed crawls: {}'
+                          .format(len(dropped_mint_addresses),
+                                  SCHEDULER_MAX_CRAWL_RETRIES + 1,
+                                  ', '.join(dropped_mint_addresses)))
+            else:
+                for mint_address in mint_addresses:
+                    failed_crawl_counts.pop(mint_address, None)
+
+            save_scheduler_state()
+
+            print('\nCrawl of {} mint addresses (Run ID: {}) took {:.2f} seconds'.
+                  format(len(mint_addresses), run_id,
+                         time.time() - crawl_start_time))
+
+        print('\nCycle latency: {:.2f} seconds, queue depth: {}'.format(
+            time.time() - cycle_start_time, len(crawl_queue)))
+
+        if run_once:
+            break
+
+        if not crawl_queue:
+            time.sleep(
+                max(min(next_discovery_times.values()) - time.time(), 0))
+
+
+## Main Program ##
+
+if __name__ == "__main__":
+
+    # Get arguments from terminal
+    parser = argparse.ArgumentParser(
+        description="Get parameters for the script.")
+    parser.add_argument(
+        '-src',
+        '--sources',
+        type=str,
+        default=','.join(SCHEDULER_SOURCES),
+        help=
+        "The discovery sources to run. Use comma separator. Available values : BIRDEYE, VYBE_NETWORK, RAYDIUM. Default is '{}'."
+        .format(','.join(SCHEDULER_SOURCES)))
+    parser.add_argument(
+        '-s',
+        '--since_days',
+        type=int,
+        default=2,
+        help=
+        "The number of days before the current local time to query the DEX trades data in each crawl. Default is 2."
+    )
+    parser.add_argument('-o',
+                        '--once',
+                        action='store_true',
+                        help="Run a single cycle and exit.")
+    args = parser.parse_args()
+
+    sources = [
+        source.strip().upper() for source in args.sources.split(',')
+        if source.strip()
+    ]
+    since_days = args.since_days
+    run_once = args.once
+
+    for source in sources:
+        if source not in DISCOVERY_SOURCES:
+            print(
+                "\nDiscovery source {} is not supported. Supported discovery sources are BIRDEYE, VYBE_NETWORK, and RAYDIUM.\n"
+                .format(source))
+            sys.exit(1)
+
+    saved_data_folder_file_path = './saved_data'
+    if not os.path.exists(saved_data_folder_file_path):
+        os.makedirs(saved_data_folder_file_path)
+
+    saved_scheduler_state_file_path = f"{saved_data_folder_file_path}/scheduler_state.json"
+
+    seen_mint_addresses = set()
+    crawl_queue = deque()
+    failed_crawl_counts = {}
+    last_crawl_datetime = ''
+
+    if os.path.exists(saved_scheduler_state_file_path):
+        scheduler_state = load_json_file(saved_scheduler_state_file_path)
+        seen_mint_addresses.update(scheduler_state['seen_mint_addresses'])
+        crawl_queue.extend(scheduler_state['queued_mint_addresses'])
+        failed_crawl_counts.update(
+            scheduler_state.get('failed_crawl_counts', {}))
+
+    print("\nDiscovery Sources: {}".format(', '.join(sources)))
+    print("No. of days ago to query the data from: {}".format(since_days))
+    print("No. of mint addresses seen: {}".format(len(seen_mint_addresses)))
+    print("Queue Depth: {}".format(len(crawl_queue)))
+
+    try:
+        run_scheduler(sources, run_once)
+    except KeyboardInterrupt:
+        print('\nStopping the scheduler...')
+
+    save_scheduler_state()
@@ -0,0 +1,282 @@
+import math
+from collections import Counter
+from datetime import datetime
+import pytz
+from utils import convert_utc_to_user_timezone
+from interning import mint_address_table
+from graph_builder import (get_node_data, get_trade_amount_in_usd,
+                           get_transaction_window)
+from config import SLIDING_WINDOW_HOURS, SLIDING_WINDOW_BUCKET_SECONDS
+
+
+class SlidingWindowGraph:
+    """
+    In-memory graph data of the summarized DEX trades of the last `window_hours`, for continuous monitoring.
+
+    The window is split into time buckets of `bucket_seconds` kept in a ring buffer. Each bucket holds the
+    volume and the number of trades of every (edge, direction, signer) added to it, and the running totals
+    of the window (edge volumes, signer trade counts per edge and per node, signer totals) are updated on
+    every insert. When the latest block time moves past a bucket's end, the bucket is expired by
+    subtracting its contributions, so a trade is added and removed once and both are O(1) amortized.
+
+    Edges are keyed by the direction of their first trade in the window, and are dropped with the last of
+    their trades, and nodes with the last trade of their tokens. Like `build_graph_data`, the nodes are
+    keyed by interned mint address IDs, the edges by (source ID, target ID) tuples, and only trades
+    between two tokens with token details are counted. The signers are kept as strings rather than
+    interned, since the shared intern tables never forget a signer and the window runs indefinitely.
+    """
+
+    def __init__(self,
+                 token_details_dict,
+                 window_hours=SLIDING_WINDOW_HOURS,
+                 bucket_seconds=SLIDING_WINDOW_BUCKET_SECONDS):
+        self.token_details_dict = token_details_dict
+        self.bucket_seconds = bucket_seconds
+        self.no_of_buckets = math.ceil(window_hours * 60 * 60 /
+                                       bucket_seconds)
+
+        # Slot i of the ring buffer holds a bucket number congruent to i, with its contributions
+        # keyed by (edge key, is forward, signer ID) and its earliest block time
+        self.buckets = [None] * self.no_of_buckets
+        self.latest_bucket_number = None
+        self.latest_block_time = None
+
+        self.nodes = {}
+        self.edges = {}
+        self.edge_signers = {}
+        self.node_signers = {}
+        self.signer_trade_counts = Counter()
+        self.signer_total_trade_amount_in_usd_dict = {}
+
+    def get_bucket_number(self, block_time):
+
+        return int(
+            datetime.strptime(block_time, "%Y-%m-%dT%H:%M:%SZ").replace(
+                tzinfo=pytz.UTC).timestamp()) // self.bucket_seconds
+
+    def add_token_details(self, token_details_dict):
+        """
+        Add the token details of new mint addresses, so that their later trades are counted.
+        """
+        self.token_details_dict.update(token_details_dict)
+
+    def get_node_id(self, mint_address):
+        """
+        :return: The mint address ID of the node of the mint address, or None if it has no token details.
+        """
+        if not self.token_details_dict.get(mint_address, {}):
+            return None
+
+        return mint_address_table.get_id(mint_address)
+
+    def add_trades(self, summarized_trades):
+        """
+        Add summarized DEX trades to the window, then expire the buckets that have left it.
+
+        Trades older than the window are dropped.
+
+        :param summarized_trades: The summarized DEX trades, in any order.
+
+        :return: The number of trades added.
+        """
+        no_of_added_trades = 0
+
+        for summarized_trade in summarized_trades:
+            if self.add_trade(summarized_trade):
+                no_of_added_trades += 1
+
+        return no_of_added_trades
+
+    def add_trade(self, summarized_trade):
+
+        block_time = summarized_trade['Block']['Time']
+        bucket_number = self.get_bucket_number(block_time)
+
+        if self.latest_bucket_number is None or bucket_number > self.latest_bucket_number:
+            self.expire(bucket_number)
+        elif bucket_number <= self.latest_bucket_number - self.no_of_buckets:
+            return False
+
+        trade_sell = summarized_trade['Trade']['Sell']
+        trade_buy = summarized_trade['Trade']['Buy']
+        sell_mint_address_id = self.get_node_id(
+            trade_sell['Currency']['MintAddress'])
+        buy_mint_address_id = self.get_node_id(
+            trade_buy['Currency']['MintAddress'])
+
+        if sell_mint_address_id is None or buy_mint_address_id is None:
+            return False
+
+        for mint_address_id, trade_side in [(sell_mint_address_id, trade_sell),
+                                            (buy_mint_address_id, trade_buy)]:
+            if mint_address_id not in self.nodes:
+                mint_address = trade_side['Currency']['MintAddress']
+                self.nodes[mint_address_id] = get_node_data(
+                    mint_address, self.token_details_dict[mint_address])
+
+        if self.latest_block_time is None or block_time > self.latest_block_time:
+            self.latest_block_time = block_time
+
+        signer = summarized_trade['Signer']
+        trade_amount_in_usd = get_trade_amount_in_usd(trade_sell, trade_buy)
+
+        if (buy_mint_address_id, sell_mint_address_id) in self.edges:
+            edge_key = (buy_mint_address_id, sell_mint_address_id)
+            is_forward = False
+        else:
+            edge_key = (sell_mint_address_id, buy_mint_address_id)
+            is_forward = True
+
+        slot = bucket_number % self.no_of_buckets
+        if self.buckets[slot] is None:
+            self.buckets[slot] = {
+                'bucket_number': bucket_number,
+                'earliest_block_time': block_time,
+                'contributions': {}
+            }
+        bucket = self.buckets[slot]
+
+        if block_time < bucket['earliest_block_time']:
+            bucket['earliest_block_time'] = block_time
+
+        contribution = bucket['contributions'].setdefault(
+            (edge_key, is_forward, signer), [0, 0])
+        contribution[0] += 1
+        contribution[1] += trade_amount_in_usd
+
+        self.update_totals(edge_key, is_forward, signer, 1,
+                           trade_amount_in_usd)
+
+        return True
+
+    def update_totals(self, edge_key, is_forward, signer, no_of_trades,
+                      trade_amount_in_usd):
+        """
+        Add (or with negative values, subtract) the contribution of a signer's trades on an edge to the window totals.
+        """
+        if edge_key not in self.edges:
+            self.edges[edge_key] = {
+                'no_of_trades': 0,
+                'trade_amount_in_usd_forward': 0,
+                'trade_amount_in_usd_reverse': 0,
+                'trade_amount_in_usd_net': 0
+            }
+            self.edge_signers[edge_key] = {
+                'forward': Counter(),
+                'reverse': Counter(),
+                'combined': Counter()
+            }
+
+        edge = self.edges[edge_key]
+        edge['no_of_trades'] += no_of_trades
+
+        if is_forward:
+            edge['trade_amount_in_usd_forward'] += trade_amount_in_usd
+            edge['trade_amount_in_usd_net'] += trade_amount_in_usd
+            direction = 'forward'
+        else:
+            edge['trade_amount_in_usd_reverse'] += trade_amount_in_usd
+            edge['trade_amount_in_usd_net'] -= trade_amount_in_usd
+            direction = 'reverse'
+
+        # The signers whose count reaches 0 are dropped, so the lengths of the counters are the unique signer counts
+        for signer_trade_counts in [
+                self.edge_signers[edge_key][direction],
+                self.edge_signers[edge_key]['combined']
+        ] + [
+                self.node_signers.setdefault(mint_address_id, Counter())
+                for mint_address_id in set(edge_key)
+        ]:
+            signer_trade_counts[signer] += no_of_trades
+            if signer_trade_counts[signer] <= 0:
+                del signer_trade_counts[signer]
+
+        for mint_address_id in edge_key:
+            if not self.node_signers.get(mint_address_id, True):
+                del self.node_signers[mint_address_id]
+                del self.nodes[mint_address_id]
+
+        self.signer_trade_counts[signer] += no_of_trades
+        if self.signer_trade_counts[signer] <= 0:
+            del self.signer_trade_counts[signer]
+            self.signer_total_trade_amount_in_usd_dict.pop(signer, None)
+        else:
+            self.signer_total_trade_amount_in_usd_dict[signer] = (
+                self.signer_total_trade_amount_in_usd_dict.get(signer, 0) +
+                trade_amount_in_usd)
+
+        if edge['no_of_trades'] <= 0:
+            del self.edges[edge_key]
+            del self.edge_signers[edge_key]
+
+    def expire(self, latest_bucket_number):
+        """
+        Move the end of the window to the bucket number and subtract the buckets that have left the window.
+        """
+        if self.latest_bucket_number is not None:
+            last_expired_bucket_number = latest_bucket_number - self.no_of_buckets
+
+            # Only the slots of the bucket numbers that have left the window since the last move can hold
+            # an expired bucket, and a jump longer than the window visits every slot once
+            for bucket_number in range(
+                    max(self.latest_bucket_number - self.no_of_buckets + 1,
+                        last_expired_bucket_number - self.no_of_buckets + 1),
+                    last_expired_bucket_number + 1):
+                slot = bucket_number % self.no_of_buckets
+                bucket = self.buckets[slot]
+
+                if bucket is None or bucket[
+                        'bucket_number'] > last_expired_bucket_number:
+                    continue
+
+                for (edge_key, is_forward, signer), (
+                        no_of_trades, trade_amount_in_usd
+                ) in bucket['contributions'].items():
+                    self.update_totals(edge_key, is_forward, signer,
+                                       -no_of_trades, -trade_amount_in_usd)
+
+                self.buckets[slot] = None
+
+        self.latest_bucket_number = latest_bucket_number
+
+    def get_graph_data(self):
+        """
+        :return: A snapshot of the graph data of the window, keyed by interned IDs like `build_graph_data`.
+        """
+        graph_data = {'nodes': {}, 'edges': {}}
+
+        for mint_address_id, node_signers in self.node_signers.items():
+            graph_data['nodes'][mint_address_id] = dict(
+                self.nodes[mint_address_id],
+                no_of_signers_combined=len(node_signers))
+
+        for edge_key, edge in self.edges.items():
+            edge_signers = self.edge_signers[edge_key]
+            graph_data['edges'][edge_key] = {
+                'trade_amount_in_usd_forward':
+                edge['trade_amount_in_usd_forward'],
+                'trade_amount_in_usd_reverse':
+                edge['trade_amount_in_usd_reverse'],
+                'trade_amount_in_usd_net': edge['trade_amount_in_usd_net'],
+                'no_of_signers_forward': len(edge_signers['forward']),
+                'no_of_signers_reverse': len(edge_signers['reverse']),
+                'no_of_signers_combined': len(edge_signers['combined'])
+            }
+
+        earliest_block_times = [
+            bucket['earliest_block_time'] for bucket in self.buckets
+            if bucket is not None
+        ]
+
+        if earliest_block_times:
+            graph_data['transaction_window'] = get_transaction_window(
+                convert_utc_to_user_timezone(min(earliest_block_times)),
+                convert_utc_to_user_timezone(self.latest_block_time))
+
+        return graph_data
+
+    def get_signer_total_trade_amount_in_usd_dict(self):
+        """
+        :return: The total USD volume traded by each signer in the window, keyed by signer.
+        """
+        return dict(self.signer_total_trade_amount_in_usd_dict)
@@ -0,0 +1,90 @@
+import json
+import codecs
+
+
+def iter_json_array_items(byte_chunks, array_key):
+    """
+    Incrementally decode the items of a JSON array from a stream of bytes.
+
+    The array is the value of the first `array_key` key found in the document, eg. the `DEXTrades` list of a
+    Bitquery response. Items are decoded one by one as the bytes arrive, so only the current item and the
+    unread part of the current chunk are held in memory. The items are expected to be JSON objects.
+
+    :param byte_chunks: An iterable of bytes, eg. `response.iter_content(...)`.
+    :param array_key: The key whose array value is decoded.
+
+    :return: A generator of the decoded array items.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(byte_chunks)
+    marker = '"{}"'.format(array_key)
+    buffer = ''
+    position = 0
+
+    def read_more():
+
+        nonlocal buffer
+
+        for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                buffer += text
+                return True
+
+        return False
+
+    def skip_whitespace():
+
+        nonlocal position
+
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or not read_more():
+                return
+
+    # Find the array key, keeping enough of the buffer to match a key split across chunks
+    while True:
+        marker_index = buffer.find(marker)
+        if marker_index != -1:
+            position = marker_index + len(marker)
+            break
+        buffer = buffer[-(len(marker) - 1):]
+        if not read_more():
+            raise ValueError('Key {} not found in the JSON stream.'.format(
+                array_key))
+
+    for expected_character in ':[':
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] != expected_character:
+            raise ValueError('The value of key {} is not an array.'.format(
+                array_key))
+        position += 1
+
+    while True:
+        skip_whitespace()
+
+        if position >= len(buffer):
+            raise ValueError('The JSON stream ended inside the array.')
+
+        if buffer[position] == ']':
+            return
+
+        if buffer[position] == ',':
+            position += 1
+            continue
+
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The item is incomplete until more of the stream is read
+            if not read_more():
+                raise
+            continue
+
+        yield item
+
+        if position > 65536:
+            buffer = buffer[position:]
+            position = 0
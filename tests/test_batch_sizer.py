@@ -0,0 +1,61 @@
+import io
+import contextlib
+from batch_sizer import AdaptiveBatchSizer
+
+
+def get_batch_sizer(tmp_path):
+
+    return AdaptiveBatchSizer(str(tmp_path / 'batch_size_stats.json'),
+                              min_batch_size=500,
+                              max_batch_size=10000,
+                              additive_increase=1000,
+                              multiplicative_decrease=0.5,
+                              target_latency=60,
+                              max_rows_per_response=25000)
+
+
+def record_quietly(batch_sizer, batch_size, latency, no_of_rows, is_failed):
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch_sizer.record(batch_size, latency, no_of_rows, is_failed)
+
+
+def test_short_tail_batch_does_not_lower_the_saved_batch_size(tmp_path):
+
+    batch_sizer = get_batch_sizer(tmp_path)
+    batch_sizer.batch_size = 4000
+
+    record_quietly(batch_sizer, 4000, 1, 100, False)
+    assert batch_sizer.stats['last_good_batch_size'] == 4000
+
+    # The remainder of the signatures, or the signatures missing from the trade cache
+    record_quietly(batch_sizer, 700, 1, 10, False)
+    assert batch_sizer.stats['last_good_batch_size'] == 4000
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch_sizer.save_stats('RUN_ID')
+
+    assert get_batch_sizer(tmp_path).get_batch_size() == 4000
+
+
+def test_empty_batch_leaves_the_batch_size_unchanged(tmp_path):
+
+    batch_sizer = get_batch_sizer(tmp_path)
+    batch_sizer.batch_size = 4000
+
+    record_quietly(batch_sizer, 4000, 1, 0, False)
+
+    assert batch_sizer.get_batch_size() == 4000
+    assert batch_sizer.no_of_empty_batches == 1
+
+
+def test_failed_batch_halves_the_batch_size(tmp_path):
+
+    batch_sizer = get_batch_sizer(tmp_path)
+    batch_sizer.batch_size = 4000
+
+    record_quietly(batch_sizer, 4000, 1, 0, True)
+
+    assert batch_sizer.get_batch_size() == 2000
+    assert batch_sizer.no_of_failed_batches == 1
+    assert batch_sizer.no_of_empty_batches == 0
@@ -0,0 +1,165 @@
+import json
+from requests.exceptions import ChunkedEncodingError
+import pytest
+import main
+from trade_cache import TradeCache
+from config import MAX_RETRIES
+
+
+def get_dex_trade(signature, index, sell_mint_address, buy_mint_address):
+
+    return {
+        'Trade': {
+            'Sell': {
+                'Currency': {
+                    'MintAddress': sell_mint_address
+                },
+                'Amount': '1',
+                'AmountInUSD': '10',
+                'PriceInUSD': 1
+            },
+            'Buy': {
+                'Currency': {
+                    'MintAddress': buy_mint_address
+                },
+                'Amount': '1',
+                'AmountInUSD': '10',
+                'PriceInUSD': 1
+            },
+            'Index': index
+        },
+        'Transaction': {
+            'Signature': signature,
+            'Signer': 'SIGNER'
+        },
+        'Block': {
+            'Time': '2024-06-01T00:00:00Z'
+        }
+    }
+
+
+DEX_TRADES_DATA = [
+    get_dex_trade('S1', 0, 'A', 'X'),
+    get_dex_trade('S1', 1, 'X', 'B'),
+    get_dex_trade('S2', 0, 'B', 'X'),
+    get_dex_trade('S2', 1, 'X', 'C')
+]
+
+
+class FakeResponse:
+    """
+    A streamed response whose body is cut after `no_of_bytes` bytes, either by a connection error or by the end of the body.
+    """
+
+    def __init__(self, no_of_bytes=None, is_connection_lost=False):
+        self.body = json.dumps(
+            {'data': {
+                'Solana': {
+                    'DEXTrades': DEX_TRADES_DATA
+                }
+            }}).encode()
+        self.no_of_bytes = len(self.body) if no_of_bytes is None else no_of_bytes
+        self.is_connection_lost = is_connection_lost
+        self.status_code = 200
+        self.url = 'https://bitquery.test'
+
+    def iter_content(self, chunk_size=None):
+
+        for position in range(0, self.no_of_bytes, 100):
+            yield self.body[position:min(position + 100, self.no_of_bytes)]
+
+        if self.is_connection_lost:
+            raise ChunkedEncodingError('Connection lost')
+
+    def close(self):
+
+        pass
+
+
+@pytest.fixture
+def fake_bitquery(monkeypatch):
+    """
+    Answer the Bitquery queries of main.py with the queued fake responses.
+    """
+    responses = []
+
+    monkeypatch.setattr(main, 'url', 'https://bitquery.test', raising=False)
+    monkeypatch.setattr(main, 'headers', {}, raising=False)
+    monkeypatch.setattr(main, 'variables', {}, raising=False)
+    monkeypatch.setattr(main.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(main.http_client, 'post',
+                        lambda *args, **kwargs: responses.pop(0))
+
+    return responses
+
+
+def get_cut_off_position():
+    """
+    :return: The position in the response body just after the first row of S2, ie. in the middle of its trades.
+    """
+    body = FakeResponse().body.decode()
+    return body.index('"S2"') + body[body.index('"S2"'):].index('}}') + 2
+
+
+def test_stream_retried_after_a_lost_connection_keeps_each_transaction_once(
+        fake_bitquery):
+
+    fake_bitquery.extend([
+        FakeResponse(get_cut_off_position(), is_connection_lost=True),
+        FakeResponse()
+    ])
+    transaction_summaries = []
+
+    summarized_trades, no_of_rows, failure, _ = main.fetch_dex_trades_batch(
+        ['S1', 'S2'], 1, 2, 2, transaction_summaries, stream=True)
+
+    assert failure is None
+    assert no_of_rows == 4
+    assert [signature
+            for signature, _, _ in transaction_summaries] == ['S1', 'S2']
+    assert [(summarized_trade['Trade']['Sell']['Currency']['MintAddress'],
+             summarized_trade['Trade']['Buy']['Currency']['MintAddress'])
+            for summarized_trade in summarized_trades] == [('A', 'B'),
+                                                           ('B', 'C')]
+
+
+def test_truncated_stream_keeps_no_transactions(fake_bitquery):
+
+    fake_bitquery.append(FakeResponse(get_cut_off_position()))
+    transaction_summaries = []
+
+    summarized_trades, no_of_rows, failure, _ = main.fetch_dex_trades_batch(
+        ['S1', 'S2'], 1, 2, 2, transaction_summaries, stream=True)
+
+    assert failure == 'NO_DATA'
+    assert (summarized_trades, no_of_rows) == ([], 0)
+    assert transaction_summaries == []
+
+
+def test_trade_cache_only_stores_completed_queries(fake_bitquery, tmp_path):
+
+    trade_cache = TradeCache(str(tmp_path / 'trade_cache.db'))
+
+    # Every attempt loses its connection after the first transaction
+    fake_bitquery.extend(
+        FakeResponse(get_cut_off_position(), is_connection_lost=True)
+        for _ in range(MAX_RETRIES))
+
+    _, _, dead_signatures, unfetched_signatures = main.fetch_dex_trades_batch_with_cache(
+        ['S1', 'S2'], 1, 2, trade_cache)
+
+    assert (dead_signatures, unfetched_signatures) == ([], ['S1', 'S2'])
+    assert trade_cache.get_many(['S1', 'S2']) == {}
+
+    fake_bitquery.append(FakeResponse())
+
+    summarized_trades, _, _, unfetched_signatures = main.fetch_dex_trades_batch_with_cache(
+        ['S1', 'S2'], 1, 2, trade_cache)
+
+    assert unfetched_signatures == []
+    assert trade_cache.get_many(['S1', 'S2']) == {
+        'S1': summarized_trades[0],
+        'S2': summarized_trades[1]
+    }
+
+    trade_cache.connection.close()
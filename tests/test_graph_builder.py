@@ -0,0 +1,106 @@
+import random
+import pytest
+from graph_builder import (build_graph_data, build_graph_data_vectorized,
+                           get_new_graph_state)
+
+MINT_ADDRESSES = ['MINT{}'.format(i) for i in range(8)]
+SIGNERS = ['SIGNER{}'.format(i) for i in range(5)]
+
+# Includes the values that make `get_trade_amount_in_usd` fall back to the next field
+AMOUNTS = ['0', '0', 'abc', '', '1.5', '100', '0.1', '2e3', '12345.6789']
+PRICES = [0, 0, 1, 0.5, 3.25]
+
+
+def get_random_dex_trade(rng):
+
+    sell_mint_address, buy_mint_address = rng.sample(MINT_ADDRESSES, 2)
+
+    return {
+        'Block': {
+            'Time':
+            '2024-06-{:02d}T{:02d}:00:00Z'.format(rng.randint(1, 28),
+                                                 rng.randint(0, 23))
+        },
+        'Trade': {
+            'Sell': {
+                'Currency': {
+                    'MintAddress': sell_mint_address
+                },
+                'Amount': rng.choice(AMOUNTS),
+                'AmountInUSD': rng.choice(AMOUNTS),
+                'PriceInUSD': rng.choice(PRICES)
+            },
+            'Buy': {
+                'Currency': {
+                    'MintAddress': buy_mint_address
+                },
+                'Amount': rng.choice(AMOUNTS),
+                'AmountInUSD': rng.choice(AMOUNTS),
+                'PriceInUSD': rng.choice(PRICES)
+            }
+        },
+        'Signer': rng.choice(SIGNERS)
+    }
+
+
+def assert_same_values_and_types(value, expected_value):
+
+    assert type(value) is type(expected_value), (value, expected_value)
+
+    if isinstance(expected_value, dict):
+        assert list(value) == list(expected_value)
+        for key in expected_value:
+            assert_same_values_and_types(value[key], expected_value[key])
+    else:
+        assert value == expected_value
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_vectorized_engine_matches_python_engine(seed):
+
+    rng = random.Random(seed)
+    combined_dex_trades_data = [
+        get_random_dex_trade(rng) for _ in range(rng.randint(1, 200))
+    ]
+
+    # Some tokens have no token details, so their trades are left out of the graph
+    token_details_dict = {
+        mint_address: {
+            'name': mint_address,
+            'symbol': mint_address
+        }
+        for mint_address in MINT_ADDRESSES[:6]
+    }
+
+    graph_state = get_new_graph_state()
+    graph_data, signer_total_trade_amount_in_usd_dict = build_graph_data(
+        combined_dex_trades_data, token_details_dict, graph_state)
+
+    vectorized_graph_state = get_new_graph_state()
+    vectorized_graph_data, vectorized_signer_total_trade_amount_in_usd_dict = build_graph_data_vectorized(
+        combined_dex_trades_data, token_details_dict, vectorized_graph_state)
+
+    assert_same_values_and_types(vectorized_graph_data, graph_data)
+    assert_same_values_and_types(
+        vectorized_signer_total_trade_amount_in_usd_dict,
+        signer_total_trade_amount_in_usd_dict)
+    assert vectorized_graph_state == graph_state
+
+
+def test_vectorized_engine_keeps_integer_zero_sums():
+
+    dex_trade = get_random_dex_trade(random.Random(0))
+    dex_trade['Trade']['Sell']['AmountInUSD'] = '10'
+    token_details_dict = {
+        mint_address: {
+            'name': mint_address
+        }
+        for mint_address in MINT_ADDRESSES
+    }
+
+    graph_data, _ = build_graph_data_vectorized([dex_trade],
+                                                token_details_dict)
+
+    edge = next(iter(graph_data['edges'].values()))
+    assert edge['trade_amount_in_usd_forward'] == 10.0
+    assert type(edge['trade_amount_in_usd_reverse']) is int
@@ -0,0 +1,397 @@
+import json
+import time
+import threading
+import contextlib
+from functools import partial
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import pytest
+from websockets.sync.server import serve
+import main
+from bitquery_stream import BitquerySubscription
+from sliding_window_graph import SlidingWindowGraph
+from interning import mint_address_table
+from config import EXCLUDED_MINT_ADDRESSES
+
+
+def get_utc_str(seconds_ago):
+
+    return (datetime.now(timezone.utc) -
+            timedelta(seconds=seconds_ago)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def get_dex_trade(signature,
+                  sell_mint_address,
+                  buy_mint_address,
+                  signer='SIGNER',
+                  block_time=None,
+                  index=0,
+                  amount_in_usd='10'):
+
+    return {
+        'Trade': {
+            'Sell': {
+                'Currency': {
+                    'MintAddress': sell_mint_address
+                },
+                'Amount': '1',
+                'AmountInUSD': amount_in_usd,
+                'PriceInUSD': 1
+            },
+            'Buy': {
+                'Currency': {
+                    'MintAddress': buy_mint_address
+                },
+                'Amount': '1',
+                'AmountInUSD': amount_in_usd,
+                'PriceInUSD': 1
+            },
+            'Index': index
+        },
+        'Transaction': {
+            'Signature': signature,
+            'Signer': signer
+        },
+        'Block': {
+            'Time': block_time or get_utc_str(60)
+        }
+    }
+
+
+def get_next_message(dex_trades_data):
+
+    return json.dumps({
+        'id': '1',
+        'type': 'next',
+        'payload': {
+            'data': {
+                'Solana': {
+                    'DEXTrades': dex_trades_data
+                }
+            }
+        }
+    })
+
+
+def accept_subscription(websocket):
+    """
+    Answer the connection_init and subscribe messages of the graphql-transport-ws protocol.
+    """
+    assert json.loads(websocket.recv())['type'] == 'connection_init'
+    websocket.send(json.dumps({'type': 'connection_ack'}))
+
+    message = json.loads(websocket.recv())
+    assert message['type'] == 'subscribe'
+
+    return message
+
+
+def wait_until_closed(websocket):
+
+    with contextlib.suppress(Exception):
+        while True:
+            websocket.recv()
+
+
+@contextlib.contextmanager
+def mock_server(handler):
+    """
+    Run a local graphql-transport-ws server, and yield its URL.
+    """
+    server = serve(handler,
+                   'localhost',
+                   0,
+                   subprotocols=['graphql-transport-ws'])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        yield 'ws://localhost:{}'.format(server.socket.getsockname()[1])
+    finally:
+        server.shutdown()
+
+
+@contextlib.contextmanager
+def running_subscription(server_url, **kwargs):
+
+    subscription = BitquerySubscription(server_url, {},
+                                        'subscription { Solana }', **kwargs)
+    subscription.start()
+
+    try:
+        yield subscription
+    finally:
+        subscription.stop()
+
+
+def get_events(subscription, no_of_events, timeout=5):
+
+    events = []
+    deadline = time.time() + timeout
+
+    while len(events) < no_of_events and time.time() < deadline:
+        event = subscription.get_event(timeout=0.1)
+        if event is not None:
+            events.append(event)
+
+    return events
+
+
+def test_subscription_receives_data_and_answers_pings():
+
+    messages = []
+
+    def handler(websocket):
+        messages.append(accept_subscription(websocket))
+        websocket.send(json.dumps({'type': 'ping'}))
+        messages.append(json.loads(websocket.recv()))
+        websocket.send(get_next_message([get_dex_trade('S1', 'A', 'B')]))
+        wait_until_closed(websocket)
+
+    with mock_server(handler) as server_url, running_subscription(
+            server_url, retry_after=0.05) as subscription:
+        events = get_events(subscription, 1)
+
+    assert messages[0]['payload']['query'] == 'subscription { Solana }'
+    assert messages[1] == {'type': 'pong'}
+    assert [event_type for event_type, _ in events] == ['DATA']
+    assert events[0][1][0]['Transaction']['Signature'] == 'S1'
+
+
+def test_subscription_reconnects_after_complete_and_error():
+
+    connections = []
+
+    def handler(websocket):
+        connections.append(websocket)
+        accept_subscription(websocket)
+
+        if len(connections) == 1:
+            websocket.send(json.dumps({'id': '1', 'type': 'complete'}))
+        elif len(connections) == 2:
+            websocket.send(
+                json.dumps({
+                    'id': '1',
+                    'type': 'error',
+                    'payload': [{
+                        'message': 'boom'
+                    }]
+                }))
+        else:
+            websocket.send(get_next_message([get_dex_trade('S1', 'A', 'B')]))
+
+        wait_until_closed(websocket)
+
+    with mock_server(handler) as server_url, running_subscription(
+            server_url, max_retries=3, retry_after=0.05) as subscription:
+        events = get_events(subscription, 3)
+
+    assert [event_type for event_type, _ in events
+            ] == ['RECONNECTED', 'RECONNECTED', 'DATA']
+
+
+def test_subscription_stops_after_max_retries():
+
+    def handler(websocket):
+        websocket.recv()
+        websocket.send(json.dumps({'type': 'connection_error'}))
+
+    with mock_server(handler) as server_url, running_subscription(
+            server_url, max_retries=2, retry_after=0.05) as subscription:
+        events = get_events(subscription, 1)
+
+    assert events == [('STOPPED', None)]
+
+
+def test_subscription_reports_dropped_data_when_the_buffer_is_full():
+
+    def handler(websocket):
+        accept_subscription(websocket)
+        for i in range(3):
+            websocket.send(
+                get_next_message([get_dex_trade('S{}'.format(i), 'A', 'B')]))
+        wait_until_closed(websocket)
+
+    with mock_server(handler) as server_url, running_subscription(
+            server_url, buffer_size=1) as subscription:
+        deadline = time.time() + 5
+        while not subscription.data_dropped_event.is_set(
+        ) and time.time() < deadline:
+            time.sleep(0.05)
+
+        assert subscription.pop_is_data_dropped()
+        assert not subscription.pop_is_data_dropped()
+        assert subscription.get_event(timeout=1)[0] == 'DATA'
+        assert subscription.get_event(timeout=0.1) is None
+
+
+@pytest.fixture
+def live_globals(monkeypatch, tmp_path):
+    """
+    Set the globals of main.py that LIVE mode uses, which are otherwise set when it runs as a script.
+    """
+    monkeypatch.setattr(main, 'seen_signatures', OrderedDict(), raising=False)
+    monkeypatch.setattr(main,
+                        'looked_up_mint_addresses',
+                        set(),
+                        raising=False)
+    monkeypatch.setattr(main, 'headers', {}, raising=False)
+    monkeypatch.setattr(main,
+                        'saved_data_folder_file_path',
+                        str(tmp_path),
+                        raising=False)
+    monkeypatch.setattr(main, 'current_datetime', 'test', raising=False)
+    monkeypatch.setattr(
+        main, 'get_token_details_dict', lambda mint_addresses: {
+            mint_address: {
+                'name': mint_address,
+                'symbol': mint_address
+            }
+            for mint_address in mint_addresses
+        })
+
+
+def get_edge_volumes(sliding_window_graph):
+
+    return {
+        tuple(mint_address_table.get_values(edge_key)):
+        edge['trade_amount_in_usd_net']
+        for edge_key, edge in sliding_window_graph.edges.items()
+    }
+
+
+def test_add_live_dex_trades_drops_duplicates_mev_and_excluded_trades(
+        live_globals):
+
+    sliding_window_graph = SlidingWindowGraph({})
+    block_time = get_utc_str(60)
+
+    latest_block_time = main.add_live_dex_trades([
+        get_dex_trade('S1', 'A', 'X', block_time=block_time, index=0),
+        get_dex_trade('S1', 'X', 'B', block_time=block_time, index=1),
+        get_dex_trade('S2', 'A', 'X', block_time=block_time, index=0),
+        get_dex_trade('S2', 'X', 'A', block_time=block_time, index=1),
+        get_dex_trade('S3', 'A', EXCLUDED_MINT_ADDRESSES[0],
+                      block_time=block_time)
+    ], sliding_window_graph, None)
+
+    assert latest_block_time == block_time
+    assert get_edge_volumes(sliding_window_graph) == {('A', 'B'): 10}
+
+    # S1 arrives again, eg. from an overlapping backfill
+    main.add_live_dex_trades([
+        get_dex_trade('S1', 'A', 'B', block_time=block_time),
+        get_dex_trade('S4', 'B', 'C', block_time=block_time)
+    ], sliding_window_graph, latest_block_time)
+
+    assert get_edge_volumes(sliding_window_graph) == {
+        ('A', 'B'): 10,
+        ('B', 'C'): 10
+    }
+    assert list(main.seen_signatures) == ['S1', 'S2', 'S3', 'S4']
+
+
+def test_watch_live_dex_trades_backfills_the_gap_after_a_reconnection(
+        live_globals, monkeypatch):
+
+    first_block_time = get_utc_str(120)
+    second_block_time = get_utc_str(60)
+    connections = []
+
+    def handler(websocket):
+        connections.append(websocket)
+
+        if len(connections) > 2:
+            websocket.recv()
+            websocket.send(json.dumps({'type': 'connection_error'}))
+            return
+
+        accept_subscription(websocket)
+        block_time = first_block_time if len(
+            connections) == 1 else second_block_time
+        websocket.send(
+            get_next_message([
+                get_dex_trade('S{}'.format(len(connections)),
+                              'A',
+                              'B',
+                              block_time=block_time)
+            ]))
+
+    backfill_since_utc_strs = []
+
+    def bitquery_api_call(payload, return_status=False):
+        backfill_since_utc_strs.append(
+            payload['query'].split('since: "')[1].split('"')[0])
+        return [], None
+
+    with mock_server(handler) as server_url:
+        monkeypatch.setattr(main, 'url', server_url, raising=False)
+        monkeypatch.setattr(main, 'bitqueryAPICall', bitquery_api_call)
+        monkeypatch.setattr(
+            main, 'BitquerySubscription',
+            partial(BitquerySubscription, max_retries=2, retry_after=0.05))
+
+        sliding_window_graph = SlidingWindowGraph({})
+        window_start_utc_str = get_utc_str(6 * 60 * 60)
+        main.watch_live_dex_trades(['A'], sliding_window_graph,
+                                   window_start_utc_str)
+
+    assert backfill_since_utc_strs == [window_start_utc_str, first_block_time]
+    assert get_edge_volumes(sliding_window_graph) == {('A', 'B'): 20}
+
+
+def test_backfill_live_dex_trades_pages_without_splitting_transactions(
+        live_globals, monkeypatch):
+
+    block_times = ['2024-06-01T00:00:0{}Z'.format(i) for i in [0, 0, 1, 1, 1, 1, 2]]
+    dex_trades_data = []
+    for i, block_time in enumerate(block_times):
+        for index in range(2):
+            dex_trades_data.append(
+                get_dex_trade('S{}'.format(i),
+                              'A',
+                              'B',
+                              block_time=block_time,
+                              index=index))
+
+    def bitquery_api_call(payload, return_status=False):
+        query = payload['query']
+        since_utc_str = query.split('since: "')[1].split('"')[0]
+        page_size = int(query.split('count: ')[1].split(',')[0])
+        offset = int(query.split('offset: ')[1].split('}')[0])
+        page = [
+            dex_trade for dex_trade in dex_trades_data
+            if dex_trade['Block']['Time'] >= since_utc_str
+        ][offset:offset + page_size]
+        return page, None
+
+    added_signatures = []
+
+    def process_dex_trades_data(dex_trades_data):
+        added_signatures.extend(dex_trade['Transaction']['Signature']
+                                for dex_trade in dex_trades_data)
+        return [], len(dex_trades_data)
+
+    monkeypatch.setattr(main, 'bitqueryAPICall', bitquery_api_call)
+    monkeypatch.setattr(main, 'process_dex_trades_data',
+                        process_dex_trades_data)
+
+    latest_block_time, is_completed = main.backfill_live_dex_trades(
+        ['A'], SlidingWindowGraph({}), block_times[0], None, page_size=3)
+
+    assert is_completed
+    assert latest_block_time == block_times[-1]
+    assert sorted(added_signatures) == sorted(
+        dex_trade['Transaction']['Signature']
+        for dex_trade in dex_trades_data)
+
+
+def test_backfill_live_dex_trades_reports_a_failed_page(
+        live_globals, monkeypatch):
+
+    monkeypatch.setattr(main, 'bitqueryAPICall',
+                        lambda payload, return_status=False:
+                        ([], 'MAX_RETRIES'))
+
+    assert main.backfill_live_dex_trades(['A'], SlidingWindowGraph({}),
+                                         get_utc_str(60),
+                                         None) == (None, False)
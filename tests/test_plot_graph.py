@@ -0,0 +1,112 @@
+import io
+import contextlib
+from plot_graph import (get_top_k_edge_indices, prune_plot_edges,
+                        collapse_leaf_edges)
+
+
+def get_plot_edge(source, target, weight_forward, weight_reverse=0):
+
+    return (source, target, {
+        'weight_forward': weight_forward,
+        'weight_reverse': weight_reverse,
+        'weight_net': weight_forward - weight_reverse,
+        'no_of_signers_forward': 1,
+        'no_of_signers_reverse': 1 if weight_reverse else 0,
+        'no_of_signers_combined': 1
+    })
+
+
+def get_nodes(nodes):
+
+    return {
+        node: {
+            'mint_address': 'MINT{}'.format(node),
+            'name': 'Token {}'.format(node),
+            'symbol': 'T{}'.format(node),
+            'fdv': 10,
+            'website': '',
+            'telegram': '',
+            'twitter': '',
+            'no_of_signers_combined': 1
+        }
+        for node in nodes
+    }
+
+
+def prune_quietly(plot_edges, top_k=0, max_edges=0):
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return prune_plot_edges(plot_edges, top_k, max_edges)
+
+
+def test_top_k_keeps_only_the_top_edges_of_a_hub():
+
+    # A hub with 1000 leaves, ie. the shape of the SOL and USDC graphs
+    star_edges = [get_plot_edge(0, leaf, leaf) for leaf in range(1, 1001)]
+
+    kept_edges, dropped_edges = prune_quietly(star_edges, top_k=5)
+
+    assert sorted(target for _, target, _ in kept_edges) == list(
+        range(996, 1001))
+    assert len(dropped_edges) == 995
+
+
+def test_top_k_ranks_an_edge_by_its_higher_degree_endpoint():
+
+    # The edge between the hubs is in the top 2 of hub 0 but not of hub 1,
+    # which has more edges
+    plot_edges = [get_plot_edge(0, 1, 15)]
+    plot_edges += [get_plot_edge(0, leaf, leaf) for leaf in [10, 11, 12]]
+    plot_edges += [get_plot_edge(1, leaf, leaf) for leaf in [20, 21, 22, 23]]
+
+    kept_edges = [plot_edges[i] for i in get_top_k_edge_indices(plot_edges, 2)]
+
+    assert sorted((source, target) for source, target, _ in kept_edges) == [
+        (0, 11), (0, 12), (1, 22), (1, 23)
+    ]
+
+
+def test_top_k_keeps_an_isolated_pair():
+
+    plot_edges = [get_plot_edge(0, 1, 10), get_plot_edge(2, 3, 1)]
+
+    assert get_top_k_edge_indices(plot_edges, 1) == {0, 1}
+
+
+def test_collapse_leaf_edges_of_a_pruned_hub():
+
+    star_edges = [get_plot_edge(0, leaf, 100) for leaf in range(1, 6)]
+    star_edges += [get_plot_edge(leaf, 0, 30, 10) for leaf in range(6, 11)]
+    star_edges += [get_plot_edge(0, leaf, 1) for leaf in range(11, 21)]
+    nodes = get_nodes(range(21))
+
+    kept_edges, dropped_edges = prune_quietly(star_edges, top_k=5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        other_edges, other_nodes = collapse_leaf_edges(kept_edges,
+                                                       dropped_edges, nodes)
+
+    assert len(kept_edges) == 5
+    assert list(other_nodes) == [('OTHER', 0)]
+    assert other_nodes[('OTHER', 0)]['symbol'] == '15 Tokens'
+    assert other_nodes[('OTHER', 0)]['fdv'] == 150
+
+    # Into the hub: 5 x 30, out of the hub: 5 x 10 back and 10 x 1
+    assert other_edges == [(('OTHER', 0), 0, {
+        'weight_forward': 5 * 30,
+        'weight_reverse': 5 * 10 + 10 * 1,
+        'weight_net': 90,
+        'no_of_signers_forward': 5,
+        'no_of_signers_reverse': 5 + 10,
+        'no_of_signers_combined': 15
+    })]
+
+
+def test_edge_budget_keeps_the_highest_volume_edges():
+
+    plot_edges = [get_plot_edge(i, i + 1, i) for i in range(1, 101)]
+
+    kept_edges, dropped_edges = prune_quietly(plot_edges, max_edges=10)
+
+    assert sorted(attributes['weight_net']
+                  for _, _, attributes in kept_edges) == list(range(91, 101))
+    assert len(dropped_edges) == 90
@@ -0,0 +1,75 @@
+import io
+import contextlib
+from collections import deque
+import pytest
+import scheduler
+from config import (SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL,
+                    SCHEDULER_MAX_CRAWL_RETRIES)
+
+
+@pytest.fixture
+def scheduler_globals(monkeypatch, tmp_path):
+    """
+    Set the globals of scheduler.py, which are otherwise set when it runs as a script, and record the crawls instead of running them.
+    """
+    crawls = []
+
+    def run_crawl(mint_addresses):
+        crawls.append(list(mint_addresses))
+        return None if mint_addresses[0] == 'FAILING' else 'RUN_ID'
+
+    monkeypatch.setattr(scheduler, 'crawl_queue', deque(), raising=False)
+    monkeypatch.setattr(scheduler,
+                        'seen_mint_addresses',
+                        set(),
+                        raising=False)
+    monkeypatch.setattr(scheduler,
+                        'failed_crawl_counts', {},
+                        raising=False)
+    monkeypatch.setattr(scheduler,
+                        'saved_scheduler_state_file_path',
+                        str(tmp_path / 'scheduler_state.json'),
+                        raising=False)
+    monkeypatch.setattr(scheduler, 'discover_mint_addresses',
+                        lambda source: [])
+    monkeypatch.setattr(scheduler, 'run_crawl', run_crawl)
+
+    return crawls
+
+
+def run_cycle():
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.run_scheduler(['RAYDIUM'], run_once=True)
+
+
+@pytest.mark.parametrize('no_of_queued_mint_addresses', [
+    1, SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL,
+    3 * SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL + 1
+])
+def test_crawl_takes_a_full_batch_from_the_queue(scheduler_globals,
+                                                  no_of_queued_mint_addresses):
+
+    scheduler.crawl_queue.extend('MINT{}'.format(i)
+                                 for i in range(no_of_queued_mint_addresses))
+
+    run_cycle()
+
+    assert len(scheduler_globals) == 1
+    assert len(scheduler_globals[0]) == min(
+        no_of_queued_mint_addresses, SCHEDULER_MAX_MINT_ADDRESSES_PER_CRAWL)
+    assert len(scheduler.crawl_queue) == no_of_queued_mint_addresses - len(
+        scheduler_globals[0])
+
+
+def test_failed_crawl_is_requeued_until_the_retry_limit(scheduler_globals):
+
+    scheduler.crawl_queue.extend(['FAILING', 'MINT0'])
+
+    for _ in range(SCHEDULER_MAX_CRAWL_RETRIES + 1):
+        run_cycle()
+
+    assert scheduler_globals == [['FAILING', 'MINT0']
+                                 ] * (SCHEDULER_MAX_CRAWL_RETRIES + 1)
+    assert not scheduler.crawl_queue
+    assert scheduler.failed_crawl_counts == {}
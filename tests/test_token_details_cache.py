@@ -0,0 +1,50 @@
+from token_details_cache import TokenDetailsCache
+
+TOKEN_DETAILS = {
+    'name': 'Token A',
+    'symbol': 'A',
+    'info': {
+        'websites': []
+    },
+    'fdv': 1000
+}
+
+
+def test_token_is_queried_again_once_its_volatile_fields_are_stale(tmp_path):
+
+    token_details_cache = TokenDetailsCache(str(tmp_path /
+                                                'token_details_cache.json'),
+                                            volatile_ttl_hours=1)
+    token_details_cache.update({'A': TOKEN_DETAILS}, ['B'])
+
+    assert token_details_cache.get_stale_mint_addresses(['A', 'B',
+                                                         'C']) == ['C']
+    assert token_details_cache.get_many(['A', 'B']) == {'A': TOKEN_DETAILS}
+
+    for entry in token_details_cache.entries.values():
+        entry['volatile_cached_at'] -= 2 * 60 * 60
+
+    assert token_details_cache.get_stale_mint_addresses(['A', 'B']) == [
+        'A', 'B'
+    ]
+
+    # The refresh failed, so only the static fields are served
+    assert token_details_cache.get_many(['A']) == {
+        'A': {
+            'name': 'Token A',
+            'symbol': 'A',
+            'info': {
+                'websites': []
+            }
+        }
+    }
+
+
+def test_token_details_cache_is_saved_and_loaded(tmp_path):
+
+    file_path = str(tmp_path / 'token_details_cache.json')
+    token_details_cache = TokenDetailsCache(file_path)
+    token_details_cache.update({'A': TOKEN_DETAILS})
+    token_details_cache.save()
+
+    assert TokenDetailsCache(file_path).get_many(['A']) == {'A': TOKEN_DETAILS}
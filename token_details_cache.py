@@ -0,0 +1,121 @@
+import os
+import time
+from collections import OrderedDict
+from utils import load_json_file, save_json_file
+from config import (TOKEN_DETAILS_VOLATILE_TTL_HOURS,
+                    TOKEN_DETAILS_CACHE_MAX_ENTRIES)
+
+STATIC_TOKEN_DETAILS_FIELDS = ['chainId', 'dexId', 'name', 'symbol', 'info']
+VOLATILE_TOKEN_DETAILS_FIELDS = ['volume', 'priceChange', 'liquidity', 'fdv']
+
+
+class TokenDetailsCache:
+    """
+    On-disk LRU cache of the Dexscreener token details, keyed by mint address.
+
+    Dexscreener only returns the static fields (name, symbol, info/socials) together with the volatile
+    fields (fdv, liquidity, volume, priceChange) of a token, so a token is queried again once its volatile
+    fields expire. While a refresh is failing, the static fields are still served without the volatile
+    ones. Mint addresses that Dexscreener has no pairs for are remembered for the volatile TTL. The least
+    recently used tokens are evicted above `max_entries`.
+    """
+
+    def __init__(self,
+                 file_path,
+                 volatile_ttl_hours=TOKEN_DETAILS_VOLATILE_TTL_HOURS,
+                 max_entries=TOKEN_DETAILS_CACHE_MAX_ENTRIES):
+        self.file_path = file_path
+        self.volatile_ttl = volatile_ttl_hours * 60 * 60
+        self.max_entries = max_entries
+
+        # Ordered from the least to the most recently used
+        self.entries = OrderedDict()
+        if os.path.exists(file_path):
+            self.entries.update(load_json_file(file_path))
+
+    def is_volatile_fresh(self, entry, now):
+
+        return now - entry.get('volatile_cached_at', 0) < self.volatile_ttl
+
+    def get_stale_mint_addresses(self, mint_addresses):
+        """
+        :return: The list of mint addresses that are missing from the cache or whose volatile fields are stale.
+        """
+        now = time.time()
+        stale_mint_addresses = []
+
+        for mint_address in mint_addresses:
+            entry = self.entries.get(mint_address)
+
+            if entry is None or not self.is_volatile_fresh(entry, now):
+                stale_mint_addresses.append(mint_address)
+
+        return stale_mint_addresses
+
+    def update(self, token_details_dict, not_found_mint_addresses=()):
+        """
+        Store newly queried token details.
+
+        :param token_details_dict: The token details returned by `dexscreener.get_token_details`, keyed by mint address.
+        :param not_found_mint_addresses: The mint addresses queried that no token details were found for.
+        """
+        now = time.time()
+
+        for mint_address in not_found_mint_addresses:
+            self.put(mint_address, {
+                'not_found': True,
+                'volatile_cached_at': now
+            })
+
+        for mint_address, token_details in token_details_dict.items():
+            self.put(
+                mint_address, {
+                    'static': {
+                        field: token_details[field]
+                        for field in STATIC_TOKEN_DETAILS_FIELDS
+                        if field in token_details
+                    },
+                    'volatile': {
+                        field: token_details[field]
+                        for field in VOLATILE_TOKEN_DETAILS_FIELDS
+                        if field in token_details
+                    },
+                    'volatile_cached_at': now
+                })
+
+    def put(self, mint_address, entry):
+
+        self.entries[mint_address] = entry
+        self.entries.move_to_end(mint_address)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_many(self, mint_addresses):
+        """
+        Look up the token details of the mint addresses, leaving out the volatile fields once they are stale.
+
+        :return: A dictionary of the token details found, keyed by mint address, in the format returned by `dexscreener.get_token_details`.
+        """
+        now = time.time()
+        token_details_dict = {}
+
+        for mint_address in mint_addresses:
+            entry = self.entries.get(mint_address)
+
+            if entry is None or entry.get('not_found'):
+                continue
+
+            self.entries.move_to_end(mint_address)
+
+            token_details = dict(entry['static'])
+            if self.is_volatile_fresh(entry, now):
+                token_details.update(entry['volatile'])
+
+            token_details_dict[mint_address] = token_details
+
+        return token_details_dict
+
+    def save(self):
+
+        save_json_file(self.file_path, self.entries)
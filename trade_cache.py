@@ -0,0 +1,134 @@
+import json
+import time
+import sqlite3
+import threading
+from config import TRADE_CACHE_MAX_ENTRIES, TRADE_CACHE_MAX_AGE_DAYS
+
+# SQLite limits the number of parameters of a statement
+SQLITE_MAX_NO_OF_PARAMETERS = 500
+
+
+class TradeCache:
+    """
+    Persistent signature -> summarized trade cache shared by every run.
+
+    The DEX trades of a transaction never change once it is confirmed, so a signature summarized by
+    one run does not need to be queried from Bitquery again by the next. Every summarized transaction
+    is cached with its outcome ('TRADE', 'MEV' or 'EXCLUDED'), so that MEV and excluded transactions
+    are not queried again either. Entries older than `max_age_days` are ignored and pruned, and the
+    oldest entries are evicted above `max_entries`.
+    """
+
+    def __init__(self,
+                 file_path,
+                 max_entries=TRADE_CACHE_MAX_ENTRIES,
+                 max_age_days=TRADE_CACHE_MAX_AGE_DAYS):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.lock = threading.Lock()
+        self.no_of_hits = 0
+        self.no_of_misses = 0
+
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS summarized_trades (
+                signature TEXT PRIMARY KEY,
+                outcome TEXT NOT NULL,
+                summarized_trade TEXT NOT NULL,
+                cached_at REAL NOT NULL
+            )''')
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS summarized_trades_cached_at ON summarized_trades (cached_at)'
+        )
+        self.connection.commit()
+
+    def get_many(self, signatures):
+        """
+        Look up the summarized trades of the signatures.
+
+        :param signatures: The transaction signatures to look up.
+
+        :return: A dictionary that maps each cached signature to its summarized trade, whatever its outcome.
+        """
+        min_cached_at = time.time() - self.max_age
+        summarized_trades = {}
+
+        with self.lock:
+            for i in range(0, len(signatures), SQLITE_MAX_NO_OF_PARAMETERS):
+                signatures_chunk = signatures[i:i +
+                                              SQLITE_MAX_NO_OF_PARAMETERS]
+                rows = self.connection.execute(
+                    'SELECT signature, summarized_trade FROM summarized_trades WHERE cached_at >= ? AND signature IN ({})'
+                    .format(','.join('?' * len(signatures_chunk))),
+                    [min_cached_at] + list(signatures_chunk))
+
+                for signature, summarized_trade in rows:
+                    summarized_trades[signature] = json.loads(summarized_trade)
+
+            self.no_of_hits += len(summarized_trades)
+            self.no_of_misses += len(signatures) - len(summarized_trades)
+
+        return summarized_trades
+
+    def put_many(self, transaction_summaries):
+        """
+        Cache the summarized trades of newly queried transactions.
+
+        :param transaction_summaries: A list of (signature, summarized trade, outcome) tuples.
+        """
+        if not transaction_summaries:
+            return
+
+        cached_at = time.time()
+
+        with self.lock:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO summarized_trades VALUES (?, ?, ?, ?)',
+                [(signature, outcome,
+                  json.dumps(summarized_trade,
+                             separators=(',', ':'),
+                             ensure_ascii=False), cached_at)
+                 for signature, summarized_trade, outcome in
+                 transaction_summaries])
+            self.connection.commit()
+
+    def prune(self):
+        """
+        Delete the entries older than the maximum age, then the oldest entries above the maximum number of entries.
+
+        :return: The number of entries left.
+        """
+        with self.lock:
+            self.connection.execute(
+                'DELETE FROM summarized_trades WHERE cached_at < ?',
+                (time.time() - self.max_age, ))
+
+            no_of_entries = self.connection.execute(
+                'SELECT COUNT(*) FROM summarized_trades').fetchone()[0]
+
+            if no_of_entries > self.max_entries:
+                self.connection.execute(
+                    'DELETE FROM summarized_trades WHERE signature IN (SELECT signature FROM summarized_trades ORDER BY cached_at LIMIT ?)',
+                    (no_of_entries - self.max_entries, ))
+                no_of_entries = self.max_entries
+
+            self.connection.commit()
+
+        return no_of_entries
+
+    def close(self):
+
+        no_of_entries = self.prune()
+
+        with self.lock:
+            self.connection.close()
+
+        no_of_lookups = self.no_of_hits + self.no_of_misses
+        print(
+            '\nTrade cache: {} hits, {} misses ({:.2f}% hit rate), {} cached signatures'
+            .format(self.no_of_hits, self.no_of_misses,
+                    100 * self.no_of_hits / no_of_lookups if no_of_lookups else 0,
+                    no_of_entries))
@@ -0,0 +1,189 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from utils import load_json_file, save_json_file
+
+# Each string column is dictionary-encoded: the store keeps an int32 code per trade and the unique values
+# once. Columns of the same kind share a dictionary, so a mint address traded on both sides is stored once.
+TRADE_STORE_DICTIONARIES = {
+    'block_time': 'block_time',
+    'sell_mint_address': 'mint_address',
+    'sell_name': 'name',
+    'sell_symbol': 'symbol',
+    'sell_amount': 'amount',
+    'sell_amount_in_usd': 'amount_in_usd',
+    'buy_mint_address': 'mint_address',
+    'buy_name': 'name',
+    'buy_symbol': 'symbol',
+    'buy_amount': 'amount',
+    'buy_amount_in_usd': 'amount_in_usd',
+    'signer': 'signer'
+}
+TRADE_STORE_FLOAT_COLUMNS = ['sell_price_in_usd', 'buy_price_in_usd']
+TRADE_STORE_COLUMNS = list(
+    TRADE_STORE_DICTIONARIES) + TRADE_STORE_FLOAT_COLUMNS
+
+
+def is_trade_store_file(file_path):
+
+    return os.path.splitext(file_path)[1] == '.npz'
+
+
+def get_trade_store_columns(summarized_trades):
+
+    columns = {column: [] for column in TRADE_STORE_COLUMNS}
+
+    for summarized_trade in summarized_trades:
+        columns['block_time'].append(summarized_trade['Block']['Time'])
+        columns['signer'].append(summarized_trade['Signer'])
+
+        for side, trade_side in [('sell', summarized_trade['Trade']['Sell']),
+                                 ('buy', summarized_trade['Trade']['Buy'])]:
+            columns[side + '_mint_address'].append(
+                trade_side['Currency']['MintAddress'])
+            columns[side + '_name'].append(trade_side['Currency']['Name'])
+            columns[side + '_symbol'].append(trade_side['Currency']['Symbol'])
+            columns[side + '_amount'].append(trade_side['Amount'])
+            columns[side + '_amount_in_usd'].append(trade_side['AmountInUSD'])
+            columns[side + '_price_in_usd'].append(trade_side['PriceInUSD'])
+
+    return columns
+
+
+def save_trades(file_path, summarized_trades):
+    """
+    Save the summarized DEX trades, as a columnar trade store if the file path ends with .npz or as a JSON list otherwise.
+
+    :param file_path: The path to the trades file.
+    :param summarized_trades: The list of summarized DEX trades.
+    """
+    if not is_trade_store_file(file_path):
+        save_json_file(file_path, summarized_trades)
+        return
+
+    columns = get_trade_store_columns(summarized_trades)
+    no_of_trades = len(summarized_trades)
+    arrays = {}
+
+    for dictionary in dict.fromkeys(TRADE_STORE_DICTIONARIES.values()):
+        dictionary_columns = [
+            column for column, column_dictionary in
+            TRADE_STORE_DICTIONARIES.items() if column_dictionary == dictionary
+        ]
+
+        # Missing values get the code -1
+        codes, values = pd.factorize(
+            np.concatenate([
+                np.array(columns[column], dtype=object)
+                for column in dictionary_columns
+            ]))
+        arrays[dictionary + '_values'] = np.array(values, dtype=str)
+
+        for i, column in enumerate(dictionary_columns):
+            arrays[column + '_codes'] = codes[i * no_of_trades:(i + 1) *
+                                              no_of_trades].astype(np.int32)
+
+    for column in TRADE_STORE_FLOAT_COLUMNS:
+        arrays[column] = np.array(columns[column], dtype=float)
+
+    np.savez_compressed(file_path, **arrays)
+
+
+def load_trade_store_columns(file_path, columns=None):
+    """
+    Load and decode the columns of a columnar trade store.
+
+    Only the requested columns are read and decompressed from the file.
+
+    :param file_path: The path to the .npz trade store.
+    :param columns: The columns to load, from `TRADE_STORE_COLUMNS`. All of them by default.
+
+    :return: A dictionary of the column arrays, keyed by column name.
+    """
+    dictionary_values = {}
+    trade_store_columns = {}
+
+    if not os.path.exists(file_path):
+        print("\nThe file not found or is invalid.\n")
+        sys.exit(1)
+
+    with np.load(file_path) as store:
+        for column in columns or TRADE_STORE_COLUMNS:
+            if column in TRADE_STORE_FLOAT_COLUMNS:
+                trade_store_columns[column] = store[column]
+                continue
+
+            dictionary = TRADE_STORE_DICTIONARIES[column]
+            if dictionary not in dictionary_values:
+                dictionary_values[dictionary] = store[dictionary +
+                                                      '_values'].astype(object)
+
+            values = dictionary_values[dictionary]
+            codes = store[column + '_codes']
+
+            if len(values):
+                column_values = values.take(np.maximum(codes, 0))
+                column_values[codes < 0] = None
+            else:
+                column_values = np.full(len(codes), None, dtype=object)
+
+            trade_store_columns[column] = column_values
+
+    return trade_store_columns
+
+
+def load_trades_frame(file_path, columns=None):
+    """
+    Load the columns of a columnar trade store into a flat data frame, eg. to project only the columns used by the graph build.
+
+    :return: A data frame with one row per summarized DEX trade.
+    """
+    return pd.DataFrame(load_trade_store_columns(file_path, columns))
+
+
+def load_trades(file_path):
+    """
+    Load the summarized DEX trades from a columnar trade store or a JSON list.
+
+    :param file_path: The path to the trades file.
+
+    :return: The list of summarized DEX trades.
+    """
+    if not is_trade_store_file(file_path):
+        return load_json_file(file_path)
+
+    trade_store_columns = load_trade_store_columns(file_path)
+
+    return [{
+        'Block': {
+            'Time': block_time
+        },
+        'Trade': {
+            'Sell': {
+                'Amount': sell_amount,
+                'AmountInUSD': sell_amount_in_usd,
+                'Currency': {
+                    'MintAddress': sell_mint_address,
+                    'Name': sell_name,
+                    'Symbol': sell_symbol
+                },
+                'PriceInUSD': sell_price_in_usd
+            },
+            'Buy': {
+                'Amount': buy_amount,
+                'AmountInUSD': buy_amount_in_usd,
+                'Currency': {
+                    'MintAddress': buy_mint_address,
+                    'Name': buy_name,
+                    'Symbol': buy_symbol
+                },
+                'PriceInUSD': buy_price_in_usd
+            }
+        },
+        'Signer': signer
+    } for (block_time, sell_mint_address, sell_name, sell_symbol, sell_amount,
+           sell_amount_in_usd, buy_mint_address, buy_name, buy_symbol,
+           buy_amount, buy_amount_in_usd, signer, sell_price_in_usd,
+           buy_price_in_usd) in zip(*(trade_store_columns[column].tolist()
+                                      for column in TRADE_STORE_COLUMNS))]
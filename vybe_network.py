@@ -1,4 +1,4 @@
-import requests
+import http_client
 from datetime import datetime, timedelta
 import time
 from config import VYBE_NETWORK_X_API_KEY
@@ -13,7 +13,7 @@ def get_token_details(mint_address):
         "X-API-KEY": VYBE_NETWORK_X_API_KEY
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = http_client.get(url, headers=headers)
 
     if response.status_code == 200:
 
@@ -44,7 +44,7 @@ def get_token_holders_time_series(mint_address, days_ago=7, interval='hour'):
         "X-API-KEY": VYBE_NETWORK_X_API_KEY
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = http_client.get(url, headers=headers)
 
     if response.status_code == 200:
         token_holders_time_series = response.json().get('data', [])
@@ -74,7 +74,7 @@ def get_token_volume_time_series(mint_address, days_ago=7, interval='hour'):
         "X-API-KEY": VYBE_NETWORK_X_API_KEY
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = http_client.get(url, headers=headers)
 
     if response.status_code == 200:
         token_holders_time_series = response.json().get('data', [])
@@ -99,7 +99,7 @@ def get_token_balances(owner_address):
         "X-API-KEY": VYBE_NETWORK_X_API_KEY
     }
 
-    response = requests.get(url, headers=headers, verify=False)
+    response = http_client.get(url, headers=headers)
 
     if response.status_code == 200:
 